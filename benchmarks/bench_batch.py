@@ -0,0 +1,54 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the throughput of quippy.parse_many for an increasing number of workers.
+
+Run as: python benchmarks/bench_batch.py [files or directories...]
+Without arguments a corpus of synthetic circuits is generated.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from quippy.batch import parse_many, quipper_paths, summarize
+from synthetic import write_circuit
+
+
+def run(paths, max_workers=os.cpu_count() or 1):
+    paths = list(quipper_paths(paths))
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        for result in parse_many(paths, workers=workers, func=summarize):
+            assert result.error is None, result
+        duration = time.perf_counter() - start
+        print("{:>3} workers {:8.3f} s {:8.1f} files/s".format(workers, duration, len(paths) / duration))
+        workers *= 2
+
+
+def main(paths):
+    if paths:
+        run(paths)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(64):
+            with open(os.path.join(directory, 'circuit{}'.format(i)), 'w') as f:
+                write_circuit(f, 1000, seed=i)
+        run([directory])
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
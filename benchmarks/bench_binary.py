@@ -0,0 +1,71 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare loading the binary format, and parse_file with a warm cache, against parsing the text.
+
+Run as: python benchmarks/bench_binary.py [quipper files...]
+Without arguments the files of the optimizer resource are used if it exists,
+and a synthetic circuit otherwise.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import synthetic
+from quippy import binary
+from quippy.stream import parse_file
+
+
+def timed(function, *args):
+    begin = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - begin, result
+
+
+def main(paths):
+    with tempfile.TemporaryDirectory() as directory:
+        if not paths:
+            paths = sorted(map(str, (Path(__file__).parents[1] / 'resources' / 'optimizer').glob('**/*')))
+            paths = [path for path in paths if os.path.isfile(path)]
+        if not paths:
+            path = os.path.join(directory, 'synthetic')
+            with open(path, 'w') as f:
+                synthetic.write_circuit(f, 100000)
+            paths = [path]
+
+        cache = os.path.join(directory, 'cache')
+        totals = [0.0, 0.0, 0.0]
+        text_size = binary_size = 0
+        for path in paths:
+            parse_time, start = timed(parse_file, path)
+            data = binary.dumps(start)
+            load_time, _ = timed(binary.loads, data)
+            parse_file(path, cache=cache)
+            cached_time, _ = timed(parse_file, path, 'fast', cache)
+            for i, duration in enumerate([parse_time, load_time, cached_time]):
+                totals[i] += duration
+            text_size += os.path.getsize(path)
+            binary_size += len(data)
+
+        print("{} files, {:.1f} MB of text, {:.1f} MB binary".format(len(paths), text_size / 1e6,
+                                                                    binary_size / 1e6))
+        for name, duration in zip(['parse', 'load', 'cached parse_file'], totals):
+            print("{:<20} {:8.3f} s ({:5.1f}x)".format(name, duration, totals[0] / duration))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
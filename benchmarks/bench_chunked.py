@@ -0,0 +1,51 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure parsing a single large file in parallel chunks for an increasing number of workers.
+
+Run as: python benchmarks/bench_chunked.py [quipper file]
+Without arguments a synthetic circuit is generated.
+"""
+
+import io
+import os
+import sys
+import time
+
+from quippy.batch import parse_chunked
+from synthetic import write_circuit
+
+
+def main(paths):
+    if paths:
+        with open(paths[0]) as f:
+            text = f.read()
+    else:
+        synthetic = io.StringIO()
+        write_circuit(synthetic, 100000)
+        text = synthetic.getvalue()
+
+    for parser in ['lalr', 'fast']:
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            start = time.perf_counter()
+            parse_chunked(text, workers=workers, parser=parser)
+            duration = time.perf_counter() - start
+            print("{:<5} {:>3} workers {:8.3f} s {:8.2f} MB/s".format(
+                parser, workers, duration, len(text) / duration / 1e6))
+            workers *= 2
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,59 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare memory per gate and gate counting time of Circuit and ColumnarCircuit.
+
+Run as: python benchmarks/bench_columnar.py
+"""
+
+import io
+import time
+import tracemalloc
+from collections import Counter
+
+from quippy.columnar import parse_columnar
+from quippy.stream import build_start, iter_gates
+from synthetic import write_circuit
+
+
+def main(gates=100000):
+    synthetic = io.StringIO()
+    write_circuit(synthetic, gates)
+    lines = synthetic.getvalue().splitlines()
+
+    tracemalloc.start()
+    start = build_start(iter_gates(lines, parser='fast'))
+    objects_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    columnar = parse_columnar(lines)
+    columnar_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    begin = time.perf_counter()
+    Counter(getattr(gate, 'op', type(gate)) for gate in start.circuit.gates)
+    objects_time = time.perf_counter() - begin
+    begin = time.perf_counter()
+    columnar.circuit.gate_counts()
+    columnar_time = time.perf_counter() - begin
+
+    print("Circuit         {:8.1f} bytes/gate  gate counts {:8.3f} ms".format(
+        objects_size / gates, objects_time * 1000))
+    print("ColumnarCircuit {:8.1f} bytes/gate  gate counts {:8.3f} ms".format(
+        columnar_size / gates, columnar_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the memory per gate of the default and the compact object model.
+
+Run as: python benchmarks/bench_compact.py [quipper files...]
+Without arguments a synthetic circuit is parsed.
+"""
+
+import io
+import sys
+import tracemalloc
+
+from quippy.parser import quipper_parser
+from quippy.transformer import QuipperTransformer, CompactQuipperTransformer
+from synthetic import write_circuit
+
+
+def gate_count(start):
+    return len(start.circuit.gates) + sum(len(s.circuit.gates) for s in start.subroutines)
+
+
+def main(paths):
+    if paths:
+        texts = []
+        for path in paths:
+            with open(path) as f:
+                texts.append((path, f.read()))
+    else:
+        synthetic = io.StringIO()
+        write_circuit(synthetic, 100000)
+        texts = [('synthetic', synthetic.getvalue())]
+
+    for name, text in texts:
+        for transformer in [QuipperTransformer(), CompactQuipperTransformer()]:
+            parser = quipper_parser(parser='fast', transformer=transformer)
+            tracemalloc.start()
+            start = parser.parse(text)
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            print("{:<40} {:<26} {:8.1f} bytes/gate".format(
+                name, type(transformer).__name__, size / gate_count(start)))
+            del start
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
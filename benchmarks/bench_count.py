@@ -0,0 +1,66 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the time and peak memory of a full parse with the count mode.
+
+Run as: python benchmarks/bench_count.py [quipper files...]
+Without arguments a synthetic circuit is counted.
+"""
+
+import io
+import sys
+import time
+import tracemalloc
+
+from quippy.count import count_gates
+from quippy.parser import quipper_parser
+from synthetic import write_circuit
+
+
+def measure(func):
+    """The duration and the peak of the memory allocated by func, which are measured separately."""
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duration, peak
+
+
+def main(paths):
+    if not paths:
+        synthetic = io.StringIO()
+        write_circuit(synthetic, 100000)
+        paths = ['synthetic']
+        contents = {'synthetic': synthetic.getvalue()}
+    else:
+        contents = {}
+        for path in paths:
+            with open(path) as f:
+                contents[path] = f.read()
+
+    for path in paths:
+        text = contents[path]
+        for name, func in [
+                ('lalr', lambda: quipper_parser().parse(text)),
+                ('fast', lambda: quipper_parser(parser='fast').parse(text)),
+                ('count', lambda: count_gates(io.StringIO(text)))]:
+            duration, peak = measure(func)
+            print("{:<40} {:<6} {:8.3f} s  peak {:8.1f} MiB".format(path, name, duration, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
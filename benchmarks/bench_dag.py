@@ -0,0 +1,47 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the time and memory per gate of building a CircuitDAG.
+
+Run as: python benchmarks/bench_dag.py [number of gates]
+"""
+
+import io
+import sys
+import time
+import tracemalloc
+
+from quippy.dag import CircuitDAG
+from quippy.parser import quipper_parser
+from synthetic import write_circuit
+
+
+def main(gates=1000000):
+    synthetic = io.StringIO()
+    write_circuit(synthetic, gates)
+    circuit = quipper_parser(parser='fast').parse(synthetic.getvalue()).circuit
+
+    start = time.perf_counter()
+    dag = CircuitDAG(circuit)
+    duration = time.perf_counter() - start
+    tracemalloc.start()
+    dag = CircuitDAG(circuit)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print("{} gates: {:.3f} s, {:.2f} µs/gate, {:.1f} bytes/gate, depth {}".format(
+        gates, duration, duration / gates * 1e6, size / gates, dag.depth()))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
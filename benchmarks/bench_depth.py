@@ -0,0 +1,55 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the time to compute the depth and T-depth of parsed circuits.
+
+Run as: python benchmarks/bench_depth.py [quipper files or directories...]
+Without arguments a synthetic circuit is used.
+"""
+
+import io
+import sys
+import time
+
+from quippy.analysis import depth, T_WEIGHTS
+from quippy.batch import quipper_paths
+from quippy.parser import quipper_parser
+from synthetic import write_circuit
+
+
+def main(paths):
+    parser = quipper_parser(parser='fast')
+    if paths:
+        starts = []
+        for path in quipper_paths(paths):
+            with open(path) as f:
+                starts.append((path, parser.parse(f.read())))
+    else:
+        synthetic = io.StringIO()
+        write_circuit(synthetic, 100000)
+        starts = [('synthetic', parser.parse(synthetic.getvalue()))]
+
+    total = 0.
+    for name, start in starts:
+        begin = time.perf_counter()
+        result = depth(start.circuit, subroutines=start.subroutines)
+        t_depth = depth(start.circuit, weights=T_WEIGHTS, subroutines=start.subroutines)
+        duration = time.perf_counter() - begin
+        total += duration
+        print("{:<40} depth {:>10} T-depth {:>10} {:8.3f} s".format(name, result, t_depth, duration))
+    print("total {:.3f} s".format(total))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,69 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare peak memory and time of exporting to OpenQASM while parsing against parsing the file first.
+
+Every measurement runs in a fresh interpreter, so that peak RSS is not shared between them.
+Run as: python benchmarks/bench_export.py [quipper files...]
+Without arguments the pf6_*_before files of the optimizer resource are used if it exists,
+and a synthetic circuit otherwise.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from synthetic import write_circuit
+
+SCRIPT = '''
+import os, resource, sys, time
+from quippy.export import qasm
+from quippy.stream import parse_file
+start = time.perf_counter()
+with open(os.devnull, 'w') as out:
+    if sys.argv[1] == 'parse_file+qasm':
+        qasm(parse_file(sys.argv[2]), out)
+    else:
+        qasm(sys.argv[2], out)
+duration = time.perf_counter() - start
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, duration)
+'''
+
+
+def run(path):
+    size = os.path.getsize(path)
+    for method in ['parse_file+qasm', 'qasm']:
+        rss, duration = subprocess.check_output([sys.executable, '-c', SCRIPT, method, path]).split()
+        print("{:<40} {:<16} peak RSS {:8.1f} MiB {:8.3f} s {:8.1f} MB/s".format(
+            os.path.basename(path), method, int(rss) / 1024, float(duration), size / float(duration) / 1e6))
+
+
+def main(paths):
+    if not paths:
+        paths = sorted(map(str, (Path(__file__).parents[1] / 'resources' / 'optimizer').glob(
+            '**/pf6_*_before')))
+    if paths:
+        for path in paths:
+            run(path)
+        return
+    with tempfile.NamedTemporaryFile('w', suffix='.quipper') as circuit:
+        write_circuit(circuit, 500000)
+        circuit.flush()
+        run(circuit.name)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,54 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the parse time of the Lark parser and the fast parser engine.
+
+Run as: python benchmarks/bench_fast.py [quipper files...]
+Without arguments a synthetic circuit is parsed.
+"""
+
+import io
+import sys
+import time
+
+from quippy.parser import quipper_parser
+from synthetic import write_circuit
+
+
+def main(paths):
+    if paths:
+        texts = []
+        for path in paths:
+            with open(path) as f:
+                texts.append((path, f.read()))
+    else:
+        synthetic = io.StringIO()
+        write_circuit(synthetic, 20000)
+        texts = [('synthetic', synthetic.getvalue())]
+
+    for name, text in texts:
+        durations = {}
+        results = {}
+        for engine in ['lalr', 'fast']:
+            parser = quipper_parser(parser=engine)
+            start = time.perf_counter()
+            results[engine] = parser.parse(text)
+            durations[engine] = time.perf_counter() - start
+        assert results['lalr'] == results['fast'], name
+        print("{:<40} lalr {:8.3f} s  fast {:8.3f} s  speedup {:5.1f}x".format(
+            name, durations['lalr'], durations['fast'], durations['lalr'] / durations['fast']))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
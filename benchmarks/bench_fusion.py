@@ -0,0 +1,63 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure how much gate fusion reduces the gate count and the simulation time.
+
+Run as: python benchmarks/bench_fusion.py [qubits...]
+The circuit is a subroutine of random synthetic gates called 4 times, so the subroutine is fused once
+and the fused blocks are reused by every call.
+"""
+
+import io
+import sys
+import time
+
+import synthetic
+from quippy.parser import quipper_parser
+from quippy.sim import StateVector
+from quippy.sim.fusion import fuse
+
+# The number of gates per size, so that every size runs for a few seconds.
+GATES = {16: 2000, 20: 300, 24: 20}
+
+
+def main(sizes):
+    for qubits in sizes:
+        gates = GATES.get(qubits, 100)
+        text = io.StringIO()
+        synthetic.write_circuit(text, gates, wires=qubits)
+        circuit = quipper_parser(start='circuit', parser='fast').parse(text.getvalue())
+        begin = time.perf_counter()
+        fusion = fuse(circuit)
+        duration = time.perf_counter() - begin
+        print("{:>2} qubits {:>6} gates -> {:>6} fused gates ({:.1f}x) in {:.3f} s".format(
+            qubits, fusion.gates, fusion.fused_gates, fusion.gates / fusion.fused_gates, duration))
+
+        arity = ', '.join('{}:Qbit'.format(i) for i in range(qubits))
+        wires = ','.join(str(i) for i in range(qubits))
+        body = text.getvalue().split('\n', 1)[1]
+        called = quipper_parser(parser='fast').parse(
+            'Inputs: {0}\nSubroutine(x4)["body", shape "s"] ({1}) -> ({1})\nOutputs: {0}\n\n'
+            'Subroutine: "body"\nShape: "s"\nControllable: yes\nInputs: {0}\n{2}'.format(arity, wires, body))
+        for fused in (False, True):
+            simulator = StateVector(called.subroutines, fuse=fused)
+            begin = time.perf_counter()
+            simulator.run(called.circuit)
+            duration = time.perf_counter() - begin
+            print("{:>2} qubits {:>6} gates {:8.3f} s {:10.3f} ms/gate (fuse={})".format(
+                qubits, 4 * gates, duration, 1000 * duration / (4 * gates), fused))
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or [16, 20, 24])
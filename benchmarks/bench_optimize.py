@@ -0,0 +1,58 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Report the gate count reduction and runtime of the peephole optimizer.
+
+Run as: python benchmarks/bench_optimize.py [quipper files...]
+Without arguments the pf6_*_before files of the optimizer resource are used if it exists,
+and a synthetic circuit otherwise.
+"""
+
+import io
+import sys
+import time
+from pathlib import Path
+
+from quippy.optimize import optimize
+from quippy.parser import quipper_parser
+from synthetic import write_circuit
+
+
+def main(paths):
+    parser = quipper_parser(parser='fast')
+    if not paths:
+        paths = sorted(map(str, (Path(__file__).parents[1] / 'resources' / 'optimizer').glob(
+            '**/pf6_*_before')))
+    if paths:
+        starts = []
+        for path in paths:
+            with open(path) as f:
+                starts.append((path, parser.parse(f.read())))
+    else:
+        synthetic = io.StringIO()
+        write_circuit(synthetic, 100000, wires=4)
+        starts = [('synthetic', parser.parse(synthetic.getvalue()))]
+
+    for name, start in starts:
+        circuits = [start.circuit] + [subroutine.circuit for subroutine in start.subroutines]
+        before = sum(len(circuit.gates) for circuit in circuits)
+        begin = time.perf_counter()
+        after = sum(len(optimize(circuit).gates) for circuit in circuits)
+        duration = time.perf_counter() - begin
+        print("{:<40} {:>9} -> {:>9} gates ({:5.1f}% fewer) {:8.3f} s".format(
+            name, before, after, 100 * (before - after) / max(before, 1), duration))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare peak memory and time of quippy.parse_file against reading the file and then parsing it.
+
+Every measurement runs in a fresh interpreter, so that peak RSS is not shared between them.
+Run as: python benchmarks/bench_parse_file.py [quipper files...]
+Without arguments a synthetic circuit is generated.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from synthetic import write_circuit
+
+SCRIPT = '''
+import resource, sys, time
+import quippy
+from quippy.stream import parse_file
+start = time.perf_counter()
+if sys.argv[1] == 'parse_file':
+    parse_file(sys.argv[2])
+else:
+    with open(sys.argv[2]) as f:
+        quippy.parser(parser='fast').parse(f.read())
+duration = time.perf_counter() - start
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, duration)
+'''
+
+
+def run(path):
+    for method in ['read+parse', 'parse_file']:
+        rss, duration = subprocess.check_output([sys.executable, '-c', SCRIPT, method, path]).split()
+        print("{:<40} {:<10} peak RSS {:8.1f} MiB {:8.3f} s".format(
+            os.path.basename(path), method, int(rss) / 1024, float(duration)))
+
+
+def main(paths):
+    if paths:
+        for path in paths:
+            run(path)
+        return
+    with tempfile.NamedTemporaryFile('w', suffix='.quipper') as circuit:
+        write_circuit(circuit, 200000)
+        circuit.flush()
+        run(circuit.name)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,46 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the construction time of cold, in-process cached and disk cached parsers.
+
+Run as: python benchmarks/bench_parser_cache.py
+"""
+
+import tempfile
+import timeit
+
+from quippy.parser import quipper_parser, clear_cache
+
+
+def main(repeat=20):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def cold():
+            quipper_parser(cache=False)
+
+        def warm_memory():
+            quipper_parser(cache_dir=cache_dir)
+
+        def warm_disk():
+            clear_cache()
+            quipper_parser(cache_dir=cache_dir)
+
+        # Populate both caches.
+        quipper_parser(cache_dir=cache_dir)
+        for name, f in [('cold', cold), ('warm-in-process', warm_memory), ('warm-from-disk', warm_disk)]:
+            best = min(timeit.repeat(f, number=1, repeat=repeat))
+            print("{:<16} {:10.3f} ms".format(name, best * 1000))
+
+
+if __name__ == '__main__':
+    main()
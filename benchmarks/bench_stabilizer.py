@@ -0,0 +1,66 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the time per gate and per measurement of the stabilizer simulator.
+
+Run as: python benchmarks/bench_stabilizer.py [qubits gates]...
+The circuit is a random mix of the synthetic Clifford gates, followed by measurements of 100 qubits.
+By default it runs 10^3 qubits with 10^5 gates and 10^4 qubits with 10^6 gates.
+"""
+
+import io
+import sys
+import time
+
+import synthetic
+from quippy.parser import quipper_parser
+from quippy.sim import Stabilizer, is_clifford
+
+MEASUREMENTS = 100
+
+
+def main(sizes):
+    for qubits, gates in sizes:
+        text = io.StringIO()
+        synthetic.write_circuit(text, gates, wires=qubits, lines=synthetic.CLIFFORD_LINES)
+        body = text.getvalue().rsplit('Outputs:', 1)[0]
+        measured = range(min(MEASUREMENTS, qubits))
+        outputs = ['{}:Cbit'.format(wire) for wire in measured] + \
+                  ['{}:Qbit'.format(wire) for wire in range(len(measured), qubits)]
+        circuit = quipper_parser(start='circuit', parser='fast').parse('{}{}Outputs: {}\n'.format(
+            body, ''.join('QMeas({})\n'.format(wire) for wire in measured), ', '.join(outputs)))
+        assert is_clifford(circuit)
+
+        gates_only = circuit._replace(gates=circuit.gates[:gates], outputs=circuit.inputs)
+        simulator = Stabilizer(seed=0)
+        begin = time.perf_counter()
+        simulator.run(gates_only)
+        compile_duration = time.perf_counter() - begin
+        # The second run reuses the compiled circuit.
+        begin = time.perf_counter()
+        simulator.run(gates_only)
+        gate_duration = time.perf_counter() - begin
+        compile_duration -= gate_duration
+        simulator.run(circuit)
+        begin = time.perf_counter()
+        simulator.run(circuit)
+        measure_duration = max(time.perf_counter() - begin - gate_duration, 0)
+        print("{:>6} qubits {:>8} gates {:8.3f} s {:8.3f} us/gate (compiled in {:.3f} s), "
+              "{} measurements {:8.3f} ms/measurement".format(
+                  qubits, gates, gate_duration, 1e6 * gate_duration / gates, compile_duration, len(measured),
+                  1000 * measure_duration / len(measured)))
+
+if __name__ == '__main__':
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    main(list(zip(arguments[::2], arguments[1::2])) or [(1000, 10 ** 5), (10 ** 4, 10 ** 6)])
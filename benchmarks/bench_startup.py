@@ -0,0 +1,48 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the import time of quippy and the time to the first parse in a fresh interpreter.
+
+Run as: python benchmarks/bench_startup.py
+"""
+
+import json
+import subprocess
+import sys
+
+SCRIPT = '''
+import json, time
+start = time.perf_counter()
+import quippy
+imported = time.perf_counter()
+quippy.parser().parse('Inputs: 0:Qbit\\nQGate["H"](0)\\nOutputs: 0:Qbit\\n')
+parsed = time.perf_counter()
+print(json.dumps({"import": imported - start, "first_parse": parsed - imported}))
+'''
+
+
+def measure(repeat=10):
+    """Return the best import and first-parse times in seconds over fresh interpreters."""
+    runs = [json.loads(subprocess.check_output([sys.executable, '-c', SCRIPT]))
+            for _ in range(repeat)]
+    return {key: min(run[key] for run in runs) for key in runs[0]}
+
+
+def main():
+    for name, seconds in measure().items():
+        print("{:<12} {:10.3f} ms".format(name, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the peak memory of streaming with quippy.iter_gates against parsing the whole file.
+
+Every measurement runs in a fresh interpreter, so that peak RSS is not shared between them.
+Run as: python benchmarks/bench_stream.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from synthetic import write_circuit
+
+SCRIPT = '''
+import resource, sys, time
+import quippy
+start = time.perf_counter()
+with open(sys.argv[2]) as f:
+    if sys.argv[1] == 'stream':
+        for _ in quippy.iter_gates(f):
+            pass
+    else:
+        quippy.parser().parse(f.read())
+duration = time.perf_counter() - start
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, duration)
+'''
+
+
+def main(sizes=(10000, 100000)):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for gates in sizes:
+        with tempfile.NamedTemporaryFile('w', suffix='.quipper') as circuit:
+            write_circuit(circuit, gates)
+            circuit.flush()
+            for method in ['stream', 'parse']:
+                output = subprocess.check_output([sys.executable, '-c', SCRIPT, method, circuit.name],
+                                                 cwd=root)
+                rss, duration = output.split()
+                print("{:>8} gates {:<7} peak RSS {:8.1f} MiB {:8.3f} s".format(
+                    gates, method, int(rss) / 1024, float(duration)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the cost of transforming the parse tree of a single gate, excluding the parsing itself.
+
+The cost of the qgate callback alone, which looks up the gate name, is reported for every QGate name.
+
+Run as: python benchmarks/bench_transform.py
+"""
+
+import timeit
+
+from quippy.parser import quipper_parser
+from quippy.transformer import QuipperTransformer, QGATE_NAMES, Wire, Control
+
+LINES = [
+    'QGate["H"](0)',
+    'QGate["W"](1,2) with controls=[+0]',
+    'QGate["X"](4) with nocontrol',
+    'QRot["R(2pi/%)",-0.5]*(3)',
+    'Subroutine["SP", shape "([Q],())"] (1) -> (1)',
+    ]
+
+
+def main(number=20000):
+    parser = quipper_parser(start='gate', transformer=None)
+    transformer = QuipperTransformer()
+    for line in LINES:
+        tree = parser.parse(line)
+        seconds = min(timeit.repeat(lambda: transformer.transform(tree), number=number, repeat=5))
+        print("{:<50} {:8.2f} µs/gate".format(line, seconds / number * 1e6))
+
+    inversion = parser.parse('QGate["H"](0)').children[1]
+    wires = [Wire(0)]
+    control = Control(controlled=[], no_control=False)
+    for name in QGATE_NAMES:
+        args = [name, inversion, wires, control]
+        seconds = min(timeit.repeat(lambda: transformer.qgate(args), number=number * 10, repeat=5))
+        print("qgate callback {:<35} {:8.3f} µs/gate".format(repr(name), seconds / number / 10 * 1e6))
+
+
+if __name__ == '__main__':
+    main()
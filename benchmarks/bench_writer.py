@@ -0,0 +1,62 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the throughput of the buffered writer against writing every gate separately.
+
+Run as: python benchmarks/bench_writer.py [number of gates]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+
+import synthetic
+from quippy.parser import quipper_parser
+from quippy.stream import iter_gates
+from quippy.writer import format_gate, write_events, write_start
+
+
+def write_per_gate(start, fileobj):
+    """Write the gates of the main circuit with a call to write for every line."""
+    for gate in start.circuit.gates:
+        fileobj.write(format_gate(gate) + '\n')
+
+
+def main(gates):
+    text = io.StringIO()
+    synthetic.write_circuit(text, gates)
+    start = quipper_parser(parser='fast').parse(text.getvalue())
+    size = len(text.getvalue())
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'circuit.quipper')
+        for name, write in [('per gate', write_per_gate), ('buffered', write_start)]:
+            with open(path, 'w') as f:
+                begin = time.perf_counter()
+                write(start, f)
+                duration = time.perf_counter() - begin
+            print("{:<10} {:8.3f} s {:8.1f} MB/s".format(name, duration, size / duration / 1e6))
+
+        with open(path, 'w') as f, io.StringIO(text.getvalue()) as lines:
+            begin = time.perf_counter()
+            write_events(iter_gates(lines, parser='fast'), f)
+            duration = time.perf_counter() - begin
+        print("{:<10} {:8.3f} s {:8.1f} MB/s (parse and write)".format('streaming', duration,
+                                                                     size / duration / 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
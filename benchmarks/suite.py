@@ -0,0 +1,199 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Run the parser benchmarks, write the results as JSON and compare them against a stored baseline.
+
+Measures the construction of the parser, the parse throughput of the LALR and fast parsers
+and of parsing to a tree without a transformer, the time of the QuipperTransformer relative to the tree
+and the peak memory of parsing,
+on the files in resources/optimizer if it exists and on a synthetic circuit.
+
+Run as: python benchmarks/suite.py [--output results.json] [--baseline benchmarks/baseline.json]
+    [--threshold 0.3] [--update-baseline] [--quick] [quipper files...]
+The exit status is 1 if a result is worse than the baseline by more than the threshold.
+The baseline depends on the machine, so store a new one with --update-baseline before comparing changes.
+Results that are missing from the baseline or from the run are reported but do not fail.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import lark
+
+from quippy.parser import quipper_parser, clear_cache
+from synthetic import write_circuit
+
+BASELINE = str(Path(__file__).parent / 'baseline.json')
+CORPUS = Path(__file__).parents[1] / 'resources' / 'optimizer'
+
+# The number of gates of the synthetic circuit, the same with --quick so that the results match the baseline.
+SYNTHETIC_GATES = 100000
+
+MEMORY_SCRIPT = '''
+import resource, sys
+from quippy.parser import quipper_parser
+with open(sys.argv[1]) as f:
+    quipper_parser(parser='fast').parse(f.read())
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def best(function, repeat: int) -> float:
+    """The shortest time of repeated calls in seconds."""
+    durations = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def result(value: float, unit: str, higher_is_better: bool) -> dict:
+    return {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+
+
+def gate_count(start) -> int:
+    circuits = [start.circuit] + [subroutine.circuit for subroutine in start.subroutines]
+    return sum(len(circuit.gates) for circuit in circuits)
+
+
+def peak_memory(path: str) -> float:
+    """The peak RSS in MiB of parsing a file in a fresh interpreter."""
+    return int(subprocess.check_output([sys.executable, '-c', MEMORY_SCRIPT, path])) / 1024
+
+
+def measure_construction(results: dict, repeat: int) -> None:
+    # Constructing a parser is short, so it is repeated more often to be less noisy.
+    repeat *= 5
+    results['construction.cold'] = result(best(lambda: quipper_parser(cache=False), repeat), 's', False)
+
+    def tables():
+        clear_cache()
+        quipper_parser()
+
+    results['construction.tables'] = result(best(tables, repeat), 's', False)
+
+
+def measure_parse(results: dict, name: str, paths: list, repeat: int) -> None:
+    """Measure the parsers on the total of a set of files."""
+    texts = []
+    for path in paths:
+        with open(path) as f:
+            texts.append(f.read())
+    size = sum(len(text) for text in texts) / 1e6
+    parsers = {
+        'lalr': quipper_parser(),
+        'fast': quipper_parser(parser='fast'),
+        'tree': quipper_parser(transformer=None),
+        }
+    gates = sum(gate_count(parsers['fast'].parse(text)) for text in texts)
+    durations = {parser_name: float('inf') for parser_name in parsers}
+    # The parsers take turns, so that a slow phase of the machine does not only affect one of them.
+    for _ in range(repeat):
+        for parser_name, parser in parsers.items():
+            durations[parser_name] = min(durations[parser_name],
+                                         best(lambda: [parser.parse(text) for text in texts], 1))
+    for parser_name in ['lalr', 'fast', 'tree']:
+        results['{}.{}.throughput'.format(name, parser_name)] = result(size / durations[parser_name], 'MB/s', True)
+        results['{}.{}.gates'.format(name, parser_name)] = result(gates / durations[parser_name], 'gates/s', True)
+    # The time of parsing with the QuipperTransformer relative to parsing to a tree with transformer=None.
+    # Lark applies the transformer while parsing, which can be faster than building the tree.
+    results['{}.transformer_ratio'.format(name)] = result(durations['lalr'] / durations['tree'], 'ratio', False)
+    largest = max(paths, key=os.path.getsize)
+    results['{}.peak_memory'.format(name)] = result(peak_memory(largest), 'MiB', False)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print the change of every result against the baseline and return the names of the regressions."""
+    regressions = []
+    for name in sorted(set(results) | set(baseline)):
+        if name not in baseline or name not in results:
+            print("{:<36} {}".format(name, 'not in the baseline' if name not in baseline else 'not measured'))
+            continue
+        new, old = results[name], baseline[name]
+        change = (new['value'] - old['value']) / abs(old['value']) if old['value'] else 0.0
+        worse = -change if new['higher_is_better'] else change
+        regressed = worse > threshold
+        if regressed:
+            regressions.append(name)
+        print("{:<36} {:12.4g} {:<8} baseline {:12.4g} {:+7.1f}%{}".format(
+            name, new['value'], new['unit'], old['value'], 100 * change, '  REGRESSION' if regressed else ''))
+    return regressions
+
+
+def main(argv) -> int:
+    arguments = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    arguments.add_argument('paths', nargs='*', help="Quipper files to use instead of the optimizer corpus")
+    arguments.add_argument('--output', help="Write the results as JSON to this file")
+    arguments.add_argument('--baseline', default=BASELINE, help="The stored results to compare against")
+    arguments.add_argument('--threshold', type=float, default=0.3,
+                           help="The largest relative change for the worse that is not a regression")
+    arguments.add_argument('--update-baseline', action='store_true', help="Store the results as the baseline")
+    arguments.add_argument('--quick', action='store_true', help="Repeat every measurement fewer times")
+    options = arguments.parse_args(argv)
+    repeat = 1 if options.quick else 3
+
+    results = {}
+    paths = options.paths or sorted(str(path) for path in CORPUS.glob('**/*') if path.is_file())
+    if paths:
+        measure_parse(results, 'corpus', paths, repeat)
+    with tempfile.TemporaryDirectory() as directory:
+        name = 'synthetic_{}'.format(SYNTHETIC_GATES)
+        path = os.path.join(directory, name + '.quipper')
+        with open(path, 'w') as f:
+            write_circuit(f, SYNTHETIC_GATES)
+        measure_parse(results, name, [path], repeat)
+    # Measured last, once the machine is busy, since the clock speed of an idle CPU distorts short timings.
+    measure_construction(results, repeat)
+
+    report = {
+        'python': platform.python_version(),
+        'lark': lark.__version__,
+        'platform': platform.platform(),
+        'results': results,
+        }
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if options.update_baseline:
+        with open(options.baseline, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print("Stored the baseline in {}".format(options.baseline))
+        return 0
+    if not os.path.exists(options.baseline):
+        print(json.dumps(results, indent=2, sort_keys=True))
+        print("No baseline in {}, store one with --update-baseline".format(options.baseline))
+        return 0
+    with open(options.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline['results'], options.threshold)
+    if regressions:
+        print("{} results regressed by more than {:.0f}%: {}".format(
+            len(regressions), 100 * options.threshold, ', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,49 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Generate large synthetic Quipper circuits for the benchmarks."""
+
+import random
+
+GATE_LINES = [
+    'QGate["H"]({0})',
+    'QGate["not"]({0}) with controls=[+{1}]',
+    'QGate["not"]({0}) with controls=[+{1},-{2}]',
+    'QGate["T"]*({0})',
+    'QGate["S"]({0}) with controls=[+{1}] with nocontrol',
+    'QRot["exp(-i%Z)",0.125]({0})',
+    'QGate["swap"]({0},{1})',
+    ]
+
+"""Gate lines of Clifford gates only, for the stabilizer simulator."""
+CLIFFORD_LINES = [
+    'QGate["H"]({0})',
+    'QGate["not"]({0}) with controls=[+{1}]',
+    'QGate["Z"]({0}) with controls=[-{1}]',
+    'QGate["S"]*({0})',
+    'QGate["Y"]({0})',
+    'QGate["swap"]({0},{1})',
+    ]
+
+
+def write_circuit(fileobj, gates: int, wires=16, seed=0, lines=GATE_LINES):
+    """Write a random circuit with the given number of gates over Qbit wires to fileobj, drawn from lines."""
+    rng = random.Random(seed)
+    arity = ', '.join('{}:Qbit'.format(i) for i in range(wires))
+    fileobj.write('Inputs: {}\n'.format(arity))
+    for _ in range(gates):
+        a, b, c = rng.sample(range(wires), 3)
+        fileobj.write(rng.choice(lines).format(a, b, c))
+        fileobj.write('\n')
+    fileobj.write('Outputs: {}\n'.format(arity))
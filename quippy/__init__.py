@@ -15,10 +15,33 @@
 """Quippy is a parser library for parsing Quipper ASCII quantum circuit descriptions."""
 
 from quippy.parser import quipper_parser as parser
-from quippy.transformer import Wire, Control, TypeAssignment_Type, TypeAssignment, Gate, QGate_Op, \
-    QGate, QRot_Op, QRot, QInit, CInit, QTerm, CTerm, QMeas, QDiscard, CDiscard, SubroutineCall, \
-    Comment, Circuit, Subroutine_Control, Subroutine, Start
 
-__all__ = [parser, Wire, Control, TypeAssignment_Type, TypeAssignment, Gate, QGate_Op, QGate,
-           QRot_Op, QRot, QInit, CInit, QTerm, CTerm, QMeas, QDiscard, CDiscard, SubroutineCall,
-           Comment, Circuit, Subroutine_Control, Subroutine, Start]
+# The other names are loaded on first access, since they import Lark.
+_LAZY_NAMES = {name: 'quippy.transformer' for name in [
+    'Wire', 'Control', 'TypeAssignment_Type', 'TypeAssignment', 'Gate', 'QGate_Op', 'QGate', 'QRot_Op',
+    'QRot', 'GPhase', 'CNot', 'CGate', 'CSwap', 'QPrep', 'QUnprep', 'QInit', 'CInit', 'QTerm', 'CTerm',
+    'QMeas', 'QDiscard', 'CDiscard', 'DTerm', 'SubroutineCall', 'Comment', 'Circuit',
+    'Subroutine_Control', 'Subroutine', 'Start', 'register_qgate', 'register_qrot']}
+_LAZY_NAMES.update({name: 'quippy.stream' for name in [
+    'iter_gates', 'parse_file', 'Inputs', 'Outputs', 'SubroutineHeader']})
+_LAZY_NAMES.update({name: 'quippy.batch' for name in ['parse_many', 'parse_chunked', 'ParseResult']})
+_LAZY_NAMES.update({name: 'quippy.analysis' for name in [
+    'count_resources', 'Resources', 'depth', 'T_WEIGHTS']})
+_LAZY_NAMES.update({name: 'quippy.count' for name in ['count_gates', 'GateCounts', 'CountStart']})
+_LAZY_NAMES.update({'CircuitDAG': 'quippy.dag'})
+_LAZY_NAMES.update({name: 'quippy.transform' for name in ['inline', 'inline_circuit']})
+_LAZY_NAMES.update({name: 'quippy.writer' for name in [
+    'format_gate', 'write_events', 'write_circuit', 'write_start', 'dumps']})
+
+__all__ = ['parser'] + list(_LAZY_NAMES)
+
+
+def __getattr__(name):
+    if name in _LAZY_NAMES:
+        from importlib import import_module
+        return getattr(import_module(_LAZY_NAMES[name]), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_NAMES))
@@ -0,0 +1,60 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Command line interface of quippy.
+
+Run as: python -m quippy <command> ...
+"""
+
+import argparse
+import sys
+
+
+def parse_command(args) -> int:
+    from quippy.batch import parse_many, summarize
+
+    failures = 0
+    for result in parse_many(args.paths, workers=args.workers, parser=args.parser, func=summarize):
+        if result.error is not None:
+            failures += 1
+            print("{}\tFAILED\t{}".format(result.path, result.error.replace('\n', ' ')))
+        else:
+            print("{}\t{}\t{}".format(result.path, result.result['gates'],
+                                      result.result['subroutines']))
+    return 1 if failures else 0
+
+
+def main(argv=None) -> int:
+    argparser = argparse.ArgumentParser(prog='quippy', description=__doc__.splitlines()[0])
+    commands = argparser.add_subparsers(dest='command')
+    commands.required = True
+
+    parse = commands.add_parser(
+        'parse', help="Parse Quipper files in parallel and print their gate and subroutine counts.")
+    parse.add_argument('paths', nargs='+',
+                       help="Quipper files, or directories to search for files without a suffix.")
+    parse.add_argument('-j', '--workers', type=int, default=None,
+                       help="Number of worker processes (default: the number of CPUs).")
+    parse.add_argument('--parser', default='lalr', choices=['lalr', 'fast'],
+                       help="Parser engine (default: lalr).")
+    parse.set_defaults(run=parse_command)
+
+    args = argparser.parse_args(argv)
+    if getattr(args, 'workers', None) is not None and args.workers < 1:
+        argparser.error("the number of workers must be at least 1")
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1917 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This file was generated by quippy.build_tables. Do not edit.
+
+LARK_VERSION = '0.7.8'
+GRAMMAR_HASH = 'd0728908993ae85fb2fba169ac7ca4b40286f3c9896ebca9796da78669c0cf24'
+START = 'start'
+
+DATA = {'__type__': 'Lark',
+ 'options': {'ambiguity': 'auto',
+             'cache_grammar': False,
+             'debug': False,
+             'edit_terminals': None,
+             'keep_all_tokens': False,
+             'lexer': 'standard',
+             'lexer_callbacks': {},
+             'maybe_placeholders': False,
+             'parser': 'lalr',
+             'postlex': None,
+             'priority': None,
+             'profile': False,
+             'propagate_positions': False,
+             'start': ['start'],
+             'transformer': None,
+             'tree_class': None},
+ 'parser': {'__type__': 'LALR_TraditionalLexer',
+            'lexer_conf': {'__type__': 'LexerConf',
+                           'ignore': ['WS'],
+                           'tokens': [{'@': 0},
+                                      {'@': 1},
+                                      {'@': 2},
+                                      {'@': 3},
+                                      {'@': 4},
+                                      {'@': 5},
+                                      {'@': 6},
+                                      {'@': 7},
+                                      {'@': 8},
+                                      {'@': 9},
+                                      {'@': 10},
+                                      {'@': 11},
+                                      {'@': 12},
+                                      {'@': 13},
+                                      {'@': 14},
+                                      {'@': 15},
+                                      {'@': 16},
+                                      {'@': 17},
+                                      {'@': 18},
+                                      {'@': 19},
+                                      {'@': 20},
+                                      {'@': 21},
+                                      {'@': 22},
+                                      {'@': 23},
+                                      {'@': 24},
+                                      {'@': 25},
+                                      {'@': 26},
+                                      {'@': 27},
+                                      {'@': 28},
+                                      {'@': 29},
+                                      {'@': 30},
+                                      {'@': 31},
+                                      {'@': 32},
+                                      {'@': 33},
+                                      {'@': 34},
+                                      {'@': 35},
+                                      {'@': 36},
+                                      {'@': 37},
+                                      {'@': 38},
+                                      {'@': 39},
+                                      {'@': 40},
+                                      {'@': 41},
+                                      {'@': 42}]},
+            'parser': {'end_states': {'start': 13},
+                       'start_states': {'start': 0},
+                       'states': {0: {0: (0, 1), 1: (0, 2), 2: (0, 3)},
+                                  1: {3: (1, {'@': 43}),
+                                      4: (0, 4),
+                                      5: (0, 5),
+                                      6: (0, 6),
+                                      7: (0, 7)},
+                                  2: {8: (0, 8), 9: (0, 9), 10: (0, 10), 11: (0, 11), 12: (0, 12)},
+                                  3: {3: (0, 13)},
+                                  4: {3: (1, {'@': 44}), 5: (0, 15), 6: (0, 6), 7: (0, 14)},
+                                  5: {3: (1, {'@': 45}), 6: (1, {'@': 45})},
+                                  6: {3: (1, {'@': 46}), 6: (1, {'@': 46}), 13: (0, 16)},
+                                  7: {3: (1, {'@': 47}), 6: (0, 17)},
+                                  8: {14: (0, 18)},
+                                  9: {6: (0, 19), 15: (0, 20), 16: (0, 21)},
+                                  10: {17: (0, 22),
+                                       18: (0, 23),
+                                       19: (0, 24),
+                                       20: (0, 25),
+                                       21: (0, 26),
+                                       22: (0, 27),
+                                       23: (0, 28),
+                                       24: (0, 29),
+                                       25: (0, 30),
+                                       26: (0, 31),
+                                       27: (0, 32),
+                                       28: (0, 33),
+                                       29: (0, 34),
+                                       30: (0, 35),
+                                       31: (0, 36),
+                                       32: (0, 37),
+                                       33: (0, 38),
+                                       34: (0, 39),
+                                       35: (0, 40),
+                                       36: (0, 41),
+                                       37: (0, 42),
+                                       38: (0, 43),
+                                       39: (0, 44),
+                                       40: (0, 45),
+                                       41: (0, 46),
+                                       42: (0, 47),
+                                       43: (0, 48),
+                                       44: (0, 49),
+                                       45: (0, 50),
+                                       46: (0, 51),
+                                       47: (0, 52),
+                                       48: (0, 53),
+                                       49: (0, 54),
+                                       50: (0, 55),
+                                       51: (0, 56),
+                                       52: (0, 57),
+                                       53: (0, 58),
+                                       54: (0, 59),
+                                       55: (0, 60)},
+                                  11: {14: (1, {'@': 48}),
+                                       16: (1, {'@': 48}),
+                                       56: (1, {'@': 48}),
+                                       57: (1, {'@': 48}),
+                                       58: (1, {'@': 48})},
+                                  12: {14: (1, {'@': 49}),
+                                       16: (1, {'@': 49}),
+                                       56: (1, {'@': 49}),
+                                       57: (1, {'@': 49}),
+                                       58: (1, {'@': 49})},
+                                  13: {},
+                                  14: {3: (1, {'@': 50}), 6: (0, 17)},
+                                  15: {3: (1, {'@': 51}), 6: (1, {'@': 51})},
+                                  16: {59: (0, 61), 60: (0, 62)},
+                                  17: {3: (1, {'@': 52}), 6: (1, {'@': 52})},
+                                  18: {61: (0, 63)},
+                                  19: {3: (1, {'@': 53}),
+                                       6: (1, {'@': 53}),
+                                       17: (1, {'@': 53}),
+                                       19: (1, {'@': 53}),
+                                       22: (1, {'@': 53}),
+                                       24: (1, {'@': 53}),
+                                       25: (1, {'@': 53}),
+                                       28: (1, {'@': 53}),
+                                       29: (1, {'@': 53}),
+                                       31: (1, {'@': 53}),
+                                       32: (1, {'@': 53}),
+                                       35: (1, {'@': 53}),
+                                       36: (1, {'@': 53}),
+                                       38: (1, {'@': 53}),
+                                       40: (1, {'@': 53}),
+                                       43: (1, {'@': 53}),
+                                       46: (1, {'@': 53}),
+                                       50: (1, {'@': 53}),
+                                       52: (1, {'@': 53}),
+                                       53: (1, {'@': 53}),
+                                       54: (1, {'@': 53})},
+                                  20: {6: (0, 65), 16: (0, 64)},
+                                  21: {6: (0, 66), 8: (0, 8), 9: (0, 67), 11: (0, 11), 12: (0, 12)},
+                                  22: {8: (0, 68), 11: (0, 11), 12: (0, 12)},
+                                  23: {6: (1, {'@': 54})},
+                                  24: {62: (0, 69), 63: (0, 70)},
+                                  25: {6: (1, {'@': 55})},
+                                  26: {6: (1, {'@': 56})},
+                                  27: {64: (0, 71)},
+                                  28: {6: (1, {'@': 57})},
+                                  29: {8: (0, 72), 11: (0, 11), 12: (0, 12)},
+                                  30: {64: (0, 73)},
+                                  31: {6: (1, {'@': 58})},
+                                  32: {17: (0, 22),
+                                       18: (0, 23),
+                                       19: (0, 24),
+                                       20: (0, 25),
+                                       21: (0, 26),
+                                       22: (0, 27),
+                                       23: (0, 28),
+                                       24: (0, 29),
+                                       25: (0, 30),
+                                       26: (0, 31),
+                                       28: (0, 33),
+                                       29: (0, 34),
+                                       30: (0, 35),
+                                       31: (0, 36),
+                                       32: (0, 37),
+                                       33: (0, 38),
+                                       34: (0, 39),
+                                       35: (0, 40),
+                                       36: (0, 41),
+                                       37: (0, 42),
+                                       38: (0, 43),
+                                       39: (0, 44),
+                                       40: (0, 45),
+                                       41: (0, 46),
+                                       42: (0, 47),
+                                       43: (0, 48),
+                                       44: (0, 49),
+                                       45: (0, 50),
+                                       46: (0, 51),
+                                       47: (0, 52),
+                                       48: (0, 53),
+                                       49: (0, 54),
+                                       50: (0, 55),
+                                       51: (0, 75),
+                                       52: (0, 57),
+                                       53: (0, 74),
+                                       54: (0, 59),
+                                       55: (0, 60)},
+                                  33: {59: (0, 76), 60: (0, 62)},
+                                  34: {64: (0, 77)},
+                                  35: {6: (1, {'@': 59})},
+                                  36: {64: (0, 78)},
+                                  37: {8: (0, 79), 11: (0, 11), 12: (0, 12)},
+                                  38: {6: (1, {'@': 60})},
+                                  39: {6: (1, {'@': 61})},
+                                  40: {59: (0, 80), 60: (0, 62)},
+                                  41: {59: (0, 81), 60: (0, 62)},
+                                  42: {6: (1, {'@': 62})},
+                                  43: {59: (0, 82), 60: (0, 62)},
+                                  44: {6: (1, {'@': 63})},
+                                  45: {64: (0, 83)},
+                                  46: {6: (1, {'@': 64})},
+                                  47: {6: (1, {'@': 65})},
+                                  48: {8: (0, 84), 11: (0, 11), 12: (0, 12)},
+                                  49: {6: (1, {'@': 66})},
+                                  50: {6: (1, {'@': 67})},
+                                  51: {8: (0, 85), 11: (0, 11), 12: (0, 12)},
+                                  52: {6: (1, {'@': 68})},
+                                  53: {6: (1, {'@': 69})},
+                                  54: {6: (1, {'@': 70})},
+                                  55: {8: (0, 86), 11: (0, 11), 12: (0, 12)},
+                                  56: {6: (0, 87)},
+                                  57: {65: (0, 88), 66: (0, 89)},
+                                  58: {8: (0, 8), 9: (0, 9), 10: (0, 90), 11: (0, 11), 12: (0, 12)},
+                                  59: {8: (0, 91), 11: (0, 11), 12: (0, 12)},
+                                  60: {6: (1, {'@': 71})},
+                                  61: {6: (0, 92)},
+                                  62: {6: (1, {'@': 72}),
+                                       16: (1, {'@': 72}),
+                                       57: (1, {'@': 72}),
+                                       58: (1, {'@': 72}),
+                                       67: (1, {'@': 72})},
+                                  63: {6: (1, {'@': 73}), 16: (1, {'@': 73})},
+                                  64: {6: (0, 94), 8: (0, 8), 9: (0, 93), 11: (0, 11), 12: (0, 12)},
+                                  65: {3: (1, {'@': 74}),
+                                       6: (1, {'@': 74}),
+                                       17: (1, {'@': 74}),
+                                       19: (1, {'@': 74}),
+                                       22: (1, {'@': 74}),
+                                       24: (1, {'@': 74}),
+                                       25: (1, {'@': 74}),
+                                       28: (1, {'@': 74}),
+                                       29: (1, {'@': 74}),
+                                       31: (1, {'@': 74}),
+                                       32: (1, {'@': 74}),
+                                       35: (1, {'@': 74}),
+                                       36: (1, {'@': 74}),
+                                       38: (1, {'@': 74}),
+                                       40: (1, {'@': 74}),
+                                       43: (1, {'@': 74}),
+                                       46: (1, {'@': 74}),
+                                       50: (1, {'@': 74}),
+                                       52: (1, {'@': 74}),
+                                       53: (1, {'@': 74}),
+                                       54: (1, {'@': 74})},
+                                  66: {3: (1, {'@': 75}),
+                                       6: (1, {'@': 75}),
+                                       17: (1, {'@': 75}),
+                                       19: (1, {'@': 75}),
+                                       22: (1, {'@': 75}),
+                                       24: (1, {'@': 75}),
+                                       25: (1, {'@': 75}),
+                                       28: (1, {'@': 75}),
+                                       29: (1, {'@': 75}),
+                                       31: (1, {'@': 75}),
+                                       32: (1, {'@': 75}),
+                                       35: (1, {'@': 75}),
+                                       36: (1, {'@': 75}),
+                                       38: (1, {'@': 75}),
+                                       40: (1, {'@': 75}),
+                                       43: (1, {'@': 75}),
+                                       46: (1, {'@': 75}),
+                                       50: (1, {'@': 75}),
+                                       52: (1, {'@': 75}),
+                                       53: (1, {'@': 75}),
+                                       54: (1, {'@': 75})},
+                                  67: {6: (1, {'@': 76}), 16: (1, {'@': 76})},
+                                  68: {57: (0, 95)},
+                                  69: {11: (0, 96), 12: (0, 12)},
+                                  70: {59: (0, 97), 60: (0, 62)},
+                                  71: {8: (0, 98), 11: (0, 11), 12: (0, 12)},
+                                  72: {57: (0, 99)},
+                                  73: {8: (0, 100), 11: (0, 11), 12: (0, 12)},
+                                  74: {8: (0, 8),
+                                       9: (0, 9),
+                                       10: (0, 101),
+                                       11: (0, 11),
+                                       12: (0, 12)},
+                                  75: {6: (0, 102)},
+                                  76: {58: (0, 103)},
+                                  77: {8: (0, 104), 11: (0, 11), 12: (0, 12)},
+                                  78: {8: (0, 105), 11: (0, 11), 12: (0, 12)},
+                                  79: {57: (0, 106)},
+                                  80: {58: (0, 107)},
+                                  81: {58: (0, 108)},
+                                  82: {16: (0, 109)},
+                                  83: {8: (0, 110), 11: (0, 11), 12: (0, 12)},
+                                  84: {57: (0, 111)},
+                                  85: {16: (0, 112)},
+                                  86: {57: (0, 113)},
+                                  87: {17: (1, {'@': 77}),
+                                       19: (1, {'@': 77}),
+                                       22: (1, {'@': 77}),
+                                       24: (1, {'@': 77}),
+                                       25: (1, {'@': 77}),
+                                       28: (1, {'@': 77}),
+                                       29: (1, {'@': 77}),
+                                       31: (1, {'@': 77}),
+                                       32: (1, {'@': 77}),
+                                       35: (1, {'@': 77}),
+                                       36: (1, {'@': 77}),
+                                       38: (1, {'@': 77}),
+                                       40: (1, {'@': 77}),
+                                       43: (1, {'@': 77}),
+                                       46: (1, {'@': 77}),
+                                       50: (1, {'@': 77}),
+                                       52: (1, {'@': 77}),
+                                       53: (1, {'@': 77}),
+                                       54: (1, {'@': 77})},
+                                  88: {6: (1, {'@': 78}),
+                                       68: (1, {'@': 78}),
+                                       69: (0, 114),
+                                       70: (0, 115),
+                                       71: (0, 116),
+                                       72: (0, 117)},
+                                  89: {58: (1, {'@': 79}),
+                                       68: (1, {'@': 79}),
+                                       69: (1, {'@': 79}),
+                                       71: (1, {'@': 79})},
+                                  90: {3: (1, {'@': 80}), 6: (1, {'@': 80})},
+                                  91: {57: (0, 118)},
+                                  92: {73: (0, 119)},
+                                  93: {6: (1, {'@': 81}), 16: (1, {'@': 81})},
+                                  94: {3: (1, {'@': 82}),
+                                       6: (1, {'@': 82}),
+                                       17: (1, {'@': 82}),
+                                       19: (1, {'@': 82}),
+                                       22: (1, {'@': 82}),
+                                       24: (1, {'@': 82}),
+                                       25: (1, {'@': 82}),
+                                       28: (1, {'@': 82}),
+                                       29: (1, {'@': 82}),
+                                       31: (1, {'@': 82}),
+                                       32: (1, {'@': 82}),
+                                       35: (1, {'@': 82}),
+                                       36: (1, {'@': 82}),
+                                       38: (1, {'@': 82}),
+                                       40: (1, {'@': 82}),
+                                       43: (1, {'@': 82}),
+                                       46: (1, {'@': 82}),
+                                       50: (1, {'@': 82}),
+                                       52: (1, {'@': 82}),
+                                       53: (1, {'@': 82}),
+                                       54: (1, {'@': 82})},
+                                  95: {6: (1, {'@': 83})},
+                                  96: {57: (0, 120)},
+                                  97: {67: (0, 121)},
+                                  98: {57: (0, 122)},
+                                  99: {6: (1, {'@': 84}), 69: (0, 123)},
+                                  100: {57: (0, 124)},
+                                  101: {3: (1, {'@': 85}), 6: (1, {'@': 85})},
+                                  102: {17: (1, {'@': 86}),
+                                        19: (1, {'@': 86}),
+                                        22: (1, {'@': 86}),
+                                        24: (1, {'@': 86}),
+                                        25: (1, {'@': 86}),
+                                        28: (1, {'@': 86}),
+                                        29: (1, {'@': 86}),
+                                        31: (1, {'@': 86}),
+                                        32: (1, {'@': 86}),
+                                        35: (1, {'@': 86}),
+                                        36: (1, {'@': 86}),
+                                        38: (1, {'@': 86}),
+                                        40: (1, {'@': 86}),
+                                        43: (1, {'@': 86}),
+                                        46: (1, {'@': 86}),
+                                        50: (1, {'@': 86}),
+                                        52: (1, {'@': 86}),
+                                        53: (1, {'@': 86}),
+                                        54: (1, {'@': 86})},
+                                  103: {64: (1, {'@': 87}), 74: (0, 125), 75: (0, 126)},
+                                  104: {57: (0, 127)},
+                                  105: {57: (0, 128)},
+                                  106: {6: (1, {'@': 88}), 69: (0, 129)},
+                                  107: {64: (1, {'@': 87}), 74: (0, 125), 75: (0, 130)},
+                                  108: {64: (1, {'@': 87}), 74: (0, 125), 75: (0, 131)},
+                                  109: {65: (0, 132), 66: (0, 89)},
+                                  110: {57: (0, 133)},
+                                  111: {6: (1, {'@': 89})},
+                                  112: {8: (0, 134), 11: (0, 11), 12: (0, 12)},
+                                  113: {6: (1, {'@': 90})},
+                                  114: {6: (1, {'@': 91}), 68: (1, {'@': 91})},
+                                  115: {6: (1, {'@': 92}), 68: (1, {'@': 92}), 69: (0, 135)},
+                                  116: {8: (0, 136), 11: (0, 11), 12: (0, 12), 76: (0, 137)},
+                                  117: {68: (0, 138)},
+                                  118: {6: (1, {'@': 78}),
+                                        68: (1, {'@': 78}),
+                                        69: (0, 114),
+                                        70: (0, 115),
+                                        71: (0, 116),
+                                        72: (0, 139)},
+                                  119: {59: (0, 140), 60: (0, 62)},
+                                  120: {63: (0, 141)},
+                                  121: {59: (0, 142), 60: (0, 62)},
+                                  122: {6: (1, {'@': 93}), 69: (0, 143)},
+                                  123: {6: (1, {'@': 94})},
+                                  124: {6: (1, {'@': 95}), 69: (0, 144)},
+                                  125: {64: (1, {'@': 96})},
+                                  126: {64: (0, 145)},
+                                  127: {6: (1, {'@': 97}), 69: (0, 146)},
+                                  128: {6: (1, {'@': 98}), 69: (0, 147)},
+                                  129: {6: (1, {'@': 99})},
+                                  130: {64: (0, 148)},
+                                  131: {64: (0, 149)},
+                                  132: {58: (0, 150)},
+                                  133: {6: (1, {'@': 100})},
+                                  134: {57: (0, 151)},
+                                  135: {6: (1, {'@': 101}), 68: (1, {'@': 101})},
+                                  136: {16: (0, 152),
+                                        56: (1, {'@': 102}),
+                                        57: (1, {'@': 102}),
+                                        58: (1, {'@': 102}),
+                                        77: (0, 153)},
+                                  137: {58: (0, 154)},
+                                  138: {8: (0, 136), 11: (0, 11), 12: (0, 12), 76: (0, 155)},
+                                  139: {6: (1, {'@': 103})},
+                                  140: {6: (0, 156)},
+                                  141: {59: (0, 157), 60: (0, 62)},
+                                  142: {58: (0, 158)},
+                                  143: {6: (1, {'@': 104})},
+                                  144: {6: (1, {'@': 105})},
+                                  145: {8: (0, 136), 11: (0, 11), 12: (0, 12), 76: (0, 159)},
+                                  146: {6: (1, {'@': 106})},
+                                  147: {6: (1, {'@': 107})},
+                                  148: {8: (0, 160),
+                                        11: (0, 11),
+                                        12: (0, 12),
+                                        57: (0, 161),
+                                        78: (0, 162)},
+                                  149: {8: (0, 136), 11: (0, 11), 12: (0, 12), 76: (0, 163)},
+                                  150: {64: (1, {'@': 87}), 74: (0, 125), 75: (0, 164)},
+                                  151: {6: (1, {'@': 78}),
+                                        68: (1, {'@': 78}),
+                                        69: (0, 114),
+                                        70: (0, 115),
+                                        71: (0, 116),
+                                        72: (0, 165)},
+                                  152: {8: (0, 166), 11: (0, 11), 12: (0, 12)},
+                                  153: {16: (0, 167),
+                                        56: (1, {'@': 108}),
+                                        57: (1, {'@': 108}),
+                                        58: (1, {'@': 108})},
+                                  154: {6: (1, {'@': 109}),
+                                        68: (1, {'@': 109}),
+                                        69: (1, {'@': 109})},
+                                  155: {58: (0, 168)},
+                                  156: {79: (0, 169)},
+                                  157: {67: (0, 170)},
+                                  158: {64: (1, {'@': 87}), 74: (0, 125), 75: (0, 171)},
+                                  159: {57: (0, 172)},
+                                  160: {14: (0, 173)},
+                                  161: {6: (1, {'@': 110})},
+                                  162: {57: (0, 174)},
+                                  163: {57: (0, 175)},
+                                  164: {64: (0, 176)},
+                                  165: {6: (1, {'@': 111})},
+                                  166: {16: (1, {'@': 112}),
+                                        56: (1, {'@': 112}),
+                                        57: (1, {'@': 112}),
+                                        58: (1, {'@': 112})},
+                                  167: {8: (0, 177), 11: (0, 11), 12: (0, 12)},
+                                  168: {6: (1, {'@': 113})},
+                                  169: {80: (0, 178)},
+                                  170: {59: (0, 179), 60: (0, 62)},
+                                  171: {64: (0, 180)},
+                                  172: {6: (1, {'@': 78}),
+                                        68: (1, {'@': 78}),
+                                        69: (0, 114),
+                                        70: (0, 115),
+                                        71: (0, 116),
+                                        72: (0, 181)},
+                                  173: {59: (0, 182), 60: (0, 62)},
+                                  174: {6: (1, {'@': 114})},
+                                  175: {6: (1, {'@': 115}), 69: (0, 183)},
+                                  176: {8: (0, 184), 11: (0, 11), 12: (0, 12)},
+                                  177: {16: (1, {'@': 116}),
+                                        56: (1, {'@': 116}),
+                                        57: (1, {'@': 116}),
+                                        58: (1, {'@': 116})},
+                                  178: {6: (0, 185)},
+                                  179: {58: (0, 186)},
+                                  180: {8: (0, 136), 11: (0, 11), 12: (0, 12), 76: (0, 187)},
+                                  181: {6: (1, {'@': 117})},
+                                  182: {16: (0, 189), 57: (1, {'@': 118}), 81: (0, 188)},
+                                  183: {6: (1, {'@': 119})},
+                                  184: {57: (0, 190)},
+                                  185: {0: (0, 191), 1: (0, 2)},
+                                  186: {64: (1, {'@': 87}), 74: (0, 125), 75: (0, 192)},
+                                  187: {56: (0, 193)},
+                                  188: {16: (0, 194), 57: (1, {'@': 120})},
+                                  189: {8: (0, 195), 11: (0, 11), 12: (0, 12)},
+                                  190: {6: (1, {'@': 121})},
+                                  191: {3: (1, {'@': 122}), 6: (1, {'@': 122})},
+                                  192: {64: (0, 196)},
+                                  193: {8: (0, 136), 11: (0, 11), 12: (0, 12), 76: (0, 197)},
+                                  194: {8: (0, 198), 11: (0, 11), 12: (0, 12)},
+                                  195: {14: (0, 199)},
+                                  196: {8: (0, 136), 11: (0, 11), 12: (0, 12), 76: (0, 200)},
+                                  197: {57: (0, 201)},
+                                  198: {14: (0, 202)},
+                                  199: {59: (0, 203), 60: (0, 62)},
+                                  200: {56: (0, 204)},
+                                  201: {6: (1, {'@': 78}),
+                                        68: (1, {'@': 78}),
+                                        69: (0, 114),
+                                        70: (0, 115),
+                                        71: (0, 116),
+                                        72: (0, 205)},
+                                  202: {59: (0, 206), 60: (0, 62)},
+                                  203: {16: (1, {'@': 123}), 57: (1, {'@': 123})},
+                                  204: {8: (0, 136), 11: (0, 11), 12: (0, 12), 76: (0, 207)},
+                                  205: {6: (1, {'@': 124})},
+                                  206: {16: (1, {'@': 125}), 57: (1, {'@': 125})},
+                                  207: {57: (0, 208)},
+                                  208: {6: (1, {'@': 78}),
+                                        68: (1, {'@': 78}),
+                                        69: (0, 114),
+                                        70: (0, 115),
+                                        71: (0, 116),
+                                        72: (0, 209)},
+                                  209: {6: (1, {'@': 126})}},
+                       'tokens': {0: 'circuit',
+                                  1: '__ANON_0',
+                                  2: 'start',
+                                  3: '$END',
+                                  4: '__anon_star_0',
+                                  5: 'subroutine',
+                                  6: '_NEWLINE',
+                                  7: '__anon_star_1',
+                                  8: 'wire',
+                                  9: 'type_assignment',
+                                  10: 'arity',
+                                  11: 'int',
+                                  12: 'SIGNED_INT',
+                                  13: '__ANON_2',
+                                  14: 'COLON',
+                                  15: '__anon_star_3',
+                                  16: 'COMMA',
+                                  17: '__ANON_16',
+                                  18: 'qgate',
+                                  19: 'SUBROUTINE',
+                                  20: 'cswap',
+                                  21: 'subroutine_call',
+                                  22: 'CTERM_STATE',
+                                  23: 'qdiscard',
+                                  24: '__ANON_13',
+                                  25: 'QINIT_STATE',
+                                  26: 'cdiscard',
+                                  27: '__anon_star_2',
+                                  28: '__ANON_6',
+                                  29: 'CINIT_STATE',
+                                  30: 'qterm',
+                                  31: 'QTERM_STATE',
+                                  32: '__ANON_14',
+                                  33: 'qprep',
+                                  34: 'cinit',
+                                  35: '__ANON_21',
+                                  36: '__ANON_11',
+                                  37: 'cterm',
+                                  38: '__ANON_7',
+                                  39: 'qrot',
+                                  40: 'DTERM_STATE',
+                                  41: 'cnot',
+                                  42: 'qmeas',
+                                  43: '__ANON_17',
+                                  44: 'qinit',
+                                  45: 'gphase',
+                                  46: '__ANON_12',
+                                  47: 'comment',
+                                  48: 'cgate',
+                                  49: 'qunprep',
+                                  50: '__ANON_15',
+                                  51: 'gate',
+                                  52: '__ANON_8',
+                                  53: '__ANON_1',
+                                  54: '__ANON_10',
+                                  55: 'dterm',
+                                  56: '__ANON_20',
+                                  57: 'RPAR',
+                                  58: 'RSQB',
+                                  59: 'string',
+                                  60: 'ESCAPED_STRING',
+                                  61: 'TYPE',
+                                  62: '__ANON_18',
+                                  63: 'LSQB',
+                                  64: 'LPAR',
+                                  65: 'float',
+                                  66: 'SIGNED_FLOAT',
+                                  67: '__ANON_19',
+                                  68: '__ANON_9',
+                                  69: 'NO_CONTROL',
+                                  70: 'controlled',
+                                  71: '__ANON_5',
+                                  72: 'control_app',
+                                  73: '__ANON_3',
+                                  74: 'STAR',
+                                  75: 'inversion',
+                                  76: 'wire_list',
+                                  77: '__anon_star_5',
+                                  78: 'wire_string_list',
+                                  79: '__ANON_4',
+                                  80: 'SUB_CONTROL',
+                                  81: '__anon_star_4'}},
+            'start': ['start']},
+ 'rules': [{'@': 50},
+           {'@': 44},
+           {'@': 47},
+           {'@': 43},
+           {'@': 85},
+           {'@': 80},
+           {'@': 122},
+           {'@': 82},
+           {'@': 74},
+           {'@': 75},
+           {'@': 53},
+           {'@': 73},
+           {'@': 101},
+           {'@': 92},
+           {'@': 91},
+           {'@': 78},
+           {'@': 109},
+           {'@': 54},
+           {'@': 63},
+           {'@': 67},
+           {'@': 64},
+           {'@': 69},
+           {'@': 55},
+           {'@': 60},
+           {'@': 70},
+           {'@': 66},
+           {'@': 61},
+           {'@': 59},
+           {'@': 62},
+           {'@': 65},
+           {'@': 57},
+           {'@': 58},
+           {'@': 71},
+           {'@': 56},
+           {'@': 68},
+           {'@': 96},
+           {'@': 87},
+           {'@': 117},
+           {'@': 121},
+           {'@': 113},
+           {'@': 103},
+           {'@': 119},
+           {'@': 115},
+           {'@': 111},
+           {'@': 94},
+           {'@': 84},
+           {'@': 99},
+           {'@': 88},
+           {'@': 105},
+           {'@': 95},
+           {'@': 106},
+           {'@': 97},
+           {'@': 107},
+           {'@': 98},
+           {'@': 104},
+           {'@': 93},
+           {'@': 90},
+           {'@': 83},
+           {'@': 89},
+           {'@': 100},
+           {'@': 126},
+           {'@': 124},
+           {'@': 114},
+           {'@': 110},
+           {'@': 120},
+           {'@': 118},
+           {'@': 48},
+           {'@': 108},
+           {'@': 102},
+           {'@': 72},
+           {'@': 79},
+           {'@': 49},
+           {'@': 45},
+           {'@': 51},
+           {'@': 46},
+           {'@': 52},
+           {'@': 77},
+           {'@': 86},
+           {'@': 76},
+           {'@': 81},
+           {'@': 123},
+           {'@': 125},
+           {'@': 112},
+           {'@': 116}]}
+
+MEMO = {0: {'__type__': 'TerminalDef',
+     'name': 'SUB_CONTROL',
+     'pattern': {'__type__': 'PatternRE',
+                 '_width': [2, 11],
+                 'flags': [],
+                 'value': '(?:(?:yes|no)|classically)'},
+     'priority': 1},
+ 1: {'__type__': 'TerminalDef',
+     'name': 'TYPE',
+     'pattern': {'__type__': 'PatternRE', '_width': [4, 4], 'flags': [], 'value': '(?:Qbit|Cbit)'},
+     'priority': 1},
+ 2: {'__type__': 'TerminalDef',
+     'name': 'NO_CONTROL',
+     'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'with nocontrol'},
+     'priority': 1},
+ 3: {'__type__': 'TerminalDef',
+     'name': 'QINIT_STATE',
+     'pattern': {'__type__': 'PatternRE',
+                 '_width': [6, 6],
+                 'flags': [],
+                 'value': '(?:QInit0|QInit1)'},
+     'priority': 1},
+ 4: {'__type__': 'TerminalDef',
+     'name': 'CINIT_STATE',
+     'pattern': {'__type__': 'PatternRE',
+                 '_width': [6, 6],
+                 'flags': [],
+                 'value': '(?:CInit0|CInit1)'},
+     'priority': 1},
+ 5: {'__type__': 'TerminalDef',
+     'name': 'QTERM_STATE',
+     'pattern': {'__type__': 'PatternRE',
+                 '_width': [6, 6],
+                 'flags': [],
+                 'value': '(?:QTerm0|QTerm1)'},
+     'priority': 1},
+ 6: {'__type__': 'TerminalDef',
+     'name': 'CTERM_STATE',
+     'pattern': {'__type__': 'PatternRE',
+                 '_width': [6, 6],
+                 'flags': [],
+                 'value': '(?:CTerm0|CTerm1)'},
+     'priority': 1},
+ 7: {'__type__': 'TerminalDef',
+     'name': 'DTERM_STATE',
+     'pattern': {'__type__': 'PatternRE',
+                 '_width': [6, 6],
+                 'flags': [],
+                 'value': '(?:DTerm0|DTerm1)'},
+     'priority': 1},
+ 8: {'__type__': 'TerminalDef',
+     'name': '_NEWLINE',
+     'pattern': {'__type__': 'PatternRE', '_width': [1, 2], 'flags': [], 'value': '(?:\r)?\n'},
+     'priority': 1},
+ 9: {'__type__': 'TerminalDef',
+     'name': 'WS',
+     'pattern': {'__type__': 'PatternRE',
+                 '_width': [1, 18446744073709551616],
+                 'flags': [],
+                 'value': '(?:(?:\\ |\t))+'},
+     'priority': 1},
+ 10: {'__type__': 'TerminalDef',
+      'name': 'ESCAPED_STRING',
+      'pattern': {'__type__': 'PatternRE',
+                  '_width': [2, 18446744073709551616],
+                  'flags': [],
+                  'value': '".*?(?<!\\\\)(\\\\\\\\)*?"'},
+      'priority': 1},
+ 11: {'__type__': 'TerminalDef',
+      'name': 'SIGNED_FLOAT',
+      'pattern': {'__type__': 'PatternRE',
+                  '_width': [2, 18446744073709551616],
+                  'flags': [],
+                  'value': '(?:(?:\\+|\\-))?(?:(?:[0-9])+(?:e|E)(?:(?:\\+|\\-))?(?:[0-9])+|(?:(?:[0-9])+\\.(?:(?:[0-9])+)?|\\.(?:[0-9])+)(?:(?:e|E)(?:(?:\\+|\\-))?(?:[0-9])+)?)'},
+      'priority': 1},
+ 12: {'__type__': 'TerminalDef',
+      'name': 'SIGNED_INT',
+      'pattern': {'__type__': 'PatternRE',
+                  '_width': [1, 18446744073709551616],
+                  'flags': [],
+                  'value': '(?:(?:\\+|\\-))?(?:[0-9])+'},
+      'priority': 1},
+ 13: {'__type__': 'TerminalDef',
+      'name': '__ANON_0',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'Inputs:'},
+      'priority': 1},
+ 14: {'__type__': 'TerminalDef',
+      'name': '__ANON_1',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'Outputs:'},
+      'priority': 1},
+ 15: {'__type__': 'TerminalDef',
+      'name': '__ANON_2',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'Subroutine:'},
+      'priority': 1},
+ 16: {'__type__': 'TerminalDef',
+      'name': '__ANON_3',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'Shape:'},
+      'priority': 1},
+ 17: {'__type__': 'TerminalDef',
+      'name': '__ANON_4',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'Controllable:'},
+      'priority': 1},
+ 18: {'__type__': 'TerminalDef',
+      'name': 'COMMA',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': ','},
+      'priority': 1},
+ 19: {'__type__': 'TerminalDef',
+      'name': 'COLON',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': ':'},
+      'priority': 1},
+ 20: {'__type__': 'TerminalDef',
+      'name': '__ANON_5',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'with controls=['},
+      'priority': 1},
+ 21: {'__type__': 'TerminalDef',
+      'name': 'RSQB',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': ']'},
+      'priority': 1},
+ 22: {'__type__': 'TerminalDef',
+      'name': 'STAR',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': '*'},
+      'priority': 1},
+ 23: {'__type__': 'TerminalDef',
+      'name': '__ANON_6',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'QGate['},
+      'priority': 1},
+ 24: {'__type__': 'TerminalDef',
+      'name': 'LPAR',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': '('},
+      'priority': 1},
+ 25: {'__type__': 'TerminalDef',
+      'name': 'RPAR',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': ')'},
+      'priority': 1},
+ 26: {'__type__': 'TerminalDef',
+      'name': '__ANON_7',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'QRot['},
+      'priority': 1},
+ 27: {'__type__': 'TerminalDef',
+      'name': '__ANON_8',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'Gphase() with t='},
+      'priority': 1},
+ 28: {'__type__': 'TerminalDef',
+      'name': '__ANON_9',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'with anchors=['},
+      'priority': 1},
+ 29: {'__type__': 'TerminalDef',
+      'name': '__ANON_10',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'CNot('},
+      'priority': 1},
+ 30: {'__type__': 'TerminalDef',
+      'name': '__ANON_11',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'CGate['},
+      'priority': 1},
+ 31: {'__type__': 'TerminalDef',
+      'name': '__ANON_12',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'CSwap('},
+      'priority': 1},
+ 32: {'__type__': 'TerminalDef',
+      'name': '__ANON_13',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'QPrep('},
+      'priority': 1},
+ 33: {'__type__': 'TerminalDef',
+      'name': '__ANON_14',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'QUnprep('},
+      'priority': 1},
+ 34: {'__type__': 'TerminalDef',
+      'name': '__ANON_15',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'QMeas('},
+      'priority': 1},
+ 35: {'__type__': 'TerminalDef',
+      'name': '__ANON_16',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'QDiscard('},
+      'priority': 1},
+ 36: {'__type__': 'TerminalDef',
+      'name': '__ANON_17',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'CDiscard('},
+      'priority': 1},
+ 37: {'__type__': 'TerminalDef',
+      'name': '__ANON_18',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': '(x'},
+      'priority': 1},
+ 38: {'__type__': 'TerminalDef',
+      'name': 'SUBROUTINE',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'Subroutine'},
+      'priority': 1},
+ 39: {'__type__': 'TerminalDef',
+      'name': 'LSQB',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': '['},
+      'priority': 1},
+ 40: {'__type__': 'TerminalDef',
+      'name': '__ANON_19',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': ', shape'},
+      'priority': 1},
+ 41: {'__type__': 'TerminalDef',
+      'name': '__ANON_20',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': ') -> ('},
+      'priority': 1},
+ 42: {'__type__': 'TerminalDef',
+      'name': '__ANON_21',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'value': 'Comment['},
+      'priority': 1},
+ 43: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'circuit'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 3,
+      'origin': {'__type__': 'NonTerminal', 'name': 'start'}},
+ 44: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'circuit'},
+                    {'__type__': 'NonTerminal', 'name': '__anon_star_0'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'start'}},
+ 45: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'subroutine'}],
+      'options': None,
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_0'}},
+ 46: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'}],
+      'options': None,
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_1'}},
+ 47: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'circuit'},
+                    {'__type__': 'NonTerminal', 'name': '__anon_star_1'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 2,
+      'origin': {'__type__': 'NonTerminal', 'name': 'start'}},
+ 48: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'int'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'wire'}},
+ 49: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'SIGNED_INT'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'int'}},
+ 50: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'circuit'},
+                    {'__type__': 'NonTerminal', 'name': '__anon_star_0'},
+                    {'__type__': 'NonTerminal', 'name': '__anon_star_1'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'start'}},
+ 51: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': '__anon_star_0'},
+                    {'__type__': 'NonTerminal', 'name': 'subroutine'}],
+      'options': None,
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_0'}},
+ 52: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': '__anon_star_1'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'}],
+      'options': None,
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_1'}},
+ 53: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'type_assignment'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 3,
+      'origin': {'__type__': 'NonTerminal', 'name': 'arity'}},
+ 54: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'qgate'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 55: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'cswap'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 5,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 56: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'subroutine_call'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 16,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 57: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'qdiscard'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 13,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 58: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'cdiscard'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 14,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 59: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'qterm'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 10,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 60: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'qprep'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 6,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 61: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'cinit'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 9,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 62: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'cterm'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 11,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 63: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'qrot'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 64: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'cnot'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 3,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 65: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'qmeas'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 12,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 66: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'qinit'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 8,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 67: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'gphase'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 2,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 68: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'comment'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 17,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 69: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'cgate'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 4,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 70: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'qunprep'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 7,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 71: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'dterm'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 15,
+      'origin': {'__type__': 'NonTerminal', 'name': 'gate'}},
+ 72: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'ESCAPED_STRING'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'string'}},
+ 73: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'COLON'},
+                    {'__type__': 'Terminal', 'filter_out': False, 'name': 'TYPE'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'type_assignment'}},
+ 74: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'type_assignment'},
+                    {'__type__': 'NonTerminal', 'name': '__anon_star_3'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'arity'}},
+ 75: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'type_assignment'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'COMMA'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 2,
+      'origin': {'__type__': 'NonTerminal', 'name': 'arity'}},
+ 76: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'COMMA'},
+                    {'__type__': 'NonTerminal', 'name': 'type_assignment'}],
+      'options': None,
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_3'}},
+ 77: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'gate'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'}],
+      'options': None,
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_2'}},
+ 78: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 3,
+      'origin': {'__type__': 'NonTerminal', 'name': 'control_app'}},
+ 79: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'SIGNED_FLOAT'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'float'}},
+ 80: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_0'},
+                    {'__type__': 'NonTerminal', 'name': 'arity'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_1'},
+                    {'__type__': 'NonTerminal', 'name': 'arity'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'circuit'}},
+ 81: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': '__anon_star_3'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'COMMA'},
+                    {'__type__': 'NonTerminal', 'name': 'type_assignment'}],
+      'options': None,
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_3'}},
+ 82: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'type_assignment'},
+                    {'__type__': 'NonTerminal', 'name': '__anon_star_3'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'COMMA'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'arity'}},
+ 83: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_16'},
+                    {'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'qdiscard'}},
+ 84: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_13'},
+                    {'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'qprep'}},
+ 85: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_0'},
+                    {'__type__': 'NonTerminal', 'name': 'arity'},
+                    {'__type__': 'NonTerminal', 'name': '__anon_star_2'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_1'},
+                    {'__type__': 'NonTerminal', 'name': 'arity'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'circuit'}},
+ 86: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': '__anon_star_2'},
+                    {'__type__': 'NonTerminal', 'name': 'gate'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'}],
+      'options': None,
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_2'}},
+ 87: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': True,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'inversion'}},
+ 88: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_14'},
+                    {'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'qunprep'}},
+ 89: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_17'},
+                    {'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'cdiscard'}},
+ 90: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_15'},
+                    {'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'qmeas'}},
+ 91: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'NO_CONTROL'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 2,
+      'origin': {'__type__': 'NonTerminal', 'name': 'control_app'}},
+ 92: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'controlled'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'control_app'}},
+ 93: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'CTERM_STATE'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                    {'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'cterm'}},
+ 94: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_13'},
+                    {'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                    {'__type__': 'Terminal', 'filter_out': False, 'name': 'NO_CONTROL'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'qprep'}},
+ 95: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'QINIT_STATE'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                    {'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'qinit'}},
+ 96: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'STAR'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': True,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'inversion'}},
+ 97: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'CINIT_STATE'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                    {'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'cinit'}},
+ 98: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'QTERM_STATE'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                    {'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'qterm'}},
+ 99: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_14'},
+                    {'__type__': 'NonTerminal', 'name': 'wire'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                    {'__type__': 'Terminal', 'filter_out': False, 'name': 'NO_CONTROL'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'qunprep'}},
+ 100: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'DTERM_STATE'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'dterm'}},
+ 101: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'NonTerminal', 'name': 'controlled'},
+                     {'__type__': 'Terminal', 'filter_out': False, 'name': 'NO_CONTROL'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'control_app'}},
+ 102: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'NonTerminal', 'name': 'wire'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 1,
+       'origin': {'__type__': 'NonTerminal', 'name': 'wire_list'}},
+ 103: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_10'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'control_app'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'cnot'}},
+ 104: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'CTERM_STATE'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                     {'__type__': 'Terminal', 'filter_out': False, 'name': 'NO_CONTROL'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'cterm'}},
+ 105: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'QINIT_STATE'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                     {'__type__': 'Terminal', 'filter_out': False, 'name': 'NO_CONTROL'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'qinit'}},
+ 106: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'CINIT_STATE'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                     {'__type__': 'Terminal', 'filter_out': False, 'name': 'NO_CONTROL'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'cinit'}},
+ 107: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'QTERM_STATE'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                     {'__type__': 'Terminal', 'filter_out': False, 'name': 'NO_CONTROL'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'qterm'}},
+ 108: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'NonTerminal', 'name': '__anon_star_5'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'wire_list'}},
+ 109: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_5'},
+                     {'__type__': 'NonTerminal', 'name': 'wire_list'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': True,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'controlled'}},
+ 110: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_21'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'},
+                     {'__type__': 'NonTerminal', 'name': 'inversion'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 1,
+       'origin': {'__type__': 'NonTerminal', 'name': 'comment'}},
+ 111: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_12'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'COMMA'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'control_app'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'cswap'}},
+ 112: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'COMMA'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'}],
+       'options': None,
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_5'}},
+ 113: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_8'},
+                     {'__type__': 'NonTerminal', 'name': 'float'},
+                     {'__type__': 'NonTerminal', 'name': 'control_app'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_9'},
+                     {'__type__': 'NonTerminal', 'name': 'wire_list'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'gphase'}},
+ 114: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_21'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'},
+                     {'__type__': 'NonTerminal', 'name': 'inversion'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire_string_list'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'comment'}},
+ 115: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_11'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'},
+                     {'__type__': 'NonTerminal', 'name': 'inversion'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire_list'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 1,
+       'origin': {'__type__': 'NonTerminal', 'name': 'cgate'}},
+ 116: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'NonTerminal', 'name': '__anon_star_5'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'COMMA'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'}],
+       'options': None,
+       'order': 1,
+       'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_5'}},
+ 117: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_6'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'},
+                     {'__type__': 'NonTerminal', 'name': 'inversion'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire_list'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'control_app'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'qgate'}},
+ 118: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'COLON'},
+                     {'__type__': 'NonTerminal', 'name': 'string'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 1,
+       'origin': {'__type__': 'NonTerminal', 'name': 'wire_string_list'}},
+ 119: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_11'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'},
+                     {'__type__': 'NonTerminal', 'name': 'inversion'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire_list'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                     {'__type__': 'Terminal', 'filter_out': False, 'name': 'NO_CONTROL'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'cgate'}},
+ 120: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'COLON'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'NonTerminal', 'name': '__anon_star_4'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'wire_string_list'}},
+ 121: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_7'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'COMMA'},
+                     {'__type__': 'NonTerminal', 'name': 'float'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'},
+                     {'__type__': 'NonTerminal', 'name': 'inversion'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'qrot'}},
+ 122: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_2'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_3'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_4'},
+                     {'__type__': 'Terminal', 'filter_out': False, 'name': 'SUB_CONTROL'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '_NEWLINE'},
+                     {'__type__': 'NonTerminal', 'name': 'circuit'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'subroutine'}},
+ 123: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'COMMA'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'COLON'},
+                     {'__type__': 'NonTerminal', 'name': 'string'}],
+       'options': None,
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_4'}},
+ 124: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'SUBROUTINE'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LSQB'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_19'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'},
+                     {'__type__': 'NonTerminal', 'name': 'inversion'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire_list'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_20'},
+                     {'__type__': 'NonTerminal', 'name': 'wire_list'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'control_app'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': [False,
+                                     True,
+                                     False,
+                                     False,
+                                     False,
+                                     False,
+                                     False,
+                                     False,
+                                     False,
+                                     False,
+                                     False,
+                                     False,
+                                     False,
+                                     False],
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 1,
+       'origin': {'__type__': 'NonTerminal', 'name': 'subroutine_call'}},
+ 125: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'NonTerminal', 'name': '__anon_star_4'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'COMMA'},
+                     {'__type__': 'NonTerminal', 'name': 'wire'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'COLON'},
+                     {'__type__': 'NonTerminal', 'name': 'string'}],
+       'options': None,
+       'order': 1,
+       'origin': {'__type__': 'NonTerminal', 'name': '__anon_star_4'}},
+ 126: {'__type__': 'Rule',
+       'alias': None,
+       'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'SUBROUTINE'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_18'},
+                     {'__type__': 'NonTerminal', 'name': 'int'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LSQB'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_19'},
+                     {'__type__': 'NonTerminal', 'name': 'string'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'},
+                     {'__type__': 'NonTerminal', 'name': 'inversion'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'wire_list'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': '__ANON_20'},
+                     {'__type__': 'NonTerminal', 'name': 'wire_list'},
+                     {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                     {'__type__': 'NonTerminal', 'name': 'control_app'}],
+       'options': {'__type__': 'RuleOptions',
+                   'empty_indices': (),
+                   'expand1': False,
+                   'keep_all_tokens': False,
+                   'priority': None},
+       'order': 0,
+       'origin': {'__type__': 'NonTerminal', 'name': 'subroutine_call'}}}
@@ -0,0 +1,288 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Analyses of parsed circuits that do not need the subroutines to be inlined."""
+
+from collections import Counter
+from typing import *
+
+from quippy.transformer import Wire, Gate, QGate_Op, QGate, QRot, SubroutineCall, Comment, Circuit, Subroutine, \
+    Start, INVERSES
+
+Resources = NamedTuple('Resources', [
+    # The number of gates by QGate_Op, QRot_Op, or by type for the other gates.
+    ('gates', Counter),
+    # The number of controlled gates by (key in gates, number of controls).
+    ('controlled', Counter),
+    # The number of calls of every subroutine, also from within other subroutines.
+    ('calls', Counter),
+    # The number of wires of the circuit, plus the most extra wires used within a called subroutine.
+    ('width', int)
+    ])
+
+
+def count_resources(start: Start) -> Resources:
+    """Count the gates of the main circuit, as if all subroutine calls were inlined.
+
+    The counts of every subroutine are computed once and multiplied by the repetitions of a call,
+    so deeply nested subroutines are counted in time linear in the size of the file.
+    Inverted calls count the initializations of the subroutine as terminations and vice versa,
+    and the controls of a call are added to every gate of the subroutine
+    that is not marked 'with nocontrol'.
+    Comments are not counted.
+
+    :param start: The parsed Quipper file.
+    :return: The resources of the main circuit.
+    """
+    if start.circuit is None:
+        raise RuntimeError("Missing the main circuit")
+    subroutines = {subroutine.name: subroutine.circuit for subroutine in start.subroutines}
+    memo = {}  # type: Dict[Tuple[str, bool, int], Resources]
+    active = set()  # type: Set[str]
+
+    def subroutine(name: str, inverted: bool, controls: int) -> Resources:
+        key = (name, inverted, controls)
+        if key not in memo:
+            if name not in subroutines:
+                raise RuntimeError("Unknown subroutine: {}".format(name))
+            if name in active:
+                raise RuntimeError("Recursive subroutine: {}".format(name))
+            active.add(name)
+            memo[key] = circuit(subroutines[name], inverted, controls)
+            active.remove(name)
+        return memo[key]
+
+    def circuit(parsed: Circuit, inverted: bool, controls: int) -> Resources:
+        gates = Counter()  # type: Counter
+        controlled = Counter()  # type: Counter
+        calls = Counter()  # type: Counter
+        extra_width = 0
+        for gate in parsed.gates:
+            if isinstance(gate, SubroutineCall):
+                called = subroutine(gate.name, inverted != gate.inverted, control_count(gate, controls))
+                for counts, called_counts in [(gates, called.gates), (controlled, called.controlled),
+                                              (calls, called.calls)]:
+                    for key, count in called_counts.items():
+                        counts[key] += count * gate.repetitions
+                calls[gate.name] += gate.repetitions
+                extra_width = max(extra_width, called.width - len(gate.inputs))
+            elif not isinstance(gate, Comment):
+                key = gate_key(gate, inverted)
+                gates[key] += 1
+                gate_controls = control_count(gate, controls)
+                if gate_controls:
+                    controlled[key, gate_controls] += 1
+        return Resources(gates=gates, controlled=controlled, calls=calls,
+                         width=len(_wires(parsed)) + extra_width)
+
+    return circuit(start.circuit, False, 0)
+
+
+"""The weights of depth that give the T-depth of a circuit."""
+T_WEIGHTS = {QGate_Op.T: 1}
+
+# The wire that stands for the controls of a controlled subroutine call.
+_CONTROL = 'control'
+
+# The time at which a wire is free, as the longest path to it from every input of a subroutine, -inf if
+# there is none, followed by the longest path that does not start at an input.
+_Times = Tuple[float, ...]
+
+# The longest paths through a subroutine, with a row for every input and a column for every output,
+# and a last row and column for the paths that do not start at an input.
+_Profile = List[List[float]]
+
+
+def depth(circuit: Circuit, weights: Optional[Mapping[Any, float]] = None,
+          subroutines: Iterable[Subroutine] = ()) -> float:
+    """The depth of a circuit, the longest path of gates through its wires.
+
+    Gates that share a wire, as a target or as a control, are applied one after the other.
+    A subroutine call is as deep as its gates would be when inlined:
+    the depth from every input to every output of a subroutine is computed once, in a single pass
+    over its gates, and then applied to the wires of every call. Repeated calls compose these depths
+    by repeated squaring. The ancillas of a call do not depend on those of other calls,
+    as if every call used fresh wires. All gates of a controlled call that are not marked
+    'with nocontrol' share the control wires, and are therefore applied in sequence.
+
+    :param circuit: The circuit to compute the depth of.
+    :param weights: The depth of a gate by its key in Resources.gates,
+        for example T_WEIGHTS for the T-depth. Gates that are not in weights do not add depth,
+        but do order the gates on their wires. By default every gate but a comment has depth 1.
+    :param subroutines: The subroutines called by the circuit, such as Start.subroutines.
+    :return: The depth of the circuit.
+    """
+    circuit_subroutines = {subroutine.name: subroutine.circuit for subroutine in subroutines}
+    profiles = {}  # type: Dict[Tuple[str, bool, bool], _Profile]
+    powers = {}  # type: Dict[Tuple[str, bool, bool, int], _Profile]
+    active = set()  # type: Set[str]
+
+    def weight(gate: Gate, inverted: bool) -> float:
+        if weights is None:
+            return 1
+        return weights.get(gate_key(gate, inverted), 0)
+
+    def profile(name: str, inverted: bool, controlled: bool) -> _Profile:
+        key = (name, inverted, controlled)
+        if key not in profiles:
+            if name not in circuit_subroutines:
+                raise RuntimeError("Unknown subroutine: {}".format(name))
+            if name in active:
+                raise RuntimeError("Recursive subroutine: {}".format(name))
+            active.add(name)
+            parsed = circuit_subroutines[name]
+            gates = list(reversed(parsed.gates)) if inverted else parsed.gates
+            inputs, outputs = parsed.inputs, parsed.outputs
+            if inverted:
+                inputs, outputs = outputs, inputs
+            control = [_CONTROL] if controlled else []
+            input_wires = [assignment.wire.i for assignment in inputs] + control
+            output_wires = [assignment.wire.i for assignment in outputs] + control
+
+            # The paths from all inputs are followed at once, every wire is free at a vector of times.
+            size = len(input_wires) + 1
+            frontier = {wire: tuple(0 if i == j else float('-inf') for j in range(size))
+                        for i, wire in enumerate(input_wires)}  # type: Dict[Any, _Times]
+            default = (float('-inf'),) * (size - 1) + (0,)
+            run(gates, frontier, default, inverted, controlled)
+            columns = [frontier.get(wire, default) for wire in output_wires] + [default]
+            profiles[key] = [list(row) for row in zip(*columns)]
+            active.remove(name)
+        return profiles[key]
+
+    def run(gates: Iterable[Gate], frontier: Dict[Any, _Times], default: _Times, inverted: bool,
+            controlled: bool) -> None:
+        """Advance the frontier, the times at which every wire is free, over the gates."""
+        for gate in gates:
+            if isinstance(gate, Comment):
+                continue
+            control = getattr(gate, 'control', None)
+            gate_controlled = controlled and control is not None and not control.no_control
+            if isinstance(gate, SubroutineCall):
+                call(gate, frontier, default, inverted, gate_controlled)
+                continue
+            wires = [wire.i for wire in gate_wires(gate)]
+            if gate_controlled:
+                wires.append(_CONTROL)
+            if wires:
+                end = _latest([frontier.get(wire, default) for wire in wires])
+                gate_weight = weight(gate, inverted)
+                if gate_weight:
+                    end = tuple([time + gate_weight for time in end])
+                for wire in wires:
+                    frontier[wire] = end
+
+    def call(gate: SubroutineCall, frontier: Dict[Any, _Times], default: _Times, inverted: bool,
+             controlled: bool) -> None:
+        control_wires = [abs(wire.i) for wire in gate.control.controlled]  # type: List[Any]
+        if controlled:
+            control_wires.append(_CONTROL)
+        key = (gate.name, inverted != gate.inverted, bool(control_wires))
+        called = profile(*key)
+        times = [frontier.get(wire.i, default) for wire in gate.inputs]
+        if control_wires:
+            times.append(_latest([frontier.get(wire, default) for wire in control_wires]))
+        if gate.repetitions > 1:
+            if len(gate.inputs) != len(gate.outputs):
+                raise RuntimeError("Repeated subroutine with different inputs and outputs: {}".format(
+                    gate.name))
+            power_key = key + (gate.repetitions,)
+            if power_key not in powers:
+                powers[power_key] = _max_plus_power(called, gate.repetitions)
+            called = powers[power_key]
+        times.append(default)
+        outputs = [_latest([tuple(time + path for time in row_times)
+                            for row_times, path in zip(times, column) if path != float('-inf')], default)
+                   for column in zip(*called)]
+        for wire, time in zip(gate.outputs, outputs):
+            frontier[wire.i] = time
+        for wire in control_wires:
+            frontier[wire] = outputs[-2]
+
+    frontier = {assignment.wire.i: (0,) for assignment in circuit.inputs}  # type: Dict[Any, _Times]
+    run(circuit.gates, frontier, (0,), False, False)
+    return max((times[0] for times in frontier.values()), default=0)
+
+
+def _latest(times: List[_Times], default: Optional[_Times] = None) -> _Times:
+    """The elementwise maximum of vectors of times, or default if there are none."""
+    if not times:
+        return tuple(float('-inf') for _ in default)
+    if len(times) == 1 or len(times[0]) == 1:
+        # Vectors of a single time are ordered like their time.
+        return max(times)
+    return tuple(map(max, *times))
+
+
+def _max_plus_product(a: _Profile, b: _Profile) -> _Profile:
+    """The product of matrices in the max-plus algebra, which composes the longest paths of a and then b."""
+    columns = list(zip(*b))
+    return [[max(x + y for x, y in zip(row, column)) for column in columns] for row in a]
+
+
+def _max_plus_power(matrix: _Profile, exponent: int) -> _Profile:
+    """The longest paths through exponent repetitions of a profile, by repeated squaring."""
+    result = None  # type: Optional[_Profile]
+    while exponent:
+        if exponent & 1:
+            result = matrix if result is None else _max_plus_product(result, matrix)
+        exponent >>= 1
+        if exponent:
+            matrix = _max_plus_product(matrix, matrix)
+    return result
+
+
+def gate_key(gate: Gate, inverted=False):
+    """The key of a gate in Resources.gates."""
+    if isinstance(gate, (QGate, QRot)):
+        return gate.op
+    if inverted:
+        return INVERSES.get(type(gate), type(gate))
+    return type(gate)
+
+
+def control_count(gate: Gate, controls=0) -> int:
+    """The number of controls of a gate, in a circuit that is controlled by controls wires."""
+    control = getattr(gate, 'control', None)
+    if control is None:
+        return 0
+    return len(control.controlled) + (0 if control.no_control else controls)
+
+
+def _wires(circuit: Circuit) -> Set[int]:
+    """The indices of all wires used in a circuit."""
+    wires = {assignment.wire.i for assignment in circuit.inputs}
+    wires.update(assignment.wire.i for assignment in circuit.outputs)
+    for gate in circuit.gates:
+        wires.update(wire.i for wire in gate_wires(gate))
+    return wires
+
+
+def gate_wires(gate: Gate) -> Iterator[Wire]:
+    """All wires that a gate acts on, including its controls but not the wires of comments.
+
+    Negative controls are given as their positive wire.
+    """
+    if isinstance(gate, Comment):
+        return
+    for field in ('wire', 'wires', 'inputs', 'outputs', 'anchors'):
+        value = getattr(gate, field, None)
+        if isinstance(value, Wire):
+            yield value
+        elif value is not None:
+            yield from value
+    control = getattr(gate, 'control', None)
+    if control is not None:
+        for wire in control.controlled:
+            yield Wire(abs(wire.i))
@@ -0,0 +1,183 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parse Quipper files in parallel over a pool of processes."""
+
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import *
+
+from quippy.parser import quipper_parser
+from quippy.stream import iter_gates, build_start, HEADERS
+
+ParseResult = NamedTuple('ParseResult', [
+    ('path', str),
+    # The parsed Start object, or what func returned for it.
+    ('result', Any),
+    # The formatted exception if parsing failed, None otherwise.
+    ('error', Optional[str])
+    ])
+
+"""The parser of a worker process, compiled once by _init_worker."""
+_worker_parser = None
+_worker_func = None  # type: Optional[Callable]
+
+
+def quipper_paths(paths: Iterable[Union[str, Path]]) -> Iterator[str]:
+    """Expand directories to all files without a suffix in them, like the optimizer resource."""
+    for path in map(Path, paths):
+        if path.is_dir():
+            for child in sorted(path.rglob('*')):
+                if child.is_file() and child.suffix == '':
+                    yield str(child)
+        else:
+            yield str(path)
+
+
+def parse_many(paths: Iterable[Union[str, Path]], workers: Optional[int] = None, parser='lalr',
+               func: Optional[Callable] = None) -> Iterator[ParseResult]:
+    """Parse every file in paths using a pool of worker processes.
+
+    Results are yielded in the order in which they complete.
+    A file that fails to parse is reported with its error and does not stop the other files.
+
+    :param paths: The files to parse. Directories are expanded by quipper_paths.
+    :param workers: The number of worker processes, or None for the number of CPUs.
+        With one worker the files are parsed in the current process.
+    :param parser: The parser engine, passed to quipper_parser.
+    :param func: A function applied to each parsed Start in the worker, for example to
+        only send back a summary. It must be picklable, i.e. defined at the top level of a module.
+    :return: An iterator over the results of all files.
+    """
+    # Checked here, since the generator would only raise once the first result is requested.
+    workers = _worker_count(workers)
+    return _parse_many(quipper_paths(paths), workers, parser, func)
+
+
+def _parse_many(paths: Iterator[str], workers: int, parser: str,
+                func: Optional[Callable]) -> Iterator[ParseResult]:
+    if workers == 1:
+        local_parser = quipper_parser(parser=parser)
+        for path in paths:
+            yield _parse_path(path, local_parser, func)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(parser, func)) as pool:
+        # Bound the number of pending files, so that paths are consumed lazily
+        # and finished results are not kept waiting in memory.
+        pending = set()
+        for path in paths:
+            pending.add(pool.submit(_parse_worker_path, path))
+            if len(pending) >= 4 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def _worker_count(workers: Optional[int]) -> int:
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Expected at least one worker: {}".format(workers))
+    return workers
+
+
+def _init_worker(parser: str, func: Optional[Callable]) -> None:
+    global _worker_parser, _worker_func
+    _worker_parser = quipper_parser(parser=parser)
+    _worker_func = func
+
+
+def _parse_worker_path(path: str) -> ParseResult:
+    return _parse_path(path, _worker_parser, _worker_func)
+
+
+def _parse_path(path: str, parser, func: Optional[Callable]) -> ParseResult:
+    try:
+        with open(path) as quipper_file:
+            parsed = parser.parse(quipper_file.read())
+        if func is not None:
+            parsed = func(parsed)
+        return ParseResult(path=path, result=parsed, error=None)
+    except Exception as e:
+        # Exceptions are formatted since not all of them can be pickled.
+        return ParseResult(path=path, result=None,
+                           error=''.join(traceback.format_exception_only(type(e), e)).strip())
+
+
+def parse_chunked(text: str, workers: Optional[int] = None, parser='lalr', chunk_lines=20000):
+    """Parse a single large file by splitting its gates into chunks that are parsed in parallel.
+
+    The gate lines of every circuit are split at line boundaries into chunks of at most chunk_lines,
+    while the Inputs, Outputs and subroutine headers are parsed in the current process.
+    The result is the same Start object as the serial parser gives.
+
+    :param text: The contents of a Quipper file.
+    :param workers: The number of worker processes, or None for the number of CPUs.
+        With one worker the chunks are parsed in the current process.
+    :param parser: The parser engine for the lines, either 'lalr' or 'fast'.
+    :param chunk_lines: The maximum number of gate lines in a chunk.
+    :return: The parsed Start object.
+    """
+    workers = _worker_count(workers)
+    # Split the file into segments of header lines and chunks of gate lines.
+    segments = []  # type: List[Tuple[bool, int, List[str]]]
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            # Blank lines stay in their segment, so that the line numbers of errors are those of the file.
+            if segments:
+                segments[-1][2].append(line)
+            continue
+        is_gate = not line.startswith(HEADERS)
+        if (not segments or segments[-1][0] != is_gate
+                or (is_gate and len(segments[-1][2]) >= chunk_lines)):
+            segments.append((is_gate, line_number, []))
+        segments[-1][2].append(line)
+
+    def events(results):
+        for (is_gate, first_line, lines), result in zip(segments, results):
+            if is_gate:
+                yield from result
+            else:
+                yield from iter_gates(lines, parser=parser, first_line=first_line)
+
+    if workers == 1:
+        return build_start(events(_parse_gate_lines(lines, parser, first_line) if is_gate else None
+                                  for is_gate, first_line, lines in segments))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_parse_gate_lines, lines, parser, first_line) if is_gate else None
+                   for is_gate, first_line, lines in segments]
+        return build_start(events(future.result() if future is not None else None
+                                  for future in futures))
+
+
+def _parse_gate_lines(lines: List[str], parser: str, first_line: int) -> List:
+    return list(iter_gates(lines, parser=parser, first_line=first_line))
+
+
+def summarize(start) -> Dict[str, int]:
+    """Count the gates and subroutines of a parsed file, a small result to send between processes."""
+    return {
+        'gates': len(start.circuit.gates) + sum(len(s.circuit.gates) for s in start.subroutines),
+        'subroutines': len(start.subroutines),
+        }
@@ -0,0 +1,330 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A compact binary serialization of parsed Quipper files.
+
+After MAGIC come the byte sizes of five sections, followed by the sections themselves:
+
+- strings: the UTF-8 text of all strings, such as subroutine names, shapes and comments.
+- headers: a byte for every gate, holding its opcode in the low 5 bits and its flags in the high 3 bits:
+  whether it is inverted, whether it is marked 'with nocontrol', and the initialized or terminated value.
+  For comments the last flag marks that the comment has no wire labels.
+- integers: varints, 7 bits per byte, of the lengths of the strings, list lengths, operations,
+  repetitions and indices into the string table.
+- wires: varints of all wire indices, zigzag encoded so that negative controls stay small.
+- doubles: the timesteps as little-endian doubles.
+
+Every section is decoded in bulk, which makes loading several times faster than parsing the text.
+"""
+
+import gc
+import sys
+from array import array
+from itertools import islice
+from typing import *
+
+from quippy.transformer import Wire, Control, TypeAssignment_Type, TypeAssignment, Gate, QGate_Op, QGate, \
+    QRot_Op, QRot, GPhase, CNot, CGate, CSwap, QPrep, QUnprep, QInit, CInit, QTerm, CTerm, QMeas, QDiscard, \
+    CDiscard, DTerm, SubroutineCall, Comment, Circuit, Subroutine_Control, Subroutine, Start
+
+"""The first bytes of the binary format, which change with every incompatible version."""
+MAGIC = b'QPYB\x01'
+
+_OPCODES = [QGate, QRot, GPhase, CNot, CGate, CSwap, QPrep, QUnprep, QInit, CInit, QTerm, CTerm, QMeas,
+            QDiscard, CDiscard, DTerm, SubroutineCall, Comment]
+_OPCODE = {gate_type: opcode for opcode, gate_type in enumerate(_OPCODES)}  # type: Dict[type, int]
+
+_INVERTED = 1 << 5
+_NO_CONTROL = 1 << 6
+# The value of init and term gates, or that a comment has no wire labels.
+_VALUE = 1 << 7
+
+
+def dumps(start: Start) -> bytes:
+    """Serialize a parsed Quipper file to bytes."""
+    return _Encoder().start(start)
+
+
+def dump(start: Start, fileobj: BinaryIO) -> None:
+    """Serialize a parsed Quipper file to a binary file."""
+    fileobj.write(dumps(start))
+
+
+def loads(data: bytes) -> Start:
+    """Load a parsed Quipper file from the bytes given by dumps.
+
+    Raises a ValueError if the data is not in the binary format or is truncated.
+    """
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a quippy binary circuit")
+    # Loading only creates objects without reference cycles,
+    # so the cyclic garbage collector is paused instead of being triggered over and over.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _decode(memoryview(data)[len(MAGIC):])
+    except (StopIteration, IndexError, KeyError) as e:
+        raise ValueError("Corrupt quippy binary circuit") from e
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def load(fileobj: BinaryIO) -> Start:
+    """Load a parsed Quipper file from a binary file written by dump."""
+    return loads(fileobj.read())
+
+
+def _write_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varints(data: Union[bytes, memoryview]) -> List[int]:
+    """Decode a sequence of varints."""
+    if not data or max(data) < 0x80:
+        # Every varint is a single byte.
+        return list(data)
+    values = []  # type: List[int]
+    n = shift = 0
+    for byte in data:
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            values.append(n)
+            n = shift = 0
+        else:
+            shift += 7
+    if shift:
+        raise ValueError("Truncated varint")
+    return values
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings = {}  # type: Dict[str, int]
+        self.headers = bytearray()
+        self.integers = bytearray()
+        self.wire_codes = bytearray()
+        self.doubles = array('d')
+
+    def start(self, start: Start) -> bytes:
+        if start.circuit is None:
+            raise ValueError("Missing the main circuit")
+        self.circuit(start.circuit)
+        self.uint(len(start.subroutines))
+        for subroutine in start.subroutines:
+            self.string(subroutine.name)
+            self.string(subroutine.shape)
+            self.uint(subroutine.controllable.value)
+            self.circuit(subroutine.circuit)
+
+        # The string table goes in front of the other integers.
+        encoded = [string.encode() for string in self.strings]
+        integers = bytearray()
+        _write_varint(integers, len(encoded))
+        for string in encoded:
+            _write_varint(integers, len(string))
+        integers += self.integers
+        if sys.byteorder == 'big':
+            self.doubles.byteswap()
+        sections = [b''.join(encoded), self.headers, integers, self.wire_codes, self.doubles.tobytes()]
+
+        data = bytearray(MAGIC)
+        for section in sections:
+            _write_varint(data, len(section))
+        for section in sections:
+            data += section
+        return bytes(data)
+
+    def uint(self, n: int) -> None:
+        _write_varint(self.integers, n)
+
+    def wire(self, wire: Wire) -> None:
+        _write_varint(self.wire_codes, wire.i << 1 if wire.i >= 0 else (-wire.i << 1) - 1)
+
+    def wires(self, wires: List[Wire]) -> None:
+        self.uint(len(wires))
+        for wire in wires:
+            self.wire(wire)
+
+    def string(self, string: str) -> None:
+        self.uint(self.strings.setdefault(string, len(self.strings)))
+
+    def arity(self, assignments: List[TypeAssignment]) -> None:
+        self.uint(len(assignments))
+        for assignment in assignments:
+            self.wire(assignment.wire)
+            self.uint(assignment.type.value)
+
+    def circuit(self, circuit: Circuit) -> None:
+        self.arity(circuit.inputs)
+        self.uint(len(circuit.gates))
+        for gate in circuit.gates:
+            self.gate(gate)
+        self.arity(circuit.outputs)
+
+    def gate(self, gate: Gate) -> None:
+        opcode = _OPCODE.get(type(gate))
+        if opcode is None:
+            raise ValueError("Can not serialize gate: {}".format(gate))
+        flags = 0
+        if getattr(gate, 'inverted', False):
+            flags |= _INVERTED
+        control = getattr(gate, 'control', None)  # type: Optional[Control]
+        if control is not None and control.no_control:
+            flags |= _NO_CONTROL
+        if getattr(gate, 'value', False) or (isinstance(gate, Comment) and gate.wire_comments is None):
+            flags |= _VALUE
+        self.headers.append(opcode | flags)
+
+        # The wires of a gate are written in the order of its fields, so they can be read positionally.
+        if isinstance(gate, QGate):
+            self.uint(gate.op.value)
+            self.wires(gate.wires)
+        elif isinstance(gate, QRot):
+            self.uint(gate.op.value)
+            self.doubles.append(gate.timestep)
+            self.wire(gate.wire)
+        elif isinstance(gate, GPhase):
+            self.doubles.append(gate.timestep)
+            self.wires(gate.control.controlled)
+            self.wires(gate.anchors)
+            return
+        elif isinstance(gate, (CGate, CSwap)):
+            if isinstance(gate, CGate):
+                self.string(gate.name)
+            self.wires(gate.wires)
+        elif isinstance(gate, SubroutineCall):
+            self.uint(gate.repetitions)
+            self.string(gate.name)
+            self.string(gate.shape)
+            self.wires(gate.inputs)
+            self.wires(gate.outputs)
+        elif isinstance(gate, Comment):
+            self.string(gate.comment)
+            wire_comments = gate.wire_comments or ()
+            self.uint(len(wire_comments))
+            for wire, label in wire_comments:
+                self.wire(wire)
+                self.string(label)
+        else:
+            self.wire(gate.wire)
+        if control is not None:
+            self.wires(control.controlled)
+
+
+def _decode(data: memoryview) -> Start:
+    """Decode the data following MAGIC."""
+    # The section sizes are the first five varints.
+    sizes = []  # type: List[int]
+    position = 0
+    while len(sizes) < 5:
+        size = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            size |= (byte & 0x7f) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        sizes.append(size)
+    if position + sum(sizes) != len(data):
+        raise ValueError("Truncated or corrupt quippy binary circuit")
+    sections = []  # type: List[memoryview]
+    for size in sizes:
+        sections.append(data[position:position + size])
+        position += size
+    string_data, header_data, integer_data, wire_data, double_data = sections
+
+    read_header = iter(header_data).__next__
+    read_uint = iter(_read_varints(integer_data)).__next__
+    # Wires are immutable, so every index gets a single Wire object.
+    codes = _read_varints(wire_data)
+    wire_objects = {code: Wire((code >> 1) ^ -(code & 1)) for code in set(codes)}
+    wire_iterator = map(wire_objects.__getitem__, codes)
+    read_wire = wire_iterator.__next__
+    doubles = array('d')
+    doubles.frombytes(double_data)
+    if sys.byteorder == 'big':
+        doubles.byteswap()
+    read_double = iter(doubles).__next__
+
+    strings = []  # type: List[str]
+    lengths = [read_uint() for _ in range(read_uint())]
+    offset = 0
+    for length in lengths:
+        strings.append(str(string_data[offset:offset + length], 'utf-8'))
+        offset += length
+
+    qgate_ops = {op.value: op for op in QGate_Op}
+    qrot_ops = {op.value: op for op in QRot_Op}
+    value_types = (QInit, CInit, QTerm, CTerm, DTerm)
+
+    def read_wires() -> List[Wire]:
+        count = read_uint()
+        wires = list(islice(wire_iterator, count))
+        if len(wires) != count:
+            raise ValueError("Truncated or corrupt quippy binary circuit")
+        return wires
+
+    def arity() -> List[TypeAssignment]:
+        return [TypeAssignment(read_wire(), TypeAssignment_Type(read_uint())) for _ in range(read_uint())]
+
+    def gate() -> Gate:
+        # The arguments are given positionally, which is faster than by keyword, in the order of the fields.
+        header = read_header()
+        gate_type = _OPCODES[header & 0x1f]
+        if gate_type is QGate:
+            return QGate(qgate_ops[read_uint()], header & _INVERTED != 0, read_wires(),
+                         Control(read_wires(), header & _NO_CONTROL != 0))
+        if gate_type is QRot:
+            return QRot(qrot_ops[read_uint()], header & _INVERTED != 0, read_double(), read_wire())
+        if gate_type is GPhase:
+            return GPhase(read_double(), Control(read_wires(), header & _NO_CONTROL != 0), read_wires())
+        if gate_type is CNot:
+            return CNot(read_wire(), Control(read_wires(), header & _NO_CONTROL != 0))
+        if gate_type is CGate:
+            return CGate(strings[read_uint()], header & _INVERTED != 0, read_wires())
+        if gate_type is CSwap:
+            return CSwap(read_wires(), Control(read_wires(), header & _NO_CONTROL != 0))
+        if gate_type is SubroutineCall:
+            return SubroutineCall(read_uint(), strings[read_uint()], strings[read_uint()],
+                                  header & _INVERTED != 0, read_wires(), read_wires(),
+                                  Control(read_wires(), header & _NO_CONTROL != 0))
+        if gate_type is Comment:
+            comment = strings[read_uint()]
+            wire_comments = [(read_wire(), strings[read_uint()]) for _ in range(read_uint())]
+            return Comment(comment, header & _INVERTED != 0, None if header & _VALUE else wire_comments)
+        if gate_type in value_types:
+            return gate_type(header & _VALUE != 0, read_wire())
+        return gate_type(read_wire())
+
+    def circuit() -> Circuit:
+        inputs = arity()
+        gates = [gate() for _ in range(read_uint())]
+        return Circuit(inputs=inputs, gates=gates, outputs=arity())
+
+    main = circuit()
+    subroutines = []  # type: List[Subroutine]
+    for _ in range(read_uint()):
+        name = strings[read_uint()]
+        shape = strings[read_uint()]
+        controllable = Subroutine_Control(read_uint())
+        subroutines.append(Subroutine(name=name, shape=shape, controllable=controllable, circuit=circuit()))
+    for remaining in [read_header, read_uint, read_wire, read_double]:
+        if next(iter(remaining, None), None) is not None:
+            raise ValueError("Trailing data after the quippy binary circuit")
+    return Start(circuit=main, subroutines=subroutines)
@@ -0,0 +1,85 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Generate quippy/_tables.py, the pre-compiled LALR parser for the Quipper grammar.
+
+The generated module contains the serialized Lark parser as Python data,
+so the default parser can be loaded without compiling quipper.g.
+Run as: python -m quippy.build_tables
+"""
+
+import hashlib
+import os
+import pprint
+import sys
+
+import lark
+from lark import Lark
+from lark.grammar import Rule
+from lark.lexer import TerminalDef
+
+from quippy.parser import LALR_OPTIONS
+
+TABLES_PATH = os.path.join(os.path.dirname(__file__), '_tables.py')
+
+HEADER = '''# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This file was generated by quippy.build_tables. Do not edit.
+'''
+
+
+def grammar_hash(grammar: str) -> str:
+    """The hash of the grammar that identifies which grammar tables were built from."""
+    return hashlib.sha256(grammar.encode()).hexdigest()
+
+
+def generate(grammar: str, start='start') -> str:
+    """Compile the grammar and return the source of a module containing its LALR tables.
+
+    The tables use the options in quippy.parser.LALR_OPTIONS, like the parsers compiled at run time.
+    """
+    compiled = Lark(grammar, start=start, parser='lalr', **LALR_OPTIONS)
+    data, memo = compiled.memo_serialize([TerminalDef, Rule])
+    return ''.join([
+        HEADER,
+        '\nLARK_VERSION = {!r}\n'.format(lark.__version__),
+        'GRAMMAR_HASH = {!r}\n'.format(grammar_hash(grammar)),
+        'START = {!r}\n'.format(start),
+        '\nDATA = ', pprint.pformat(data, width=100), '\n',
+        '\nMEMO = ', pprint.pformat(memo, width=100), '\n',
+        ])
+
+
+def main(path=TABLES_PATH):
+    with open(os.path.join(os.path.dirname(__file__), 'quipper.g')) as grammar_file:
+        grammar = grammar_file.read()
+    with open(path, 'w') as tables_file:
+        tables_file.write(generate(grammar))
+    print("Wrote {}".format(path), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
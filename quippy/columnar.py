@@ -0,0 +1,334 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A columnar circuit representation backed by NumPy arrays.
+
+Every gate is a row in a set of parallel arrays, and the variable-length target and control wire lists
+are stored CSR-style: the wires of gate i are wires[wire_offsets[i]:wire_offsets[i + 1]].
+NumPy is an optional dependency of quippy, install it with: pip install quippy[numpy]
+"""
+
+import enum
+from array import array
+from collections import Counter
+from typing import *
+
+import numpy as np
+
+from quippy.transformer import Wire, Control, TypeAssignment, Gate, QGate_Op, QGate, QRot_Op, QRot, \
+    GPhase, CNot, CGate, CSwap, QPrep, QUnprep, QInit, CInit, QTerm, CTerm, QMeas, QDiscard, CDiscard, \
+    DTerm, SubroutineCall, Comment, Circuit, Subroutine
+
+
+@enum.unique
+class GateKind(enum.IntEnum):
+    """The type of gate in a row of a ColumnarCircuit."""
+    QGate = 0
+    QRot = 1
+    QInit = 2
+    CInit = 3
+    QTerm = 4
+    CTerm = 5
+    QMeas = 6
+    QDiscard = 7
+    CDiscard = 8
+    SubroutineCall = 9
+    Comment = 10
+    # Any other gate, such as the lark Trees of a custom transformer.
+    Other = 11
+    GPhase = 12
+    CNot = 13
+    CGate = 14
+    CSwap = 15
+    QPrep = 16
+    QUnprep = 17
+    DTerm = 18
+
+
+_KINDS = {
+    QGate: GateKind.QGate, QRot: GateKind.QRot, QInit: GateKind.QInit, CInit: GateKind.CInit,
+    QTerm: GateKind.QTerm, CTerm: GateKind.CTerm, QMeas: GateKind.QMeas, QDiscard: GateKind.QDiscard,
+    CDiscard: GateKind.CDiscard, SubroutineCall: GateKind.SubroutineCall, Comment: GateKind.Comment,
+    GPhase: GateKind.GPhase, CNot: GateKind.CNot, CGate: GateKind.CGate, CSwap: GateKind.CSwap,
+    QPrep: GateKind.QPrep, QUnprep: GateKind.QUnprep, DTerm: GateKind.DTerm,
+    }  # type: Dict[type, GateKind]
+
+# Gates with a value and a single wire.
+_SINGLE_WIRE_TYPES = {
+    GateKind.QInit: QInit, GateKind.CInit: CInit, GateKind.QTerm: QTerm, GateKind.CTerm: CTerm,
+    GateKind.DTerm: DTerm,
+    }
+# Gates with only a single wire.
+_MEAS_DISCARD_TYPES = {
+    GateKind.QMeas: QMeas, GateKind.QDiscard: QDiscard, GateKind.CDiscard: CDiscard,
+    GateKind.QPrep: QPrep, GateKind.QUnprep: QUnprep,
+    }
+
+# The gates that keep their object, since they hold strings or wires that are not stored in columns.
+_OBJECT_KINDS = (GateKind.SubroutineCall, GateKind.Comment, GateKind.CGate, GateKind.Other)
+
+
+class ColumnarCircuit:
+    """A circuit stored as parallel NumPy arrays with one row per gate.
+
+    :ivar kind: The GateKind of every gate (uint8).
+    :ivar op: The QGate_Op or QRot_Op value of QGate and QRot rows,
+        the initialized or terminated value of init and term rows, and 0 otherwise (int8).
+    :ivar inverted: Whether the gate is inverted (bool).
+    :ivar timestep: The timestep of QRot and GPhase rows and NaN otherwise (float64).
+    :ivar wire_offsets: The offsets of the target wires of every gate into wires (int64, length n + 1).
+        The inputs of a subroutine call, the anchors of a global phase
+        and the wires of a comment count as targets.
+    :ivar wires: The target wires (int64).
+    :ivar control_offsets: The offsets of the controls of every gate into controls (int64, length n + 1).
+    :ivar controls: The control wires (int64).
+    :ivar control_signs: Whether each control is positive (bool).
+    :ivar no_control: Whether the gate is marked 'with nocontrol' (bool).
+    :ivar objects: The original gate of SubroutineCall, Comment, CGate and Other rows, by row index.
+    """
+
+    def __init__(self, inputs: List[TypeAssignment], outputs: List[TypeAssignment], kind, op, inverted,
+                 timestep, wire_offsets, wires, control_offsets, controls, control_signs, no_control,
+                 objects: Dict[int, Gate]):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.kind = kind
+        self.op = op
+        self.inverted = inverted
+        self.timestep = timestep
+        self.wire_offsets = wire_offsets
+        self.wires = wires
+        self.control_offsets = control_offsets
+        self.controls = controls
+        self.control_signs = control_signs
+        self.no_control = no_control
+        self.objects = objects
+
+    def __len__(self):
+        return len(self.kind)
+
+    @classmethod
+    def from_gates(cls, inputs: List[TypeAssignment], gates: Iterable[Gate],
+                   outputs: List[TypeAssignment]) -> 'ColumnarCircuit':
+        """Build a columnar circuit from a stream of gates, without keeping the gate objects."""
+        builder = _Builder()
+        for gate in gates:
+            builder.append(gate)
+        return builder.build(inputs, outputs)
+
+    @classmethod
+    def from_circuit(cls, circuit: Circuit) -> 'ColumnarCircuit':
+        return cls.from_gates(circuit.inputs, circuit.gates, circuit.outputs)
+
+    def gate(self, i: int) -> Gate:
+        """Reconstruct the gate object of row i."""
+        kind = GateKind(self.kind[i])
+        if kind in _OBJECT_KINDS:
+            return self.objects[i]
+        wires = [Wire(int(w)) for w in self.wires[self.wire_offsets[i]:self.wire_offsets[i + 1]]]
+        if kind == GateKind.QGate:
+            return QGate(op=QGate_Op(int(self.op[i])), inverted=bool(self.inverted[i]), wires=wires,
+                         control=self.control(i))
+        if kind == GateKind.GPhase:
+            return GPhase(timestep=float(self.timestep[i]), control=self.control(i), anchors=wires)
+        if kind == GateKind.CNot:
+            return CNot(wire=wires[0], control=self.control(i))
+        if kind == GateKind.CSwap:
+            return CSwap(wires=wires, control=self.control(i))
+        if kind == GateKind.QRot:
+            return QRot(op=QRot_Op(int(self.op[i])), inverted=bool(self.inverted[i]),
+                        timestep=float(self.timestep[i]), wire=wires[0])
+        if kind in _SINGLE_WIRE_TYPES:
+            return _SINGLE_WIRE_TYPES[kind](value=bool(self.op[i]), wire=wires[0])
+        return _MEAS_DISCARD_TYPES[kind](wire=wires[0])
+
+    def control(self, i: int) -> Control:
+        """Reconstruct the Control of row i."""
+        begin, end = self.control_offsets[i], self.control_offsets[i + 1]
+        controlled = [Wire(int(w) if sign else -int(w))
+                      for w, sign in zip(self.controls[begin:end], self.control_signs[begin:end])]
+        return Control(controlled=controlled, no_control=bool(self.no_control[i]))
+
+    def to_circuit(self) -> Circuit:
+        return Circuit(inputs=self.inputs, gates=[self.gate(i) for i in range(len(self))],
+                       outputs=self.outputs)
+
+    def control_counts(self) -> np.ndarray:
+        """The number of controls of every gate."""
+        return np.diff(self.control_offsets)
+
+    def gate_counts(self) -> Counter:
+        """Count the gates by QGate_Op and QRot_Op, and the other gates by GateKind."""
+        counts = Counter()  # type: Counter
+        kinds = np.bincount(self.kind, minlength=len(GateKind))
+        for kind, count in enumerate(kinds):
+            if count and kind not in (GateKind.QGate, GateKind.QRot):
+                counts[GateKind(kind)] = int(count)
+        for kind, op_type in [(GateKind.QGate, QGate_Op), (GateKind.QRot, QRot_Op)]:
+            ops = np.bincount(self.op[self.kind == kind], minlength=len(op_type) + 1)
+            for op in op_type:
+                if ops[op.value]:
+                    counts[op] = int(ops[op.value])
+        return counts
+
+    def __eq__(self, other):
+        if not isinstance(other, ColumnarCircuit):
+            return NotImplemented
+        return (self.inputs == other.inputs and self.outputs == other.outputs
+                and self.objects == other.objects
+                and all(np.array_equal(getattr(self, name), getattr(other, name), equal_nan=True)
+                        for name in ['kind', 'op', 'inverted', 'timestep', 'wire_offsets', 'wires',
+                                     'control_offsets', 'controls', 'control_signs', 'no_control']))
+
+    def __repr__(self):
+        return 'ColumnarCircuit(<{} gates>)'.format(len(self))
+
+
+class _Builder:
+    """Append gates to growable arrays, which are converted to NumPy arrays once at the end."""
+
+    def __init__(self):
+        self.kind = array('B')
+        self.op = array('b')
+        self.inverted = array('B')
+        self.timestep = array('d')
+        self.wire_offsets = array('q', [0])
+        self.wires = array('q')
+        self.control_offsets = array('q', [0])
+        self.controls = array('q')
+        self.control_signs = array('B')
+        self.no_control = array('B')
+        self.objects = {}  # type: Dict[int, Gate]
+
+    def append(self, gate: Gate) -> None:
+        kind = _KINDS.get(type(gate), GateKind.Other)
+        op = 0
+        inverted = False
+        timestep = float('nan')
+        control = None  # type: Optional[Control]
+        wires = ()  # type: Iterable[Wire]
+
+        if kind == GateKind.QGate:
+            op = gate.op.value
+            inverted = gate.inverted
+            wires = gate.wires
+            control = gate.control
+        elif kind == GateKind.QRot:
+            op = gate.op.value
+            inverted = gate.inverted
+            timestep = gate.timestep
+            wires = (gate.wire,)
+        elif kind == GateKind.GPhase:
+            timestep = gate.timestep
+            wires = gate.anchors
+            control = gate.control
+        elif kind == GateKind.CNot:
+            wires = (gate.wire,)
+            control = gate.control
+        elif kind == GateKind.CSwap:
+            wires = gate.wires
+            control = gate.control
+        elif kind == GateKind.CGate:
+            inverted = gate.inverted
+            wires = gate.wires
+        elif kind in _SINGLE_WIRE_TYPES:
+            op = int(gate.value)
+            wires = (gate.wire,)
+        elif kind in _MEAS_DISCARD_TYPES:
+            wires = (gate.wire,)
+        elif kind == GateKind.SubroutineCall:
+            inverted = gate.inverted
+            wires = gate.inputs
+            control = gate.control
+        elif kind == GateKind.Comment:
+            inverted = gate.inverted
+            wires = [wire for wire, _ in gate.wire_comments or ()]
+
+        if kind in _OBJECT_KINDS:
+            self.objects[len(self.kind)] = gate
+        self.kind.append(kind)
+        self.op.append(op)
+        self.inverted.append(inverted)
+        self.timestep.append(timestep)
+        self.wires.extend(wire.i for wire in wires)
+        self.wire_offsets.append(len(self.wires))
+        if control is not None:
+            self.controls.extend(abs(wire.i) for wire in control.controlled)
+            self.control_signs.extend(wire.i >= 0 for wire in control.controlled)
+        self.control_offsets.append(len(self.controls))
+        self.no_control.append(control is not None and control.no_control)
+
+    def build(self, inputs: List[TypeAssignment], outputs: List[TypeAssignment]) -> ColumnarCircuit:
+        return ColumnarCircuit(
+            inputs=inputs,
+            outputs=outputs,
+            kind=np.frombuffer(self.kind, dtype=np.uint8),
+            op=np.frombuffer(self.op, dtype=np.int8),
+            inverted=np.frombuffer(self.inverted, dtype=np.uint8).astype(bool),
+            timestep=np.frombuffer(self.timestep, dtype=np.float64),
+            wire_offsets=np.frombuffer(self.wire_offsets, dtype=np.int64),
+            wires=np.frombuffer(self.wires, dtype=np.int64),
+            control_offsets=np.frombuffer(self.control_offsets, dtype=np.int64),
+            controls=np.frombuffer(self.controls, dtype=np.int64),
+            control_signs=np.frombuffer(self.control_signs, dtype=np.uint8).astype(bool),
+            no_control=np.frombuffer(self.no_control, dtype=np.uint8).astype(bool),
+            objects=self.objects,
+            )
+
+
+ColumnarStart = NamedTuple('ColumnarStart', [
+    ('circuit', ColumnarCircuit),
+    # The circuit of every subroutine is a ColumnarCircuit.
+    ('subroutines', List[Subroutine])
+    ])
+
+
+def parse_columnar(fileobj: Iterable[Union[str, bytes]], parser='fast') -> ColumnarStart:
+    """Parse a Quipper file straight into columnar circuits, without keeping a list of gate objects.
+
+    :param fileobj: An open text or binary file, or any other iterable of lines.
+    :param parser: The parser engine for the lines, either 'fast' or 'lalr'.
+    """
+    from quippy.stream import iter_gates, Inputs, Outputs, SubroutineHeader
+
+    circuit = None  # type: Optional[ColumnarCircuit]
+    subroutines = []  # type: List[Subroutine]
+    header = None  # type: Optional[SubroutineHeader]
+    inputs = None  # type: Optional[List[TypeAssignment]]
+    builder = _Builder()
+    for event in iter_gates(fileobj, parser=parser):
+        if isinstance(event, SubroutineHeader):
+            header = event
+        elif isinstance(event, Inputs):
+            inputs = event.inputs
+            builder = _Builder()
+        elif isinstance(event, Outputs):
+            if inputs is None:
+                raise RuntimeError("Outputs without Inputs")
+            columnar = builder.build(inputs, event.outputs)
+            if header is None:
+                circuit = columnar
+            else:
+                subroutines.append(Subroutine(name=header.name, shape=header.shape,
+                                              controllable=header.controllable, circuit=columnar))
+            header = None
+            inputs = None
+        elif inputs is None:
+            raise RuntimeError("Gate outside of a circuit: {}".format(event))
+        else:
+            builder.append(event)
+
+    if circuit is None:
+        raise RuntimeError("Missing the main circuit")
+    return ColumnarStart(circuit=circuit, subroutines=subroutines)
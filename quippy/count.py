@@ -0,0 +1,147 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Count the gates of a Quipper file while parsing it, without building gate objects.
+
+The lines recognized by quippy.fast are only matched, not converted to objects,
+and the other lines are parsed one at a time and counted right away.
+"""
+
+import io
+from collections import Counter
+from typing import *
+
+from lark.exceptions import UnexpectedInput
+
+from quippy.analysis import gate_key, control_count
+from quippy.fast import FastGateParser, syntax, INIT_TERM_TYPES, MEAS_DISCARD_TYPES
+from quippy.stream import HEADERS, BINARY_HEADERS, string_literal
+from quippy.transformer import QGATE_NAMES, QROT_NAMES, SubroutineCall, Comment
+
+GateCounts = NamedTuple('GateCounts', [
+    # The number of gates by QGate_Op, QRot_Op, or by type for the other gates.
+    # Comments and subroutine calls are not counted as gates, as in quippy.analysis.count_resources.
+    ('gates', Counter),
+    # The number of controlled gates by (key in gates, number of controls).
+    ('controlled', Counter),
+    # The number of calls of every subroutine, including repetitions.
+    ('calls', Counter)
+    ])
+
+CountStart = NamedTuple('CountStart', [
+    ('circuit', GateCounts),
+    # The counts of every subroutine by name.
+    ('subroutines', Dict[str, GateCounts])
+    ])
+
+
+def count_gates(fileobj: Iterable[Union[str, bytes]]) -> CountStart:
+    """Count the gates of every circuit in a Quipper file, reading one line at a time.
+
+    Memory use is constant in the number of gates. Subroutine calls are not inlined but counted in calls,
+    see quippy.analysis.count_resources for the counts of the inlined circuit.
+    Comments are not counted.
+
+    :param fileobj: An open text or binary file, or any other iterable of lines.
+    :return: The counts of the main circuit and of every subroutine.
+    """
+    circuit = _new_counts()
+    subroutines = {}  # type: Dict[str, GateCounts]
+    counters = {}  # type: Dict[bool, _LineCounter]
+    counts = circuit
+
+    for line_number, line in enumerate(fileobj, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        binary = isinstance(line, bytes)
+        try:
+            if line.startswith(BINARY_HEADERS if binary else HEADERS):
+                if binary:
+                    line = line.decode()
+                if line.startswith('Subroutine:'):
+                    counts = _new_counts()
+                    subroutines[string_literal(line[len('Subroutine:'):])] = counts
+            else:
+                if binary not in counters:
+                    counters[binary] = _LineCounter(binary)
+                counters[binary].count(line, counts)
+        except (UnexpectedInput, KeyError, ValueError) as e:
+            raise RuntimeError("Failed to parse line {}: {!s}".format(
+                line_number, line.decode() if isinstance(line, bytes) else line)) from e
+    return CountStart(circuit=circuit, subroutines=subroutines)
+
+
+class CountParser:
+    """A parser that counts gates instead of building them, given by quipper_parser(mode='count')."""
+
+    def parse(self, text: str) -> CountStart:
+        return count_gates(io.StringIO(text))
+
+
+def _new_counts() -> GateCounts:
+    return GateCounts(gates=Counter(), controlled=Counter(), calls=Counter())
+
+
+class _LineCounter:
+    """Count the gate lines given either as str or as bytes."""
+
+    def __init__(self, binary: bool):
+        self._syntax = syntax(binary)
+        self._parser = FastGateParser(binary=binary, compact=True)
+
+    def count(self, line: Union[str, bytes], counts: GateCounts) -> None:
+        syntax = self._syntax
+        if line.startswith(syntax.qgate_prefix):
+            m = syntax.qgate.match(line)
+            op = QGATE_NAMES.get(syntax.text(m.group(1))) if m is not None else None
+            if op is not None:
+                counts.gates[op] += 1
+                if m.group(4):
+                    counts.controlled[op, m.group(4).count(syntax.comma) + 1] += 1
+                return
+        elif line.startswith(syntax.qrot_prefix):
+            m = syntax.qrot.match(line)
+            op = QROT_NAMES.get(syntax.text(m.group(1))) if m is not None else None
+            if op is not None:
+                counts.gates[op] += 1
+                return
+        elif line.startswith(syntax.subroutine_prefix):
+            m = syntax.subroutine_call.match(line)
+            if m is not None:
+                counts.calls[syntax.text(m.group(2))] += int(m.group(1)) if m.group(1) is not None else 1
+                return
+        elif line.startswith(syntax.comment_prefix):
+            if syntax.comment.match(line) is not None:
+                return
+        else:
+            m = syntax.init_term.match(line)
+            if m is not None:
+                counts.gates[INIT_TERM_TYPES[syntax.text(m.group(1))]] += 1
+                return
+            m = syntax.meas_discard.match(line)
+            if m is not None:
+                counts.gates[MEAS_DISCARD_TYPES[syntax.text(m.group(1))]] += 1
+                return
+
+        # Any other line is parsed to a gate, which is counted and dropped.
+        gate = self._parser.parse(line)
+        if isinstance(gate, SubroutineCall):
+            counts.calls[gate.name] += gate.repetitions
+        elif not isinstance(gate, Comment):
+            key = gate_key(gate)
+            counts.gates[key] += 1
+            controls = control_count(gate)
+            if controls:
+                counts.controlled[key, controls] += 1
@@ -0,0 +1,128 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The dependency graph of the gates of a circuit.
+
+Two gates depend on each other if they share a wire, either as a target or as a control.
+The graph is stored in flat arrays, the wires of gate i are wires[wire_offsets[i]:wire_offsets[i + 1]]
+and the previous and next gate on each of these wires are stored at the same positions
+in predecessor and successor.
+"""
+
+from array import array
+from typing import *
+
+from quippy.analysis import gate_wires
+from quippy.transformer import Gate, Circuit
+
+
+class CircuitDAG:
+    """The dependency graph of a circuit, built in a single pass over its gates.
+
+    Comments do not act on any wires, so they have no dependencies.
+
+    :ivar gates: The gates of the circuit.
+    :ivar wire_offsets: The offsets of the wires of every gate into wires (length n + 1).
+    :ivar wires: The wires, targets and controls, of every gate.
+        Negative controls are stored as their positive wire.
+    :ivar predecessor: The index of the previous gate on each entry of wires, or -1.
+    :ivar successor: The index of the next gate on each entry of wires, or -1.
+    :ivar layer: The topological layer of every gate,
+        one more than the highest layer of its predecessors.
+    """
+
+    def __init__(self, circuit: Circuit):
+        self.gates = circuit.gates  # type: List[Gate]
+        self.wire_offsets = array('q', [0])
+        self.wires = array('q')
+        self.predecessor = array('q')
+        self.successor = array('q')
+        self.layer = array('q')
+        self._wire_gates = {}  # type: Dict[int, array]
+
+        # The position in wires of the last gate on every wire.
+        last = {}  # type: Dict[int, int]
+        wire_offsets, wires = self.wire_offsets, self.wires
+        predecessor, successor, layer = self.predecessor, self.successor, self.layer
+        wire_gates = self._wire_gates
+        for i, gate in enumerate(self.gates):
+            gate_layer = 0
+            # A wire is only listed once per gate, even if it is both a target and a control.
+            for wire in dict.fromkeys(wire.i for wire in gate_wires(gate)):
+                position = len(wires)
+                wires.append(wire)
+                previous = last.get(wire)
+                if previous is None:
+                    predecessor.append(-1)
+                    wire_gates[wire] = array('q', [i])
+                else:
+                    previous_gate = wire_gates[wire][-1]
+                    predecessor.append(previous_gate)
+                    successor[previous] = i
+                    wire_gates[wire].append(i)
+                    gate_layer = max(gate_layer, layer[previous_gate] + 1)
+                successor.append(-1)
+                last[wire] = position
+            wire_offsets.append(len(wires))
+            layer.append(gate_layer)
+
+    def __len__(self):
+        return len(self.gates)
+
+    def wires_of(self, i: int) -> array:
+        """The wires of gate i."""
+        return self.wires[self.wire_offsets[i]:self.wire_offsets[i + 1]]
+
+    def predecessors(self, i: int) -> List[int]:
+        """The gates that gate i directly depends on, without duplicates."""
+        begin, end = self.wire_offsets[i], self.wire_offsets[i + 1]
+        return [j for j in dict.fromkeys(self.predecessor[begin:end]) if j >= 0]
+
+    def successors(self, i: int) -> List[int]:
+        """The gates that directly depend on gate i, without duplicates."""
+        begin, end = self.wire_offsets[i], self.wire_offsets[i + 1]
+        return [j for j in dict.fromkeys(self.successor[begin:end]) if j >= 0]
+
+    def previous_on(self, i: int, wire: int) -> int:
+        """The previous gate on a wire of gate i, or -1 if it is the first."""
+        return self.predecessor[self._position(i, wire)]
+
+    def next_on(self, i: int, wire: int) -> int:
+        """The next gate on a wire of gate i, or -1 if it is the last."""
+        return self.successor[self._position(i, wire)]
+
+    def wire_gates(self, wire: int) -> array:
+        """The indices of all gates on a wire, in order."""
+        return self._wire_gates.get(wire, array('q'))
+
+    def depth(self) -> int:
+        """The number of layers."""
+        return max(self.layer) + 1 if self.layer else 0
+
+    def layers(self) -> List[List[int]]:
+        """The indices of the gates in every topological layer.
+
+        All gates in a layer act on different wires, and only depend on gates in earlier layers.
+        """
+        layers = [[] for _ in range(self.depth())]  # type: List[List[int]]
+        for i, gate_layer in enumerate(self.layer):
+            layers[gate_layer].append(i)
+        return layers
+
+    def _position(self, i: int, wire: int) -> int:
+        begin, end = self.wire_offsets[i], self.wire_offsets[i + 1]
+        for position in range(begin, end):
+            if self.wires[position] == wire:
+                return position
+        raise KeyError("Gate {} does not act on wire {}".format(i, wire))
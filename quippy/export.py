@@ -0,0 +1,458 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Export Quipper circuits to OpenQASM 3 without building the parsed file in memory.
+
+The gates of the main circuit are converted one at a time. Since OpenQASM declares the registers and
+gates before they are used, the converted gates are kept in a temporary file, which stays in memory
+while it is small, and copied to the output after the declarations.
+"""
+
+import io
+import itertools
+import math
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from typing import *
+
+from quippy.stream import Event, Inputs, Outputs, SubroutineHeader, iter_gates, build_start
+from quippy.transform import invert_gate
+from quippy.transformer import Wire, Gate, QGate_Op, QGate, QRot_Op, QRot, GPhase, CNot, CGate, CSwap, \
+    QPrep, QUnprep, QInit, CInit, QTerm, CTerm, QMeas, QDiscard, CDiscard, DTerm, SubroutineCall, Comment, \
+    TypeAssignment_Type, Subroutine, Start
+from quippy.writer import CHUNK_LINES, write_events
+
+"""The size up to which the converted main circuit is kept in memory instead of a temporary file."""
+SPOOL_SIZE = 1 << 26
+
+# The OpenQASM gate of every operation, if it is not inverted and if it is.
+_QGATE_NAMES = {
+    QGate_Op.Not: ('x', 'x'),
+    QGate_Op.MultiNot: ('x', 'x'),
+    QGate_Op.H: ('h', 'h'),
+    QGate_Op.Y: ('y', 'y'),
+    QGate_Op.Z: ('z', 'z'),
+    QGate_Op.S: ('s', 'sdg'),
+    QGate_Op.T: ('t', 'tdg'),
+    QGate_Op.E: ('E', 'inv @ E'),
+    QGate_Op.Omega: ('omega', 'inv @ omega'),
+    QGate_Op.V: ('sx', 'inv @ sx'),
+    QGate_Op.Swap: ('swap', 'swap'),
+    QGate_Op.W: ('W', 'W'),
+    QGate_Op.IX: ('iX', 'inv @ iX'),
+    }  # type: Dict[QGate_Op, Tuple[str, str]]
+
+# The definitions of the gates that are not in stdgates.inc.
+_DEFINITIONS = {
+    # E = H S^3 ω^3
+    QGate_Op.E: 'gate E a {\n    sdg a;\n    h a;\n    gphase(3 * pi / 4);\n}',
+    QGate_Op.Omega: 'gate omega a {\n    gphase(pi / 4);\n}',
+    QGate_Op.W: 'gate W a, b {\n    cx a, b;\n    ch b, a;\n    cx a, b;\n}',
+    QGate_Op.IX: 'gate iX a {\n    x a;\n    gphase(pi / 2);\n}',
+    }  # type: Dict[QGate_Op, str]
+
+# The gates of stdgates.inc with positive controls.
+_CONTROLLED_NAMES = {
+    ('x', 1): 'cx', ('x', 2): 'ccx', ('y', 1): 'cy', ('z', 1): 'cz', ('h', 1): 'ch', ('swap', 1): 'cswap',
+    }  # type: Dict[Tuple[str, int], str]
+
+# The expression of every classical function of CGate.
+_CGATE_EXPRESSIONS = {
+    'not': lambda a: '!' + a,
+    'and': lambda *inputs: ' && '.join(inputs) or 'true',
+    'or': lambda *inputs: ' || '.join(inputs) or 'false',
+    'xor': lambda *inputs: ' ^ '.join(inputs) or 'false',
+    'eq': lambda a, b: '{} == {}'.format(a, b),
+    'if': lambda a, b, c: '({0} && {1}) || (!{0} && {2})'.format(a, b, c),
+    }  # type: Dict[str, Callable[..., str]]
+
+# A control as its operand, whether it is positive and whether it is a qubit.
+_Control = Tuple[str, bool, bool]
+
+_SUBROUTINE_HEADER = re.compile(r'^[ \t]*Subroutine:', re.MULTILINE)
+_BINARY_SUBROUTINE_HEADER = re.compile(_SUBROUTINE_HEADER.pattern.encode(), re.MULTILINE)
+
+
+def qasm(source: Union[str, 'os.PathLike', Start, Iterable[Event]], out: IO[str], inline=False,
+         parser='fast') -> None:
+    """Write a Quipper circuit as OpenQASM 3 to a text file.
+
+    The main circuit is converted while it is parsed, so its gates are never all in memory.
+    Qubits and bits are kept in the registers q and c, and the positions of wires that are
+    terminated, measured or discarded are reused. Negative controls become negctrl modifiers
+    and Cbit controls if statements. Subroutines whose wires are all qubits and that do not
+    initialize, terminate or measure wires are defined as gates, which are called with inv, ctrl and
+    negctrl modifiers; the calls of other subroutines are inlined. So are the calls with quantum controls
+    of subroutines with gates marked 'with nocontrol', which must not get the controls of the call.
+    Global phases are kept as gphase.
+
+    :param source: The path of a Quipper file, the text of one, a parsed Start,
+        or a stream of events such as given by quippy.stream.iter_gates.
+        An event stream is read once, and its main circuit is kept in a temporary file
+        until the subroutines that follow it are read.
+    :param out: The text file to write to.
+    :param inline: Whether to inline all subroutine calls instead of defining gates.
+    :param parser: The parser engine for paths and text, either 'fast' or 'lalr'.
+    """
+    if isinstance(source, Start):
+        if source.circuit is None:
+            raise RuntimeError("Missing the main circuit")
+        _Exporter(source.subroutines, inline).export(
+            itertools.chain([Inputs(source.circuit.inputs)], source.circuit.gates), out)
+    elif isinstance(source, str) and '\n' in source:
+        match = _SUBROUTINE_HEADER.search(source)
+        subroutines = _subroutines(io.StringIO(source[match.start():]) if match else (), parser)
+        _Exporter(subroutines, inline).export(_main_events(iter_gates(io.StringIO(source), parser=parser)), out)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(str(source), 'rb') as quipper_file:
+            if os.fstat(quipper_file.fileno()).st_size == 0:
+                raise RuntimeError("Empty file: {}".format(source))
+            with mmap.mmap(quipper_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                match = _BINARY_SUBROUTINE_HEADER.search(mapped)
+                subroutines = []  # type: List[Subroutine]
+                if match:
+                    mapped.seek(match.start())
+                    subroutines = _subroutines(iter(mapped.readline, b''), parser)
+                    mapped.seek(0)
+                events = _main_events(iter_gates(iter(mapped.readline, b''), parser=parser))
+                _Exporter(subroutines, inline).export(events, out)
+    else:
+        events = iter(source)
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE, mode='w+') as spool:
+            write_events(_main_events(events, include_outputs=True), spool)
+            subroutines = build_start(events).subroutines
+            spool.seek(0)
+            _Exporter(subroutines, inline).export(_main_events(iter_gates(spool, parser='fast')), out)
+
+
+def _subroutines(lines: Iterable, parser: str) -> List[Subroutine]:
+    return build_start(iter_gates(lines, parser=parser)).subroutines
+
+
+def _main_events(events: Iterator[Event], include_outputs=False) -> Iterator[Event]:
+    """The events of the main circuit, which ends at the first Outputs event."""
+    for event in events:
+        if isinstance(event, Outputs):
+            if include_outputs:
+                yield event
+            return
+        if isinstance(event, SubroutineHeader):
+            raise RuntimeError("Missing the main circuit")
+        yield event
+    raise RuntimeError("Missing Outputs of the main circuit")
+
+
+class _Frame:
+    """The operands of the wires of a circuit."""
+
+    def __init__(self):
+        self.qubits = {}  # type: Dict[int, str]
+        self.bits = {}  # type: Dict[int, str]
+
+    def pop(self, wire: int) -> Tuple[str, bool]:
+        """Remove a wire, giving its operand and whether it is a qubit."""
+        if wire in self.qubits:
+            return self.qubits.pop(wire), True
+        if wire in self.bits:
+            return self.bits.pop(wire), False
+        raise RuntimeError("Unknown wire: {}".format(wire))
+
+    def add(self, wire: int, operand: str, qubit: bool) -> None:
+        (self.qubits if qubit else self.bits)[wire] = operand
+
+    def qubit(self, wire: Wire) -> str:
+        try:
+            return self.qubits[wire.i]
+        except KeyError:
+            raise RuntimeError("Wire is not a qubit: {}".format(wire.i)) from None
+
+    def bit(self, wire: Wire) -> str:
+        try:
+            return self.bits[wire.i]
+        except KeyError:
+            raise RuntimeError("Wire is not a bit: {}".format(wire.i)) from None
+
+    def control(self, wire: Wire) -> _Control:
+        index = abs(wire.i)
+        if index in self.qubits:
+            return self.qubits[index], wire.i >= 0, True
+        if index in self.bits:
+            return self.bits[index], wire.i >= 0, False
+        raise RuntimeError("Unknown control wire: {}".format(index))
+
+
+class _Exporter:
+    def __init__(self, subroutines: Iterable[Subroutine], inline: bool):
+        self._subroutines = {subroutine.name: subroutine for subroutine in subroutines}
+        self._inline = inline
+        # The gate of every subroutine that was checked, or None if it is inlined.
+        self._gate_names = {}  # type: Dict[str, Optional[str]]
+        self._definitions = []  # type: List[str]
+        self._used = set()  # type: Set[QGate_Op]
+        self._active = set()  # type: Set[str]
+        # The defined subroutines that have gates marked 'with nocontrol', including those of their calls.
+        self._no_control = set()  # type: Set[str]
+        self._qubit_count = 0
+        self._bit_count = 0
+        self._free_qubits = []  # type: List[str]
+        self._free_bits = []  # type: List[str]
+
+    def export(self, events: Iterable[Event], out: IO[str]) -> None:
+        """Convert the main circuit, its inputs followed by its gates, and write it after the declarations."""
+        frame = _Frame()
+        lines = []  # type: List[str]
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE, mode='w+') as body:
+            for event in events:
+                if isinstance(event, Inputs):
+                    for assignment in event.inputs:
+                        qubit = assignment.type == TypeAssignment_Type.Qbit
+                        frame.add(assignment.wire.i, self._allocate(qubit), qubit)
+                    continue
+                self._gate(event, frame, [], False, lines)
+                if len(lines) >= CHUNK_LINES:
+                    lines.append('')
+                    body.write('\n'.join(lines))
+                    lines.clear()
+
+            header = ['OPENQASM 3.0;', 'include "stdgates.inc";']
+            header.extend(_DEFINITIONS[op] for op in _DEFINITIONS if op in self._used)
+            header.extend(self._definitions)
+            if self._qubit_count:
+                header.append('qubit[{}] q;'.format(self._qubit_count))
+            if self._bit_count:
+                header.append('bit[{}] c;'.format(self._bit_count))
+            header.append('')
+            out.write('\n'.join(header))
+            body.seek(0)
+            shutil.copyfileobj(body, out, 1 << 20)
+            if lines:
+                lines.append('')
+                out.write('\n'.join(lines))
+
+    def _allocate(self, qubit: bool) -> str:
+        """The operand of a new qubit or bit, reusing the released ones."""
+        if qubit:
+            if self._free_qubits:
+                return self._free_qubits.pop()
+            self._qubit_count += 1
+            return 'q[{}]'.format(self._qubit_count - 1)
+        if self._free_bits:
+            return self._free_bits.pop()
+        self._bit_count += 1
+        return 'c[{}]'.format(self._bit_count - 1)
+
+    def _release(self, frame: _Frame, wire: Wire, qubit: bool) -> str:
+        operand = frame.qubit(wire) if qubit else frame.bit(wire)
+        del (frame.qubits if qubit else frame.bits)[wire.i]
+        (self._free_qubits if qubit else self._free_bits).append(operand)
+        return operand
+
+    def _expand(self, gates: List[Gate], frame: _Frame, controls: List[_Control], inverted: bool,
+                lines: List[str]) -> None:
+        for gate in (reversed(gates) if inverted else gates):
+            self._gate(gate, frame, controls, inverted, lines)
+
+    def _gate(self, gate: Gate, frame: _Frame, controls: List[_Control], inverted: bool, lines: List[str]) -> None:
+        """Convert a gate of a frame, which is controlled by the controls of the frame unless marked nocontrol."""
+        if isinstance(gate, SubroutineCall):
+            self._call(gate, frame, controls, inverted, lines)
+            return
+        if inverted:
+            gate = invert_gate(gate)
+        control = getattr(gate, 'control', None)
+        if control is not None:
+            own = [frame.control(wire) for wire in control.controlled]
+            controls = own if control.no_control else own + controls
+
+        if isinstance(gate, QGate):
+            name = _QGATE_NAMES[gate.op][gate.inverted]
+            if gate.op in _DEFINITIONS:
+                self._used.add(gate.op)
+            if gate.op in (QGate_Op.Swap, QGate_Op.W):
+                lines.append(_apply(name, [frame.qubit(wire) for wire in gate.wires], controls))
+            else:
+                for wire in gate.wires:
+                    lines.append(_apply(name, [frame.qubit(wire)], controls))
+        elif isinstance(gate, QRot):
+            if gate.op == QRot_Op.ExpZt:
+                name = 'rz({!r})'.format(-2 * gate.timestep if gate.inverted else 2 * gate.timestep)
+            else:
+                if gate.timestep == 0:
+                    raise RuntimeError("Rotation by 2π/0: {}".format(gate))
+                angle = 2 * math.pi / gate.timestep
+                name = 'p({!r})'.format(-angle if gate.inverted else angle)
+            lines.append(_apply(name, [frame.qubit(gate.wire)], controls))
+        elif isinstance(gate, GPhase):
+            lines.append(_apply('gphase({!r})'.format(math.pi * gate.timestep), [], controls))
+        elif isinstance(gate, Comment):
+            lines.append('// ' + gate.comment)
+        elif isinstance(gate, QInit):
+            if gate.wire.i in frame.qubits or gate.wire.i in frame.bits:
+                raise RuntimeError("Wire is initialized twice: {}".format(gate.wire.i))
+            qubit = frame.qubits[gate.wire.i] = self._allocate(True)
+            lines.append('reset {};'.format(qubit))
+            if gate.value:
+                lines.append('x {};'.format(qubit))
+        elif isinstance(gate, QPrep):
+            qubit = self._allocate(True)
+            lines.append('reset {};'.format(qubit))
+            lines.append('if ({}) x {};'.format(self._release(frame, gate.wire, False), qubit))
+            frame.qubits[gate.wire.i] = qubit
+        elif isinstance(gate, (QMeas, QUnprep)):
+            qubit = self._release(frame, gate.wire, True)
+            bit = self._allocate(False)
+            lines.append('{} = measure {};'.format(bit, qubit))
+            frame.bits[gate.wire.i] = bit
+        elif isinstance(gate, (QTerm, QDiscard)):
+            self._release(frame, gate.wire, True)
+        elif isinstance(gate, CInit):
+            if gate.wire.i in frame.qubits or gate.wire.i in frame.bits:
+                raise RuntimeError("Wire is initialized twice: {}".format(gate.wire.i))
+            bit = frame.bits[gate.wire.i] = self._allocate(False)
+            lines.append('{} = {:d};'.format(bit, gate.value))
+        elif isinstance(gate, (CTerm, CDiscard, DTerm)):
+            self._release(frame, gate.wire, False)
+        elif isinstance(gate, CGate):
+            if gate.name not in _CGATE_EXPRESSIONS:
+                raise RuntimeError("Unknown CGate operation: {}".format(gate.name))
+            if gate.inverted:
+                self._release(frame, gate.wires[0], False)
+            else:
+                expression = _CGATE_EXPRESSIONS[gate.name](*[frame.bit(wire) for wire in gate.wires[1:]])
+                bit = self._allocate(False)
+                lines.append('{} = {};'.format(bit, expression))
+                frame.bits[gate.wires[0].i] = bit
+        elif isinstance(gate, (CNot, CSwap)):
+            if any(qubit for _, _, qubit in controls):
+                raise RuntimeError("Can not control a classical gate with a qubit: {}".format(gate))
+            if isinstance(gate, CNot):
+                lines.append(_classical('{0} = !{0};'.format(frame.bit(gate.wire)), controls))
+            elif controls:
+                a, b = [frame.bit(wire) for wire in gate.wires]
+                lines.append(_classical('{{ {0} = {0} ^ {1}; {1} = {0} ^ {1}; {0} = {0} ^ {1}; }}'.format(a, b),
+                                        controls))
+            else:
+                a, b = [frame.bit(wire) for wire in gate.wires]
+                frame.bits[gate.wires[0].i], frame.bits[gate.wires[1].i] = b, a
+        else:
+            raise RuntimeError("Can not export gate: {}".format(gate))
+
+    def _call(self, call: SubroutineCall, frame: _Frame, controls: List[_Control], inverted: bool,
+              lines: List[str]) -> None:
+        """Convert a call, like quippy.transform.inline, or as a call of the gate of the subroutine."""
+        subroutine = self._subroutines.get(call.name)
+        if subroutine is None:
+            raise RuntimeError("Unknown subroutine: {}".format(call.name))
+        if call.name in self._active:
+            raise RuntimeError("Recursive subroutine: {}".format(call.name))
+        circuit = subroutine.circuit
+        call_inputs, call_outputs = call.inputs, call.outputs
+        if inverted:
+            call_inputs, call_outputs = call_outputs, call_inputs
+        inverted = inverted != call.inverted
+        inputs, outputs = circuit.inputs, circuit.outputs
+        if inverted:
+            inputs, outputs = outputs, inputs
+        call_controls = [frame.control(wire) for wire in call.control.controlled]
+        if not call.control.no_control:
+            call_controls = controls + call_controls
+        gate_name = self._gate_name(call.name)
+        if call.name in self._no_control and any(qubit for _, _, qubit in call_controls):
+            gate_name = None
+
+        for repetition in range(call.repetitions):
+            # The outputs of a repetition are the inputs of the next.
+            repetition_inputs = call_inputs if repetition == 0 else call_outputs
+            call_frame = _Frame()
+            for assignment, wire in zip(inputs, repetition_inputs):
+                call_frame.add(assignment.wire.i, *frame.pop(wire.i))
+            if gate_name is not None:
+                operands = [call_frame.qubit(assignment.wire) for assignment in circuit.inputs]
+                lines.append(_apply('inv @ ' + gate_name if inverted else gate_name, operands, call_controls))
+            else:
+                self._active.add(call.name)
+                self._expand(circuit.gates, call_frame, call_controls, inverted, lines)
+                self._active.remove(call.name)
+            for wire, assignment in zip(call_outputs, outputs):
+                frame.add(wire.i, *call_frame.pop(assignment.wire.i))
+
+    def _gate_name(self, name: str) -> Optional[str]:
+        """The gate that a subroutine is defined as, or None if its calls are inlined.
+
+        The definitions of the subroutines that it calls are added before its own.
+        """
+        if name in self._gate_names:
+            return self._gate_names[name]
+        self._gate_names[name] = None
+        if self._inline:
+            return None
+        circuit = self._subroutines[name].circuit
+        wires = sorted(assignment.wire.i for assignment in circuit.inputs)
+        if (any(assignment.type != TypeAssignment_Type.Qbit for assignment in circuit.inputs + circuit.outputs)
+                or wires != sorted(assignment.wire.i for assignment in circuit.outputs)
+                or len(set(wires)) != len(wires)):
+            return None
+        for gate in circuit.gates:
+            if isinstance(gate, SubroutineCall):
+                if gate.name not in self._subroutines:
+                    raise RuntimeError("Unknown subroutine: {}".format(gate.name))
+                if self._gate_name(gate.name) is None:
+                    return None
+                if gate.control.no_control or gate.name in self._no_control:
+                    self._no_control.add(name)
+            elif not isinstance(gate, (QGate, QRot, GPhase, Comment)):
+                return None
+            elif getattr(gate, 'control', None) is not None and gate.control.no_control:
+                self._no_control.add(name)
+
+        gate_name = 'sub_{}_{}'.format(len(self._definitions), re.sub(r'\W', '_', name, flags=re.ASCII))
+        frame = _Frame()
+        parameters = []
+        for index, assignment in enumerate(circuit.inputs):
+            parameters.append('a{}'.format(index))
+            frame.qubits[assignment.wire.i] = parameters[-1]
+        body = []  # type: List[str]
+        self._expand(circuit.gates, frame, [], False, body)
+        self._definitions.append('// Subroutine "{}"\ngate {} {} {{\n{}}}'.format(
+            name, gate_name, ', '.join(parameters), ''.join('    ' + line + '\n' for line in body)))
+        self._gate_names[name] = gate_name
+        return gate_name
+
+
+def _apply(name: str, operands: List[str], controls: List[_Control]) -> str:
+    """A statement applying a gate, controlled by the controls on qubits and conditioned on those on bits."""
+    if not controls:
+        return name + ' ' + ', '.join(operands) + ';' if operands else name + ';'
+    quantum = [(operand, positive) for operand, positive, qubit in controls if qubit]
+    short = _CONTROLLED_NAMES.get((name, len(quantum)))
+    if short is not None and all(positive for _, positive in quantum):
+        name = short
+    else:
+        for positive, run in reversed([(positive, len(list(run)))
+                                       for positive, run in itertools.groupby(positive for _, positive in quantum)]):
+            name = '{}ctrl{} @ {}'.format('' if positive else 'neg', '({})'.format(run) if run > 1 else '', name)
+    operands = [operand for operand, _ in quantum] + operands
+    return _classical(name + (' ' + ', '.join(operands) if operands else '') + ';', controls)
+
+
+def _classical(statement: str, controls: List[_Control]) -> str:
+    """Condition a statement on the controls on bits."""
+    condition = ' && '.join(operand if positive else '!' + operand
+                            for operand, positive, qubit in controls if not qubit)
+    if not condition:
+        return statement
+    return 'if ({}) {}'.format(condition, statement)
@@ -0,0 +1,269 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A fast parser engine that recognizes the common gate lines of quipper.g with regular expressions.
+
+Lines that are not recognized are passed on to the Lark parser, so the result is always equal to
+that of the Lark parser with the QuipperTransformer.
+"""
+
+import re
+import sys
+from typing import *
+
+from quippy.transformer import Wire, Control, TypeAssignment_Type, TypeAssignment, Gate, QGate, QRot, \
+    QInit, CInit, QTerm, CTerm, QMeas, QDiscard, CDiscard, SubroutineCall, Comment, \
+    CompactQuipperTransformer, interned_wire, EMPTY_CONTROL, EMPTY_NO_CONTROL, QGATE_NAMES, QROT_NAMES
+
+# Regular expressions for the terminals in quipper.g.
+_WS = r'[ \t]*'
+_INT = r'[+-]?\d+'
+_FLOAT = r'[+-]?(?:\d+[eE][+-]?\d+|(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?)'
+_STRING = r'"((?:[^"\\]|\\.)*)"'
+_WIRE_LIST = r'({int}(?:{ws},{ws}{int})*)'.format(int=_INT, ws=_WS)
+_INVERSION = r'{ws}(\*?){ws}'.format(ws=_WS)
+_CONTROL_APP = r'(?:{ws}with controls=\[{ws}{wires}{ws}\])?{ws}(with nocontrol)?{ws}$'.format(
+    ws=_WS, wires=_WIRE_LIST)
+_WIRE_STRING = r'{int}{ws}:{ws}"(?:[^"\\]|\\.)*"'.format(int=_INT, ws=_WS)
+
+# Regular expressions for the lines of quipper.g.
+_QGATE = r'QGate\[{ws}{string}{ws}\]{inv}\({ws}{wires}{ws}\){control}'.format(
+    ws=_WS, string=_STRING, inv=_INVERSION, wires=_WIRE_LIST, control=_CONTROL_APP)
+_QROT = r'QRot\[{ws}{string}{ws},{ws}({float}){ws}\]{inv}\({ws}({int}){ws}\){ws}$'.format(
+    ws=_WS, string=_STRING, float=_FLOAT, inv=_INVERSION, int=_INT)
+_INIT_TERM = r'(QInit|CInit|QTerm|CTerm)(?:0|(1)){ws}\({ws}({int}){ws}\){ws}(?:with nocontrol)?{ws}$'.format(
+    ws=_WS, int=_INT)
+_MEAS_DISCARD = r'(QMeas|QDiscard|CDiscard)\({ws}({int}){ws}\){ws}$'.format(ws=_WS, int=_INT)
+_SUBROUTINE_CALL = (
+    r'Subroutine{ws}(?:\(x{ws}({int}){ws}\))?{ws}\[{ws}{string}{ws}, shape{ws}{string}{ws}\]{inv}'
+    r'\({ws}{wires}{ws}\) -> \({ws}{wires}{ws}\){control}'.format(
+        ws=_WS, int=_INT, string=_STRING, inv=_INVERSION, wires=_WIRE_LIST, control=_CONTROL_APP))
+_COMMENT = r'Comment\[{ws}{string}{ws}\]{inv}\({ws}((?:{pair}{ws},{ws})*{pair})?{ws}\){ws}$'.format(
+    ws=_WS, string=_STRING, inv=_INVERSION, pair=_WIRE_STRING)
+_WIRE_STRING_PAIR = r'({int}){ws}:{ws}{string}'.format(int=_INT, ws=_WS, string=_STRING)
+_ARITY = r'{ws}(?:{int}{ws}:{ws}(?:Qbit|Cbit){ws},{ws})*{int}{ws}:{ws}(?:Qbit|Cbit){ws},?{ws}$'.format(
+    ws=_WS, int=_INT)
+_TYPE_ASSIGNMENT = r'({int}){ws}:{ws}(Qbit|Cbit)'.format(ws=_WS, int=_INT)
+
+
+class Syntax:
+    """The compiled regular expressions, for lines given either as str or as bytes."""
+
+    def __init__(self, binary: bool):
+        def compile(pattern: str):
+            return re.compile(pattern.encode() if binary else pattern)
+
+        def literal(text: str):
+            return text.encode() if binary else text
+
+        self.binary = binary
+        self.qgate = compile(_QGATE)
+        self.qrot = compile(_QROT)
+        self.init_term = compile(_INIT_TERM)
+        self.meas_discard = compile(_MEAS_DISCARD)
+        self.subroutine_call = compile(_SUBROUTINE_CALL)
+        self.comment = compile(_COMMENT)
+        self.wire_string_pair = compile(_WIRE_STRING_PAIR)
+        self.arity = compile(_ARITY)
+        self.type_assignment = compile(_TYPE_ASSIGNMENT)
+        self.qgate_prefix = literal('QGate[')
+        self.qrot_prefix = literal('QRot[')
+        self.subroutine_prefix = literal('Subroutine')
+        self.comment_prefix = literal('Comment[')
+        self.comma = literal(',')
+        self.qbit = literal('Qbit')
+
+    def text(self, literal: Union[str, bytes]) -> str:
+        """Decode a string literal, only the string literals are decoded for bytes lines."""
+        return literal.decode() if self.binary else literal
+
+
+_SYNTAX = {}  # type: Dict[bool, Syntax]
+
+
+def syntax(binary: bool) -> Syntax:
+    """The shared regular expressions for lines given as bytes if binary, or as str otherwise."""
+    if binary not in _SYNTAX:
+        _SYNTAX[binary] = Syntax(binary)
+    return _SYNTAX[binary]
+
+
+"""The gate types by the name of their line, for the gates without a string literal."""
+INIT_TERM_TYPES = {'QInit': QInit, 'CInit': CInit, 'QTerm': QTerm, 'CTerm': CTerm}
+MEAS_DISCARD_TYPES = {'QMeas': QMeas, 'QDiscard': QDiscard, 'CDiscard': CDiscard}
+
+
+class FastGateParser:
+    """Parse single gate lines, falling back to the Lark parser for lines that are not recognized.
+
+    :param binary: Whether lines are given as bytes, of which only the string literals are decoded.
+    :param compact: Whether to share wires and controls like the CompactQuipperTransformer.
+    """
+
+    def __init__(self, binary=False, compact=False):
+        self._syntax = syntax(binary)
+        self._compact = compact
+        self._wire = interned_wire if compact else Wire
+        self._fallback = None
+
+    def parse(self, line: Union[str, bytes]) -> Gate:
+        syntax = self._syntax
+        line = line.strip()
+        gate = None  # type: Optional[Gate]
+        if line.startswith(syntax.qgate_prefix):
+            gate = self._qgate(line)
+        elif line.startswith(syntax.qrot_prefix):
+            gate = self._qrot(line)
+        elif line.startswith(syntax.subroutine_prefix):
+            gate = self._subroutine_call(line)
+        elif line.startswith(syntax.comment_prefix):
+            gate = self._comment(line)
+        else:
+            m = syntax.init_term.match(line)
+            if m is not None:
+                gate = INIT_TERM_TYPES[syntax.text(m.group(1))](value=m.group(2) is not None,
+                                                                 wire=self._wire(int(m.group(3))))
+            else:
+                m = syntax.meas_discard.match(line)
+                if m is not None:
+                    gate = MEAS_DISCARD_TYPES[syntax.text(m.group(1))](wire=self._wire(int(m.group(2))))
+
+        if gate is None:
+            return self.fallback().parse(syntax.text(line))
+        return gate
+
+    def fallback(self):
+        """The Lark parser for lines that are not recognized."""
+        if self._fallback is None:
+            from quippy.parser import quipper_parser
+            options = {'transformer': CompactQuipperTransformer()} if self._compact else {}
+            self._fallback = quipper_parser(start='gate', **options)
+        return self._fallback
+
+    def _wires(self, text: Union[str, bytes]) -> List[Wire]:
+        wire = self._wire
+        return [wire(int(i)) for i in text.split(self._syntax.comma)]
+
+    def _control(self, controlled, no_control) -> Control:
+        if controlled:
+            return Control(controlled=self._wires(controlled), no_control=no_control is not None)
+        if self._compact:
+            return EMPTY_NO_CONTROL if no_control is not None else EMPTY_CONTROL
+        return Control(controlled=[], no_control=no_control is not None)
+
+    def _qgate(self, line) -> Optional[QGate]:
+        syntax = self._syntax
+        m = syntax.qgate.match(line)
+        if m is None:
+            return None
+        op = QGATE_NAMES.get(syntax.text(m.group(1)))
+        if op is None:
+            return None
+        return QGate(op=op, inverted=bool(m.group(2)), wires=self._wires(m.group(3)),
+                     control=self._control(m.group(4), m.group(5)))
+
+    def _qrot(self, line) -> Optional[QRot]:
+        syntax = self._syntax
+        m = syntax.qrot.match(line)
+        if m is None:
+            return None
+        op = QROT_NAMES.get(syntax.text(m.group(1)))
+        if op is None:
+            return None
+        return QRot(op=op, timestep=float(m.group(2)), inverted=bool(m.group(3)),
+                    wire=self._wire(int(m.group(4))))
+
+    def _subroutine_call(self, line) -> Optional[SubroutineCall]:
+        syntax = self._syntax
+        m = syntax.subroutine_call.match(line)
+        if m is None:
+            return None
+        return SubroutineCall(
+            repetitions=int(m.group(1)) if m.group(1) is not None else 1,
+            name=sys.intern(syntax.text(m.group(2))),
+            shape=sys.intern(syntax.text(m.group(3))),
+            inverted=bool(m.group(4)),
+            inputs=self._wires(m.group(5)),
+            outputs=self._wires(m.group(6)),
+            control=self._control(m.group(7), m.group(8))
+            )
+
+    def _comment(self, line) -> Optional[Comment]:
+        syntax = self._syntax
+        m = syntax.comment.match(line)
+        if m is None:
+            return None
+        wire_comments = None
+        if m.group(3) is not None:
+            wire_comments = [(self._wire(int(pair.group(1))), syntax.text(pair.group(2)))
+                             for pair in syntax.wire_string_pair.finditer(m.group(3))]
+        return Comment(comment=syntax.text(m.group(1)), inverted=bool(m.group(2)),
+                       wire_comments=wire_comments)
+
+
+class FastArityParser:
+    """Parse the wire types following 'Inputs:' and 'Outputs:'."""
+
+    def __init__(self, compact=False):
+        self._syntax = syntax(False)
+        self._compact = compact
+        self._fallback = None
+
+    def parse(self, text: str) -> List[TypeAssignment]:
+        syntax = self._syntax
+        if syntax.arity.match(text) is None:
+            if self._fallback is None:
+                from quippy.parser import quipper_parser
+                options = {'transformer': CompactQuipperTransformer()} if self._compact else {}
+                self._fallback = quipper_parser(start='arity', **options)
+            return self._fallback.parse(text)
+        wire = interned_wire if self._compact else Wire
+        return [TypeAssignment(wire(int(m.group(1))),
+                               TypeAssignment_Type.Qbit if m.group(2) == syntax.qbit
+                               else TypeAssignment_Type.Cbit)
+                for m in syntax.type_assignment.finditer(text)]
+
+
+class FastParser:
+    """A parser with the same parse method as the Lark parser, using the fast gate parser.
+
+    Unlike the Lark parser it tolerates blank lines between the lines of a circuit.
+
+    :param start: The rule to start parsing at, one of START_RULES.
+    :param compact: Whether to share wires and controls like the CompactQuipperTransformer.
+    """
+
+    START_RULES = ('start', 'circuit', 'subroutine', 'gate')
+
+    def __init__(self, start='start', compact=False):
+        if start not in self.START_RULES:
+            raise ValueError("The fast parser can not start at rule {}".format(start))
+        self.start = start
+        self.compact = compact
+
+    def parse(self, text: str):
+        from quippy.stream import iter_gates, build_start
+
+        if self.start == 'gate':
+            return FastGateParser(compact=self.compact).parse(text)
+        events = iter_gates(text.splitlines(), parser='fast', compact=self.compact)
+        if self.start == 'circuit':
+            return build_start(events).circuit
+        if self.start == 'subroutine':
+            return build_start(events).subroutines[0]
+        start = build_start(events)
+        if start.circuit is None:
+            raise RuntimeError("Missing the main circuit")
+        return start
+
@@ -0,0 +1,113 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A peephole optimizer that cancels and merges adjacent gates."""
+
+from typing import *
+
+from quippy.analysis import gate_wires
+from quippy.transformer import Gate, QGate_Op, QGate, QRot_Op, QRot, Circuit
+
+"""The gates that are their own inverse."""
+SELF_INVERSE = frozenset([QGate_Op.Not, QGate_Op.H, QGate_Op.MultiNot, QGate_Op.Y, QGate_Op.Z,
+                          QGate_Op.Swap, QGate_Op.W])
+
+
+def optimize(circuit: Circuit) -> Circuit:
+    """Cancel adjacent inverse gates and merge adjacent rotations.
+
+    Two gates are adjacent if no other gate acts on any of their wires in between.
+    A QGate cancels against the next gate with the same operation, wires and controls
+    if one of them is inverted, or if the operation is its own inverse.
+    Consecutive QRot rotations of the same kind on a wire are merged,
+    and removed if they add up to the identity.
+    Gates that become adjacent by a cancellation are also cancelled,
+    using a stack of the remaining gates on every wire, so a single pass suffices.
+
+    :param circuit: The circuit to optimize.
+    :return: A new circuit with the remaining gates.
+    """
+    gates = []  # type: List[Optional[Gate]]
+    gate_wire_lists = []  # type: List[List[int]]
+    # The indices in gates of the remaining gates on every wire.
+    stacks = {}  # type: Dict[int, List[int]]
+
+    for gate in circuit.gates:
+        while gate is not None:
+            wires = list(dict.fromkeys(wire.i for wire in gate_wires(gate)))
+            previous = _previous(stacks, wires)
+            combined = None
+            if previous is not None and set(gate_wire_lists[previous]) == set(wires):
+                combined = _combine(gates[previous], gate)
+            if combined is None:
+                for wire in wires:
+                    stacks.setdefault(wire, []).append(len(gates))
+                gates.append(gate)
+                gate_wire_lists.append(wires)
+                break
+
+            gates[previous] = None
+            for wire in wires:
+                stacks[wire].pop()
+            # A merged gate may in turn combine with the gate before it.
+            gate = combined[0] if combined else None
+
+    return Circuit(inputs=circuit.inputs, gates=[gate for gate in gates if gate is not None],
+                   outputs=circuit.outputs)
+
+
+def _previous(stacks: Dict[int, List[int]], wires: List[int]) -> Optional[int]:
+    """The index of the last gate on all of wires, or None if the last gates differ."""
+    previous = None
+    for wire in wires:
+        stack = stacks.get(wire)
+        if not stack or (previous is not None and stack[-1] != previous):
+            return None
+        previous = stack[-1]
+    return previous
+
+
+def _combine(first: Gate, second: Gate) -> Optional[List[Gate]]:
+    """The gates that replace two adjacent gates, or None if they can not be combined."""
+    if isinstance(first, QGate) and isinstance(second, QGate):
+        if first.op != second.op or first.control != second.control:
+            return None
+        if first.wires != second.wires and not (first.op == QGate_Op.Swap
+                                                and sorted(first.wires) == sorted(second.wires)):
+            return None
+        if first.inverted != second.inverted or first.op in SELF_INVERSE:
+            return []
+        return None
+
+    if isinstance(first, QRot) and isinstance(second, QRot):
+        if first.op != second.op or first.wire != second.wire:
+            return None
+        if first.op == QRot_Op.ExpZt:
+            timestep = _signed(first, first.timestep) + _signed(second, second.timestep)
+            if timestep == 0:
+                return []
+            return [QRot(op=first.op, timestep=timestep, inverted=False, wire=first.wire)]
+        # R(2pi/%) rotates by 2π/t for timestep t, so the inverses of the timesteps add up.
+        # A rotation by a multiple of 2π is the identity.
+        if first.timestep == 0 or second.timestep == 0:
+            return None
+        turns = _signed(first, 1 / first.timestep) + _signed(second, 1 / second.timestep)
+        if turns == round(turns):
+            return []
+        return [QRot(op=first.op, timestep=1 / abs(turns), inverted=turns < 0, wire=first.wire)]
+    return None
+
+
+def _signed(rotation: QRot, value: float) -> float:
+    return -value if rotation.inverted else value
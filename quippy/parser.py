@@ -12,24 +12,201 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from lark import Lark
-from pkg_resources import resource_string
+import os
 
-from quippy.transformer import QuipperTransformer
+MYPY = False
+if MYPY:
+    # Only imported for type checking, importing quippy should not load Lark.
+    from typing import *
+    import lark
+    import quippy.count
+    import quippy.fast
 
-"""The grammar is imported from the quipper file as a string."""
-GRAMMAR = resource_string(__name__, 'quipper.g').decode()
+"""The Quipper grammar, read through the package loader so that zipped installs are supported."""
+GRAMMAR = __loader__.get_data(os.path.join(os.path.dirname(__file__), 'quipper.g')).decode()
 
+"""Compiled parsers with the default or no transformer, keyed by (start, parser, transformer, lark options)."""
+_PARSER_CACHE = {}  # type: Dict[Tuple, lark.Lark]
 
-def quipper_parser(start='start', parser='lalr', transformer=QuipperTransformer(), **kwargs
-                   ) -> Lark:
+"""The Lark options of every LALR parser, including the one in quippy._tables.
+The terminals of the Quipper grammar do not collide, and the standard lexer loads faster than the contextual lexer,
+which compiles regular expressions for every parser state."""
+LALR_OPTIONS = {'lexer': 'standard'}
+
+"""Placeholder for the default transformer, which is only constructed when a parser is built."""
+_DEFAULT_TRANSFORMER = object()
+
+
+def default_cache_dir() -> str:
+    """The directory where serialized parser tables are stored.
+
+    Set the QUIPPY_CACHE_DIR environment variable to override it.
+    """
+    if 'QUIPPY_CACHE_DIR' in os.environ:
+        return os.environ['QUIPPY_CACHE_DIR']
+    cache_home = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(cache_home, 'quippy')
+
+
+def clear_cache(cache_dir=None) -> None:
+    """Forget all compiled parsers held in memory.
+
+    :param cache_dir: If given, also remove the serialized parser tables in this directory.
+    :type cache_dir: Optional[str]
+    """
+    _PARSER_CACHE.clear()
+    if cache_dir is not None and os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith('.lark.pickle'):
+                os.remove(os.path.join(cache_dir, name))
+
+
+def quipper_parser(start='start', parser='lalr', transformer=_DEFAULT_TRANSFORMER, cache=True,
+                   cache_dir=None, mode='objects', **kwargs
+                   ) -> 'Union[lark.Lark, quippy.fast.FastParser, quippy.count.CountParser]':
     """Construct a parser for the Quipper grammar.
 
+    The default LALR parser for the 'start' rule is loaded from the tables shipped in quippy._tables.
+    Other compiled parsers are cached in memory and LALR parse tables are also serialized to disk,
+    so that subsequent calls, also from other processes, do not need to recompile the grammar.
+    A parser with the default transformer or without a transformer is shared between all calls
+    with equal arguments. A parser for a given transformer instance is never shared,
+    since that instance may hold state, but it is still built from the cached tables.
+
     :param start: the rule in the grammar to start parsing at.
-    :param parser: the type of Lark parser to use.
-    :param kwargs: Further options to pass to Lark.
+    :param parser: the type of Lark parser to use, or 'fast' for the parser in quippy.fast
+        that recognizes common gates with regular expressions.
+        The fast parser only supports the (Compact)QuipperTransformer
+        and the start rules in FastParser.START_RULES.
+    :param kwargs: Further options to pass to Lark. LALR parsers use the options in LALR_OPTIONS by default.
     :param transformer: The lark.transformer.Transformer instance that transforms ASTs
         to python objects. By default 'QuipperTransformer()'.
+    :param cache: Whether to reuse previously compiled parsers.
+        Parsers given callables as Lark options are never serialized to disk.
+    :param cache_dir: The directory to store serialized LALR parsers in.
+        By default given by default_cache_dir().
+    :param mode: 'objects' to parse to objects, or 'count' for a parser that only counts the gates
+        of every circuit while parsing, without building the gate objects.
+        See quippy.count.count_gates, the count mode only supports the 'start' rule
+        and always uses the regular expressions of the fast parser where possible.
     :return: A Lark parser object that .parse can be called on.
     """
-    return Lark(GRAMMAR, start=start, parser=parser, transformer=transformer, **kwargs)
+    if mode == 'count':
+        if start != 'start' or parser not in ('lalr', 'fast') or transformer is not _DEFAULT_TRANSFORMER \
+                or kwargs:
+            raise ValueError("The count mode only supports the 'start' rule "
+                             "without a transformer or Lark options")
+        from quippy.count import CountParser
+        return CountParser()
+    if mode != 'objects':
+        raise ValueError("Unknown mode: {}".format(mode))
+
+    # Lark is only imported once a parser is requested, to keep importing quippy fast.
+    from lark import Lark
+
+    shared = transformer is _DEFAULT_TRANSFORMER or transformer is None
+
+    if parser == 'fast':
+        from quippy.fast import FastParser
+        from quippy.transformer import QuipperTransformer, CompactQuipperTransformer
+        if transformer is not _DEFAULT_TRANSFORMER \
+                and type(transformer) not in (QuipperTransformer, CompactQuipperTransformer) or kwargs:
+            raise ValueError("The fast parser only supports the QuipperTransformer without Lark options")
+        return FastParser(start=start, compact=type(transformer) is CompactQuipperTransformer)
+
+    if parser == 'lalr':
+        kwargs = dict(LALR_OPTIONS, **kwargs)
+    if cache:
+        key = (start, parser, transformer is not None, tuple(sorted(kwargs.items())))
+        try:
+            cached = _PARSER_CACHE.get(key) if shared else None
+        except TypeError:
+            # Unhashable Lark options can not be cached.
+            cache = False
+        else:
+            if cached is not None:
+                return cached
+
+    # The default transformer is only constructed for a parser that is actually compiled.
+    if transformer is _DEFAULT_TRANSFORMER:
+        from quippy.transformer import QuipperTransformer
+        transformer = QuipperTransformer()
+    if not cache:
+        return Lark(GRAMMAR, start=start, parser=parser, transformer=transformer, **kwargs)
+
+    if start == 'start' and parser == 'lalr' and kwargs == LALR_OPTIONS:
+        compiled = _load_tables(transformer)
+        if compiled is None:
+            compiled = _load_lalr(start, transformer, kwargs,
+                                  cache_dir if cache_dir is not None else default_cache_dir())
+    elif parser == 'lalr' and all(isinstance(v, (str, bool, int, type(None)))
+                                for v in kwargs.values()):
+        compiled = _load_lalr(start, transformer, kwargs,
+                              cache_dir if cache_dir is not None else default_cache_dir())
+    else:
+        compiled = Lark(GRAMMAR, start=start, parser=parser, transformer=transformer, **kwargs)
+    if shared:
+        _PARSER_CACHE[key] = compiled
+    return compiled
+
+
+def _load_tables(transformer) -> 'Optional[lark.Lark]':
+    """Load the default parser from the tables shipped in quippy._tables.
+
+    Returns None if the tables are missing or were generated for a different grammar or Lark version.
+    Regenerate them with: python -m quippy.build_tables
+    """
+    import lark
+    from lark.grammar import Rule
+    from lark.lexer import TerminalDef
+    from quippy.build_tables import grammar_hash
+    try:
+        from quippy import _tables
+    except ImportError:
+        return None
+    if _tables.LARK_VERSION != lark.__version__ or _tables.GRAMMAR_HASH != grammar_hash(GRAMMAR):
+        return None
+    namespace = {'Rule': Rule, 'TerminalDef': TerminalDef}
+    return lark.Lark.deserialize(_tables.DATA, namespace, _tables.MEMO, transformer=transformer)
+
+
+def _load_lalr(start, transformer, options, cache_dir: str) -> 'lark.Lark':
+    """Load a LALR parser from its serialized tables in cache_dir, or compile and store it."""
+    import hashlib
+    import pickle
+    import tempfile
+
+    import lark
+    from lark import Lark
+    from lark.grammar import Rule
+    from lark.lexer import TerminalDef
+
+    key = repr((GRAMMAR, lark.__version__, start, sorted(options.items()))).encode()
+    path = os.path.join(cache_dir, hashlib.sha256(key).hexdigest() + '.lark.pickle')
+    namespace = {'Rule': Rule, 'TerminalDef': TerminalDef}
+
+    try:
+        with open(path, 'rb') as cache_file:
+            data, memo = pickle.load(cache_file)
+        return Lark.deserialize(data, namespace, memo, transformer=transformer)
+    except Exception:
+        # A missing, stale or corrupt cache entry is simply rebuilt.
+        pass
+
+    compiled = Lark(GRAMMAR, start=start, parser='lalr', transformer=transformer, **options)
+    try:
+        serialized = pickle.dumps(compiled.memo_serialize([TerminalDef, Rule]))
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write atomically so that concurrent workers never read a partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(serialized)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except Exception:
+        # Caching is only an optimization, the parser is still usable.
+        pass
+    return compiled
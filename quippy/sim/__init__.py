@@ -0,0 +1,52 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Simulators that run parsed circuits directly.
+
+The simulators are loaded on first access, since they depend on the optional NumPy.
+"""
+
+_LAZY_NAMES = {
+    'StateVector': 'quippy.sim.statevector',
+    'Stabilizer': 'quippy.sim.stabilizer',
+    'is_clifford': 'quippy.sim.stabilizer',
+    }
+
+__all__ = list(_LAZY_NAMES) + ['simulator']
+
+
+def simulator(circuit, subroutines=(), seed=None):
+    """A Stabilizer if the circuit is Clifford by is_clifford, and a StateVector otherwise.
+
+    :param circuit: The circuit that will be simulated.
+    :param subroutines: The subroutines called by the circuit, such as Start.subroutines.
+    :param seed: The seed of the random numbers for measurements.
+    """
+    from quippy.sim.stabilizer import Stabilizer, is_clifford
+    from quippy.sim.statevector import StateVector
+    subroutines = list(subroutines)
+    if is_clifford(circuit, subroutines):
+        return Stabilizer(subroutines, seed=seed)
+    return StateVector(subroutines, seed=seed)
+
+
+def __getattr__(name):
+    if name in _LAZY_NAMES:
+        from importlib import import_module
+        return getattr(import_module(_LAZY_NAMES[name]), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_NAMES))
@@ -0,0 +1,312 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The parts shared by the simulators: compiling circuits, calling subroutines and classical gates.
+
+A simulator subclass represents the quantum state and implements the quantum operations.
+"""
+
+import itertools
+import random
+from typing import *
+
+from quippy.transformer import Gate, CNot, CGate, CSwap, QPrep, QUnprep, QInit, CInit, QTerm, CTerm, QMeas, \
+    QDiscard, CDiscard, DTerm, SubroutineCall, Comment, TypeAssignment_Type, Circuit, Subroutine, INVERSES
+
+"""The functions of the classical CGate operations, of the inputs of the gate."""
+CGATE_FUNCTIONS = {
+    'not': lambda a: not a,
+    'and': lambda *inputs: all(inputs),
+    'or': lambda *inputs: any(inputs),
+    'xor': lambda *inputs: sum(inputs) % 2 == 1,
+    'eq': lambda a, b: a == b,
+    'if': lambda a, b, c: b if a else c,
+    }  # type: Dict[str, Callable[..., bool]]
+
+Op = NamedTuple('Op', [
+    # The method of the simulator that applies the operation, given the targets, controls and argument.
+    ('apply', Callable),
+    # The wires of the gate in the circuit that contains it.
+    ('targets', List[int]),
+    # The controls as (wire, whether the control is positive).
+    ('controls', List[Tuple[int, bool]]),
+    ('no_control', bool),
+    ('argument', Any)
+    ])
+
+_Compiled = NamedTuple('_Compiled', [
+    ('ops', List[Op]),
+    ('inputs', List[int]),
+    ('outputs', List[int])
+    ])
+
+
+class Simulator:
+    """The base of the simulators.
+
+    Every subroutine is compiled once to a sequence of operations, for each of its directions,
+    and reused by all calls. The main circuit is compiled once for repeated runs of it.
+    Wires are given a new id when they are initialized, so the wires of subroutines do not clash.
+    Classical wires are simulated as bits, and may control quantum gates.
+
+    Subclasses implement _compile_quantum, _is_qubit, _init, _term and _sample.
+
+    :param subroutines: The subroutines called by the circuits, such as Start.subroutines.
+    :param seed: The seed of the random numbers for measurements.
+    """
+
+    def __init__(self, subroutines: Iterable[Subroutine] = (), seed=None):
+        self._subroutine_list = list(subroutines)
+        self._subroutines = {subroutine.name: subroutine.circuit for subroutine in self._subroutine_list}
+        self._compiled = {}  # type: Dict[Tuple[str, bool], _Compiled]
+        self._main = None  # type: Optional[Tuple[Circuit, List[Op]]]
+        self._active = set()  # type: Set[str]
+        self._random = random.Random(seed)
+        # The operations of the gates on a single wire.
+        self._wire_ops = {
+            QInit: type(self)._init, QTerm: type(self)._term, QPrep: Simulator._prep,
+            QUnprep: Simulator._measure, QMeas: Simulator._measure, QDiscard: Simulator._discard,
+            CInit: Simulator._cinit, CTerm: Simulator._cterm, CDiscard: Simulator._cdiscard,
+            DTerm: Simulator._cdiscard,
+            }  # type: Dict[type, Callable]
+        self._ids = itertools.count()
+        self._bits = {}  # type: Dict[int, bool]
+        """The values of the classical outputs of the last run, by wire."""
+        self.bits = {}  # type: Dict[int, bool]
+
+    def _start(self, circuit: Circuit, bits: Optional[Mapping[int, bool]]) -> Dict[int, int]:
+        """Set the Cbit inputs of a circuit, and give the frame of its wires."""
+        frame = {}  # type: Dict[int, int]
+        self._bits = {}
+        for assignment in circuit.inputs:
+            if assignment.type == TypeAssignment_Type.Cbit:
+                wire = assignment.wire.i
+                self._bits[self._id(frame, wire)] = bool(bits.get(wire, False)) if bits else False
+        return frame
+
+    def _run(self, circuit: Circuit, frame: Dict[int, int]) -> List[int]:
+        """Apply the gates of the main circuit, and give the wire ids of the Qbit outputs.
+
+        The values of the Cbit outputs are stored in bits.
+        """
+        if self._main is None or self._main[0] is not circuit:
+            self._main = (circuit, self._compile(self._gates(None, circuit), False))
+        self._execute(self._main[1], frame, [])
+
+        qubit_outputs = []  # type: List[int]
+        self.bits = {}
+        for assignment in circuit.outputs:
+            wire_id = self._existing_id(frame, assignment.wire.i)
+            if assignment.type == TypeAssignment_Type.Qbit:
+                if not self._is_qubit(wire_id):
+                    raise RuntimeError("Wire is not a qubit")
+                qubit_outputs.append(wire_id)
+            else:
+                self.bits[assignment.wire.i] = self._bit(wire_id)
+        return qubit_outputs
+
+    def _id(self, frame: Dict[int, int], wire: int) -> int:
+        """The id of a wire of a circuit, which is new if the wire was not used before."""
+        wire_id = frame.get(wire)
+        if wire_id is None:
+            wire_id = frame[wire] = next(self._ids)
+        return wire_id
+
+    @staticmethod
+    def _existing_id(frame: Dict[int, int], wire: int) -> int:
+        if wire not in frame:
+            raise RuntimeError("Wire {} is not initialized".format(wire))
+        return frame[wire]
+
+    def _bit(self, wire_id: int) -> bool:
+        if wire_id not in self._bits:
+            raise RuntimeError("Wire is not a bit")
+        return self._bits[wire_id]
+
+    def _is_qubit(self, wire_id: int) -> bool:
+        raise NotImplementedError
+
+    def _gates(self, name: Optional[str], circuit: Circuit) -> List[Gate]:
+        """The gates to compile of a subroutine, or of the main circuit if name is None."""
+        return circuit.gates
+
+    def _compile(self, gates: List[Gate], inverted: bool) -> List[Op]:
+        """Compile the gates of a circuit, in reverse and inverted if inverted."""
+        ops = []  # type: List[Op]
+        for gate in (reversed(gates) if inverted else gates):
+            if isinstance(gate, Comment):
+                continue
+            control = getattr(gate, 'control', None)
+            controls = [(abs(wire.i), wire.i >= 0) for wire in control.controlled] if control else []
+            no_control = control is not None and control.no_control
+            if inverted and type(gate) in INVERSES:
+                gate = INVERSES[type(gate)](*gate)
+            if isinstance(gate, SubroutineCall):
+                apply, targets, argument = Simulator._call, [], (gate, inverted)
+            else:
+                apply, targets, argument = self._compile_gate(gate, inverted)
+            ops.append(Op(apply=apply, targets=targets, controls=controls, no_control=no_control,
+                          argument=argument))
+        return ops
+
+    def _compile_gate(self, gate: Gate, inverted: bool) -> Tuple[Callable, List[int], Any]:
+        """The operation of a gate, given as its method, targets and argument."""
+        if isinstance(gate, CGate):
+            if gate.name not in CGATE_FUNCTIONS:
+                raise RuntimeError("Unknown CGate operation: {}".format(gate.name))
+            return Simulator._cgate, [wire.i for wire in gate.wires], (CGATE_FUNCTIONS[gate.name],
+                                                                        gate.inverted != inverted)
+        if inverted and isinstance(gate, (QMeas, QDiscard, CDiscard, DTerm)):
+            raise RuntimeError("Can not invert gate: {}".format(gate))
+        if isinstance(gate, CNot):
+            return Simulator._cnot, [gate.wire.i], None
+        if isinstance(gate, CSwap):
+            return Simulator._cswap, [wire.i for wire in gate.wires], None
+        apply = self._wire_ops.get(type(gate))
+        if apply is not None:
+            return apply, [gate.wire.i], getattr(gate, 'value', None)
+        return self._compile_quantum(gate, inverted)
+
+    def _compile_quantum(self, gate: Gate, inverted: bool) -> Tuple[Callable, List[int], Any]:
+        """The operation of a unitary gate, such as QGate, QRot and GPhase."""
+        raise NotImplementedError
+
+    def _subroutine(self, name: str, inverted: bool) -> _Compiled:
+        key = (name, inverted)
+        if key not in self._compiled:
+            if name not in self._subroutines:
+                raise RuntimeError("Unknown subroutine: {}".format(name))
+            if name in self._active:
+                raise RuntimeError("Recursive subroutine: {}".format(name))
+            self._active.add(name)
+            circuit = self._subroutines[name]
+            inputs = [assignment.wire.i for assignment in circuit.inputs]
+            outputs = [assignment.wire.i for assignment in circuit.outputs]
+            if inverted:
+                inputs, outputs = outputs, inputs
+            try:
+                ops = self._compile(self._gates(name, circuit), inverted)
+                self._compiled[key] = _Compiled(ops=ops, inputs=inputs, outputs=outputs)
+            finally:
+                self._active.remove(name)
+        return self._compiled[key]
+
+    def _execute(self, ops: List[Op], frame: Dict[int, int], controls: List[Tuple[int, bool]]) -> None:
+        """Apply operations, of which frame maps the wires to wire ids, controlled by controls."""
+        for op in ops:
+            if op.apply is Simulator._call:
+                self._call(op, frame, controls)
+                continue
+            targets = [self._id(frame, wire) for wire in op.targets]
+            op_controls = [(self._existing_id(frame, wire), positive) for wire, positive in op.controls]
+            if not op.no_control:
+                op_controls += controls
+            op.apply(self, targets, op_controls, op.argument)
+
+    def _call(self, op: Op, frame: Dict[int, int], controls: List[Tuple[int, bool]]) -> None:
+        call, outer_inverted = op.argument  # type: SubroutineCall, bool
+        call_inputs, call_outputs = call.inputs, call.outputs
+        if outer_inverted:
+            call_inputs, call_outputs = call_outputs, call_inputs
+        compiled = self._subroutine(call.name, outer_inverted != call.inverted)
+        call_controls = [(self._existing_id(frame, wire), positive) for wire, positive in op.controls]
+        if not op.no_control:
+            call_controls = controls + call_controls
+
+        for repetition in range(call.repetitions):
+            # The outputs of a repetition are the inputs of the next.
+            repetition_inputs = call_inputs if repetition == 0 else call_outputs
+            call_frame = {wire: self._existing_id(frame, call_wire.i)
+                          for wire, call_wire in zip(compiled.inputs, repetition_inputs)}
+            self._execute(compiled.ops, call_frame, call_controls)
+            output_ids = [self._existing_id(call_frame, wire) for wire in compiled.outputs]
+            for wire in repetition_inputs:
+                frame.pop(wire.i, None)
+            for wire, wire_id in zip(call_outputs, output_ids):
+                frame[wire.i] = wire_id
+
+    def _init(self, targets: List[int], controls: List[Tuple[int, bool]], value: bool) -> None:
+        """Initialize a qubit to |value>."""
+        raise NotImplementedError
+
+    def _term(self, targets: List[int], controls: List[Tuple[int, bool]], value: bool) -> None:
+        """Terminate a qubit that is asserted to be |value>."""
+        raise NotImplementedError
+
+    def _sample(self, wire_id: int) -> bool:
+        """Measure a qubit and remove it from the state."""
+        raise NotImplementedError
+
+    def _measure(self, targets: List[int], controls: List[Tuple[int, bool]], _) -> None:
+        self._bits[targets[0]] = self._sample(targets[0])
+
+    def _discard(self, targets: List[int], controls: List[Tuple[int, bool]], _) -> None:
+        self._sample(targets[0])
+
+    def _prep(self, targets: List[int], controls: List[Tuple[int, bool]], _) -> None:
+        value = self._bit(targets[0])
+        del self._bits[targets[0]]
+        self._init(targets, controls, value)
+
+    def _classical_controls(self, controls: List[Tuple[int, bool]]) -> bool:
+        """Whether all controls of a classical gate hold."""
+        return all(self._bit(wire_id) == positive for wire_id, positive in controls)
+
+    def _cnot(self, targets: List[int], controls: List[Tuple[int, bool]], _) -> None:
+        if self._classical_controls(controls):
+            self._bits[targets[0]] = not self._bit(targets[0])
+
+    def _cswap(self, targets: List[int], controls: List[Tuple[int, bool]], _) -> None:
+        if self._classical_controls(controls):
+            a, b = targets
+            self._bits[a], self._bits[b] = self._bit(b), self._bit(a)
+
+    def _cinit(self, targets: List[int], controls: List[Tuple[int, bool]], value: bool) -> None:
+        if self._is_qubit(targets[0]) or targets[0] in self._bits:
+            raise RuntimeError("Wire is initialized twice")
+        self._bits[targets[0]] = value
+
+    def _cterm(self, targets: List[int], controls: List[Tuple[int, bool]], value: bool) -> None:
+        if self._bit(targets[0]) != value:
+            raise RuntimeError("CTerm{:d} of a bit that is not {:d}".format(value, value))
+        del self._bits[targets[0]]
+
+    def _cdiscard(self, targets: List[int], controls: List[Tuple[int, bool]], _) -> None:
+        self._bit(targets[0])
+        del self._bits[targets[0]]
+
+    def _cgate(self, targets: List[int], controls: List[Tuple[int, bool]], argument) -> None:
+        """Compute a classical function of the inputs into the first wire, or uncompute it if inverted."""
+        function, inverted = argument
+        value = bool(function(*[self._bit(wire_id) for wire_id in targets[1:]]))
+        if inverted:
+            self._cterm(targets[:1], controls, value)
+        else:
+            self._cinit(targets[:1], controls, value)
+
+
+def update_qubits(gate: Gate, qubits: Set[int], output_types: Dict[str, list]) -> None:
+    """Track which wires are qubits after a gate that is not fused or simulated as a unitary."""
+    if isinstance(gate, (QInit, QPrep)):
+        qubits.add(gate.wire.i)
+    elif isinstance(gate, (QTerm, QDiscard, QMeas, QUnprep, CInit, CTerm, CDiscard, DTerm)):
+        qubits.discard(gate.wire.i)
+    elif isinstance(gate, CGate):
+        qubits.discard(gate.wires[0].i)
+    elif isinstance(gate, SubroutineCall):
+        for wire in gate.inputs:
+            qubits.discard(wire.i)
+        for wire, assignment in zip(gate.outputs, output_types.get(gate.name, ())):
+            if assignment.type == TypeAssignment_Type.Qbit:
+                qubits.add(wire.i)
@@ -0,0 +1,183 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Fuse runs of gates on few qubits into dense unitary blocks.
+
+A simulator applies a fused block in a single pass over the state instead of one pass per gate,
+and analyses that loop over the gates see fewer of them.
+"""
+
+from typing import *
+
+import numpy as np
+
+from quippy.analysis import gate_wires
+from quippy.sim.base import update_qubits
+from quippy.sim.matrices import SQRT_HALF, qgate_matrix, qrot_matrix
+from quippy.transformer import Wire, Control, Gate, QGate_Op, QGate, QRot, Comment, TypeAssignment_Type, \
+    Circuit, Subroutine
+
+
+class Unitary(Gate, NamedTuple('Unitary', [
+    # The unitary of the gates as a 2^k by 2^k matrix, with the first wire as the most significant bit.
+    ('matrix', np.ndarray),
+    ('wires', List[Wire]),
+    ('control', Control),
+    # The number of gates that were fused.
+    ('gates', int)
+    ])):
+    __slots__ = ()
+
+
+Fusion = NamedTuple('Fusion', [
+    # The circuit with the fused gates.
+    ('circuit', Circuit),
+    # The number of gates before fusion, not counting comments.
+    ('gates', int),
+    # The number of gates after fusion, not counting comments.
+    ('fused_gates', int)
+    ])
+
+_SWAP = np.eye(4)[[0, 2, 1, 3]]
+_W = np.array([[1, 0, 0, 0], [0, SQRT_HALF, SQRT_HALF, 0], [0, SQRT_HALF, -SQRT_HALF, 0], [0, 0, 0, 1]])
+_ZERO = np.diag([1, 0])
+_ONE = np.diag([0, 1])
+
+
+class _Block:
+    def __init__(self, wires: List[int], matrix: np.ndarray, no_control: bool, gates: List[Gate]):
+        self.wires = wires
+        self.matrix = matrix
+        self.no_control = no_control
+        self.gates = gates
+
+
+def fuse(circuit: Circuit, max_wires=2, subroutines: Iterable[Subroutine] = ()) -> Fusion:
+    """Fuse consecutive QGate and QRot gates that together act on at most max_wires qubits.
+
+    A gate is fused if all its targets and controls are qubits. Gates are only fused with gates
+    that have the same 'with nocontrol' mark, so fused blocks are controlled like the original gates
+    when the circuit is called as a controlled subroutine. A block of a single gate is kept as that gate.
+    Gates that are not fused keep their order relative to the blocks on their wires.
+
+    :param circuit: The circuit to fuse.
+    :param max_wires: The largest number of wires of a block.
+    :param subroutines: The subroutines called by the circuit, such as Start.subroutines,
+        which give the types of the outputs of calls. Without them, the outputs of calls are not fused.
+    :return: The fused circuit and its number of gates before and after fusion.
+    """
+    output_types = {subroutine.name: subroutine.circuit.outputs for subroutine in subroutines}
+    qubits = {assignment.wire.i for assignment in circuit.inputs if assignment.type == TypeAssignment_Type.Qbit}
+    gates = []  # type: List[Gate]
+    blocks = {}  # type: Dict[int, _Block]
+
+    def flush(flushed: Iterable[_Block]) -> None:
+        for block in flushed:
+            for wire in block.wires:
+                del blocks[wire]
+            if len(block.gates) == 1:
+                gates.append(block.gates[0])
+            else:
+                gates.append(Unitary(matrix=block.matrix, wires=[Wire(wire) for wire in block.wires],
+                                     control=Control(controlled=[], no_control=block.no_control),
+                                     gates=len(block.gates)))
+
+    for gate in circuit.gates:
+        if isinstance(gate, Comment):
+            gates.append(gate)
+            continue
+        unitary = _unitary(gate, qubits, max_wires)
+        if unitary is None:
+            flush(_unique(blocks, (wire.i for wire in gate_wires(gate))))
+            gates.append(gate)
+            update_qubits(gate, qubits, output_types)
+            continue
+
+        wires, matrix, no_control = unitary
+        touched = _unique(blocks, wires)
+        union = wires + [wire for block in touched for wire in block.wires if wire not in wires]
+        if len(union) <= max_wires and all(block.no_control == no_control for block in touched):
+            # The touched blocks act on different wires, so they can be applied in any order.
+            fused = np.eye(2 ** len(union))
+            for block in touched:
+                fused = _embed(block.matrix, block.wires, union) @ fused
+            fused = _embed(matrix, wires, union) @ fused
+            for block in touched:
+                for wire in block.wires:
+                    del blocks[wire]
+            block = _Block(union, fused, no_control, [old for block in touched for old in block.gates] + [gate])
+        else:
+            flush(touched)
+            block = _Block(wires, matrix, no_control, [gate])
+        for wire in block.wires:
+            blocks[wire] = block
+    flush(_unique(blocks, list(blocks)))
+
+    count = sum(1 for gate in circuit.gates if not isinstance(gate, Comment))
+    fused_count = sum(1 for gate in gates if not isinstance(gate, Comment))
+    return Fusion(circuit=Circuit(inputs=circuit.inputs, gates=gates, outputs=circuit.outputs), gates=count,
+                  fused_gates=fused_count)
+
+
+def _unique(blocks: Dict[int, _Block], wires: Iterable[int]) -> List[_Block]:
+    """The distinct blocks on wires, in order."""
+    found = {}  # type: Dict[int, _Block]
+    for wire in wires:
+        block = blocks.get(wire)
+        if block is not None:
+            found[id(block)] = block
+    return list(found.values())
+
+
+def _unitary(gate: Gate, qubits: Set[int], max_wires: int) -> Optional[Tuple[List[int], np.ndarray, bool]]:
+    """The wires, unitary and 'with nocontrol' mark of a gate, or None if it is not fused."""
+    if isinstance(gate, QRot):
+        if gate.wire.i not in qubits or max_wires < 1:
+            return None
+        return [gate.wire.i], np.array(qrot_matrix(gate, False)).reshape(2, 2), False
+    if not isinstance(gate, QGate):
+        return None
+
+    targets = [wire.i for wire in gate.wires]
+    controls = gate.control.controlled
+    wires = [abs(wire.i) for wire in controls] + targets
+    if len(wires) > max_wires or len(set(wires)) != len(wires) or not qubits.issuperset(wires):
+        return None
+    if gate.op in (QGate_Op.Swap, QGate_Op.W):
+        if len(targets) != 2:
+            return None
+        # Both are their own inverse.
+        matrix = _SWAP if gate.op == QGate_Op.Swap else _W
+    else:
+        single = np.array(qgate_matrix(gate.op, gate.inverted)).reshape(2, 2)
+        matrix = np.ones((1, 1))
+        for _ in targets:
+            matrix = np.kron(matrix, single)
+    for control in reversed(controls):
+        active, inactive = (_ONE, _ZERO) if control.i >= 0 else (_ZERO, _ONE)
+        matrix = np.kron(active, matrix) + np.kron(inactive, np.eye(len(matrix)))
+    return wires, matrix, gate.control.no_control
+
+
+def _embed(matrix: np.ndarray, wires: List[int], support: List[int]) -> np.ndarray:
+    """Extend the matrix of a gate on wires to the wires of support, a superset of wires."""
+    rest = [wire for wire in support if wire not in wires]
+    full = np.kron(matrix, np.eye(2 ** len(rest)))
+    order = wires + rest
+    if order == support:
+        return full
+    n = len(support)
+    permutation = [order.index(wire) for wire in support]
+    return full.reshape((2,) * 2 * n).transpose(permutation + [n + axis for axis in permutation]).reshape(
+        2 ** n, 2 ** n)
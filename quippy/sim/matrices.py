@@ -0,0 +1,66 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The matrices of the single-qubit gates, as tuples (u00, u01, u10, u11)."""
+
+import cmath
+import math
+from typing import *
+
+from quippy.transformer import QGate_Op, QRot_Op, QRot
+
+Matrix = Tuple[complex, complex, complex, complex]
+
+OMEGA = cmath.exp(1j * math.pi / 4)
+SQRT_HALF = math.sqrt(0.5)
+
+"""The matrices of the single-qubit operations."""
+MATRICES = {
+    QGate_Op.Not: (0, 1, 1, 0),
+    QGate_Op.MultiNot: (0, 1, 1, 0),
+    QGate_Op.H: (SQRT_HALF, SQRT_HALF, SQRT_HALF, -SQRT_HALF),
+    QGate_Op.Y: (0, -1j, 1j, 0),
+    QGate_Op.Z: (1, 0, 0, -1),
+    QGate_Op.S: (1, 0, 0, 1j),
+    QGate_Op.T: (1, 0, 0, OMEGA),
+    # E = H S^3 ω^3
+    QGate_Op.E: ((-1 + 1j) / 2, (1 + 1j) / 2, (-1 + 1j) / 2, (-1 - 1j) / 2),
+    # The scalar ω, which is a phase on the controls of the gate.
+    QGate_Op.Omega: (OMEGA, 0, 0, OMEGA),
+    QGate_Op.V: ((1 + 1j) / 2, (1 - 1j) / 2, (1 - 1j) / 2, (1 + 1j) / 2),
+    QGate_Op.IX: (0, 1j, 1j, 0),
+    }  # type: Dict[QGate_Op, Matrix]
+
+
+def qgate_matrix(op: QGate_Op, inverted: bool) -> Matrix:
+    """The matrix of a single-qubit QGate operation."""
+    matrix = MATRICES[op]
+    return adjoint(matrix) if inverted else matrix
+
+
+def qrot_matrix(gate: QRot, inverted: bool) -> Matrix:
+    """The matrix of a rotation, which is inverted if inverted differs from gate.inverted."""
+    if gate.op == QRot_Op.ExpZt:
+        phase = cmath.exp(-1j * gate.timestep)
+        matrix = (phase, 0, 0, phase.conjugate())
+    else:
+        if gate.timestep == 0:
+            raise RuntimeError("Rotation by 2π/0: {}".format(gate))
+        matrix = (1, 0, 0, cmath.exp(2j * math.pi / gate.timestep))
+    return adjoint(matrix) if gate.inverted != inverted else matrix
+
+
+def adjoint(matrix: Matrix) -> Matrix:
+    u00, u01, u10, u11 = matrix
+    return u00.conjugate(), u10.conjugate(), u01.conjugate(), u11.conjugate()
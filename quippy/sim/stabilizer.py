@@ -0,0 +1,521 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A stabilizer simulator for Clifford circuits, backed by a bit-packed NumPy tableau.
+
+The state of n qubits is kept as n stabilizer and n destabilizer Pauli operators,
+as in the CHP simulator of Aaronson and Gottesman (https://arxiv.org/abs/quant-ph/0406196).
+The tableau is stored by qubit: every qubit has a column with the X and Z bits of all rows,
+packed 64 rows to a uint64 word. So a gate costs a few operations on the words of its columns, O(n/64),
+and a measurement a few operations on the whole tableau, O(n^2/64).
+Row 2s is the destabilizer and row 2s + 1 the stabilizer of slot s. Every qubit takes a column and a slot,
+which are freed again when the qubit is measured or terminated.
+Global phases are not tracked.
+"""
+
+import math
+from typing import *
+
+import numpy as np
+
+from quippy.sim.base import Simulator, update_qubits
+from quippy.transformer import Gate, QGate_Op, QGate, QRot_Op, QRot, GPhase, SubroutineCall, \
+    TypeAssignment_Type, Circuit, Subroutine
+
+_ALL = np.uint64(0xFFFFFFFFFFFFFFFF)
+# The bits of the stabilizer rows, which are odd.
+_STABILIZERS = np.uint64(0xAAAAAAAAAAAAAAAA)
+_ONE = np.uint64(1)
+_SHIFTS = [np.uint64(1 << shift) for shift in range(6)]
+
+# The gates that are Clifford when they have a single quantum control.
+_CONTROLLED_OPS = {QGate_Op.Not, QGate_Op.MultiNot, QGate_Op.Y, QGate_Op.Z, QGate_Op.IX}
+
+
+class Stabilizer(Simulator):
+    """Simulate Clifford circuits on a stabilizer tableau.
+
+    The Clifford gates are not, H, multinot, Y, Z, S, E, omega, V, swap and iX,
+    QRot and Gphase by multiples of π/2, and not, Y, Z and iX with one quantum control.
+    Any number of classical controls is allowed. Other gates raise a RuntimeError when they are run,
+    is_clifford checks a circuit up front.
+    Qubits are allocated by QInit and QPrep and deallocated by QTerm, QMeas, QDiscard and QUnprep.
+    Measurements with a random outcome are sampled.
+
+    :param subroutines: The subroutines called by the circuits, such as Start.subroutines.
+    :param seed: The seed of the random numbers for measurements.
+    """
+
+    def __init__(self, subroutines: Iterable[Subroutine] = (), seed=None):
+        super().__init__(subroutines, seed)
+        self._reset(0)
+        self._outputs = []  # type: List[int]
+
+    def _reset(self, capacity: int) -> None:
+        words = (2 * capacity + 63) // 64
+        self._x = np.zeros((capacity, words), dtype=np.uint64)
+        self._z = np.zeros((capacity, words), dtype=np.uint64)
+        self._r = np.zeros(words, dtype=np.uint64)
+        # The column of every qubit.
+        self._columns = {}  # type: Dict[int, int]
+        self._free_columns = list(reversed(range(capacity)))
+        self._free_slots = list(reversed(range(capacity)))
+
+    def run(self, circuit: Circuit, bits: Optional[Mapping[int, bool]] = None) -> Dict[int, bool]:
+        """Simulate a circuit, starting with all Qbit inputs in |0>.
+
+        :param circuit: The circuit to simulate.
+        :param bits: The values of the Cbit inputs by wire, False by default.
+        :return: The values of the Cbit outputs by wire, which are also stored in bits.
+            The state of the Qbit outputs is given by stabilizers.
+        """
+        qubit_inputs = [assignment.wire.i for assignment in circuit.inputs
+                        if assignment.type == TypeAssignment_Type.Qbit]
+        self._reset(len(qubit_inputs))
+        frame = self._start(circuit, bits)
+        for wire in qubit_inputs:
+            self._init([self._id(frame, wire)], [], False)
+        outputs = self._run(circuit, frame)
+        if len(outputs) != len(self._columns):
+            raise RuntimeError("Qubits remain that are not outputs of the circuit")
+        self._outputs = [self._columns[wire_id] for wire_id in outputs]
+        return self.bits
+
+    def stabilizers(self) -> List[str]:
+        """The generators of the stabilizer group of the Qbit outputs of the last run.
+
+        Every generator is a sign and a Pauli per output in the order of the outputs, for example '-XIZY'.
+        """
+        free = set(self._free_slots)
+        generators = []
+        for slot in range(len(self._x)):
+            if slot in free:
+                continue
+            word, bit = divmod(2 * slot + 1, 64)
+            x = [int(self._x[column, word]) >> bit & 1 for column in self._outputs]
+            z = [int(self._z[column, word]) >> bit & 1 for column in self._outputs]
+            sign = '-' if int(self._r[word]) >> bit & 1 else '+'
+            generators.append(sign + ''.join('IXZY'[x_bit + 2 * z_bit] for x_bit, z_bit in zip(x, z)))
+        return generators
+
+    def _is_qubit(self, wire_id: int) -> bool:
+        return wire_id in self._columns
+
+    def _column(self, wire_id: int) -> int:
+        try:
+            return self._columns[wire_id]
+        except KeyError:
+            raise RuntimeError("Wire is not a qubit") from None
+
+    def _compile_quantum(self, gate: Gate, inverted: bool) -> Tuple[Callable, List[int], Any]:
+        if isinstance(gate, QGate):
+            inverted = gate.inverted != inverted
+            return Stabilizer._qgate, [wire.i for wire in gate.wires], (gate.op, inverted, gate)
+        if isinstance(gate, QRot):
+            turns = _rotation_turns(gate, inverted)
+            if turns is None:
+                raise RuntimeError("Not a Clifford gate: {}".format(gate))
+            return Stabilizer._rotation, [gate.wire.i], (turns, gate)
+        if isinstance(gate, GPhase):
+            turns = _quarter_turns(-math.pi * gate.timestep if inverted else math.pi * gate.timestep)
+            return Stabilizer._gphase, [], (turns, gate)
+        raise RuntimeError("Not a Clifford gate: {}".format(gate))
+
+    def _quantum_controls(self, controls: List[Tuple[int, bool]]) -> Optional[List[Tuple[int, bool]]]:
+        """The columns of the quantum controls, or None if a classical control does not hold."""
+        quantum = []  # type: List[Tuple[int, bool]]
+        for wire_id, positive in controls:
+            bit = self._bits.get(wire_id)
+            if bit is None:
+                quantum.append((self._column(wire_id), positive))
+            elif bit != positive:
+                return None
+        return quantum
+
+    def _qgate(self, targets: List[int], controls: List[Tuple[int, bool]], argument) -> None:
+        op, inverted, gate = argument  # type: QGate_Op, bool, QGate
+        quantum = self._quantum_controls(controls)
+        if quantum is None:
+            return
+        if not quantum:
+            if op == QGate_Op.Swap:
+                a, b = targets
+                self._columns[a], self._columns[b] = self._column(b), self._column(a)
+                return
+            sequence = _SEQUENCES.get((op, inverted))
+            if sequence is None:
+                raise RuntimeError("Not a Clifford gate: {}".format(gate))
+            for target in targets:
+                column = self._column(target)
+                for apply in sequence:
+                    apply(self, column)
+            return
+        if len(quantum) != 1 or op not in _CONTROLLED_OPS:
+            raise RuntimeError("Not a Clifford gate: {}".format(gate))
+        control, positive = quantum[0]
+        if not positive:
+            self._pauli_x(control)
+        for target in targets:
+            column = self._column(target)
+            if op == QGate_Op.Z:
+                self._cz(control, column)
+            elif op == QGate_Op.Y:
+                self._s_dagger(column)
+                self._cx(control, column)
+                self._s(column)
+            else:
+                self._cx(control, column)
+                if op == QGate_Op.IX:
+                    # The phase i of iX is a phase on the control.
+                    (self._s_dagger if inverted else self._s)(control)
+        if not positive:
+            self._pauli_x(control)
+
+    def _rotation(self, targets: List[int], controls: List[Tuple[int, bool]], argument) -> None:
+        turns, gate = argument
+        quantum = self._quantum_controls(controls)
+        if quantum is None:
+            return
+        if quantum:
+            raise RuntimeError("Not a Clifford gate: {}".format(gate))
+        self._turn(self._column(targets[0]), turns)
+
+    def _gphase(self, targets: List[int], controls: List[Tuple[int, bool]], argument) -> None:
+        """A global phase, which is a phase on the qubit if it has a single quantum control."""
+        turns, gate = argument
+        quantum = self._quantum_controls(controls)
+        if not quantum:
+            return
+        if len(quantum) != 1 or turns is None:
+            raise RuntimeError("Not a Clifford gate: {}".format(gate))
+        control, positive = quantum[0]
+        if not positive:
+            self._pauli_x(control)
+        self._turn(control, turns)
+        if not positive:
+            self._pauli_x(control)
+
+    def _turn(self, column: int, turns: int) -> None:
+        """Apply the phase gate diag(1, i^turns)."""
+        if turns == 1:
+            self._s(column)
+        elif turns == 2:
+            self._pauli_z(column)
+        elif turns == 3:
+            self._s_dagger(column)
+
+    def _h(self, a: int) -> None:
+        x, z = self._x, self._z
+        self._r ^= x[a] & z[a]
+        old = x[a].copy()
+        x[a] = z[a]
+        z[a] = old
+
+    def _s(self, a: int) -> None:
+        x, z = self._x, self._z
+        self._r ^= x[a] & z[a]
+        z[a] ^= x[a]
+
+    def _s_dagger(self, a: int) -> None:
+        x, z = self._x, self._z
+        self._r ^= x[a] & ~z[a]
+        z[a] ^= x[a]
+
+    def _pauli_x(self, a: int) -> None:
+        self._r ^= self._z[a]
+
+    def _pauli_y(self, a: int) -> None:
+        self._r ^= self._x[a] ^ self._z[a]
+
+    def _pauli_z(self, a: int) -> None:
+        self._r ^= self._x[a]
+
+    def _cx(self, control: int, target: int) -> None:
+        x, z = self._x, self._z
+        self._r ^= x[control] & z[target] & ~(x[target] ^ z[control])
+        x[target] ^= x[control]
+        z[control] ^= z[target]
+
+    def _cz(self, a: int, b: int) -> None:
+        x, z = self._x, self._z
+        self._r ^= x[a] & x[b] & (z[a] ^ z[b])
+        z[a] ^= x[b]
+        z[b] ^= x[a]
+
+    def _init(self, targets: List[int], controls: List[Tuple[int, bool]], value: bool) -> None:
+        wire_id = targets[0]
+        if wire_id in self._columns or wire_id in self._bits:
+            raise RuntimeError("Wire is initialized twice")
+        if not self._free_columns:
+            self._grow()
+        column = self._columns[wire_id] = self._free_columns.pop()
+        slot = self._free_slots.pop()
+        # The destabilizer is X and the stabilizer ±Z.
+        word, bit = divmod(2 * slot, 64)
+        self._x[column, word] |= np.uint64(1 << bit)
+        self._z[column, word] |= np.uint64(2 << bit)
+        if value:
+            self._r[word] |= np.uint64(2 << bit)
+
+    def _grow(self) -> None:
+        """Double the number of columns and slots."""
+        x, z, r = self._x, self._z, self._r
+        columns = self._columns
+        capacity = max(1, 2 * len(x))
+        self._reset(capacity)
+        self._x[:x.shape[0], :x.shape[1]] = x
+        self._z[:z.shape[0], :z.shape[1]] = z
+        self._r[:len(r)] = r
+        self._columns = columns
+        self._free_columns = list(reversed(range(len(x), capacity)))
+        self._free_slots = list(reversed(range(len(x), capacity)))
+
+    def _term(self, targets: List[int], controls: List[Tuple[int, bool]], value: bool) -> None:
+        self._remove(targets[0], value)
+
+    def _sample(self, wire_id: int) -> bool:
+        return self._remove(wire_id, None)
+
+    def _remove(self, wire_id: int, value: Optional[bool]) -> bool:
+        """Measure a qubit and free its column and a slot, asserting the outcome if value is given."""
+        a = self._column(wire_id)
+        x, z, r = self._x, self._z, self._r
+        stabilizers = x[a] & _STABILIZERS
+        anticommuting = np.flatnonzero(stabilizers)
+        if len(anticommuting):
+            # Z_a anticommutes with stabilizer p, so the outcome is random.
+            if value is not None:
+                raise RuntimeError("QTerm{:d} of a qubit that is not in state |{:d}>".format(value, value))
+            outcome = self._random.random() < 0.5
+            word = int(anticommuting[0])
+            bit = _lowest_bit(int(stabilizers[word]))
+            # Multiply stabilizer p into all other rows that anticommute with Z_a, so they commute.
+            rows = x[a].copy()
+            rows[word] &= ~np.uint64(1 << bit)
+            self._multiply(rows, word, bit)
+            # Stabilizer p becomes ±Z_a, with the destabilizer X_a.
+            slot_mask = np.uint64(3 << (bit - 1))
+        else:
+            # Z_a is a product of the stabilizers whose destabilizers anticommute with it.
+            destabilizers = x[a]
+            outcome = self._product_sign(destabilizers << _ONE)
+            if value is not None and outcome != value:
+                raise RuntimeError("QTerm{:d} of a qubit that is not in state |{:d}>".format(value, value))
+            word = int(np.flatnonzero(destabilizers)[0])
+            bit = _lowest_bit(int(destabilizers[word]))
+            # Stabilizer q becomes the product ±Z_a, and the other destabilizers that anticommute with it
+            # are multiplied by destabilizer q, whose sign does not matter.
+            rows = destabilizers.copy()
+            rows[word] &= ~np.uint64(1 << bit)
+            self._multiply(rows, word, bit, signs=False)
+            slot_mask = np.uint64(3 << bit)
+        x[:, word] &= ~slot_mask
+        z[:, word] &= ~slot_mask
+        r[word] &= ~slot_mask
+        # Only the removed slot had X_a, multiply ±Z_a into the rows with Z_a.
+        if outcome:
+            r ^= z[a] & _STABILIZERS
+        x[a] = 0
+        z[a] = 0
+        del self._columns[wire_id]
+        self._free_columns.append(a)
+        self._free_slots.append(64 * word + bit >> 1)
+        return outcome
+
+    def _multiply(self, rows: np.ndarray, word: int, bit: int, signs=True) -> None:
+        """Multiply the row at the bit of a word into rows, a bit mask of rows, and update their signs if signs."""
+        x, z, r = self._x, self._z, self._r
+        shift = np.uint64(bit)
+        support = np.flatnonzero(((x[:, word] | z[:, word]) >> shift) & _ONE)
+        row_x = ((x[support, word] >> shift) & _ONE) * _ALL
+        row_z = ((z[support, word] >> shift) & _ONE) * _ALL
+        rows_x, rows_z = x[support], z[support]
+        if signs:
+            sign = _product_signs(rows_x, rows_z, row_x, row_z)
+            if (int(r[word]) >> bit) & 1:
+                sign = ~sign
+            r ^= rows & _STABILIZERS & sign
+        x[support] = rows_x ^ (row_x[:, None] & rows)
+        z[support] = rows_z ^ (row_z[:, None] & rows)
+
+    def _product_sign(self, rows: np.ndarray) -> bool:
+        """Whether the product of the commuting rows, a bit mask, is the negative of a Pauli operator."""
+        # Only the words with rows in them contribute, which skips most of the tableau for few rows.
+        words = np.flatnonzero(rows)
+        rows = rows[words]
+        x, z = self._x[:, words] & rows, self._z[:, words] & rows
+        # The product of the rows i^(x z) X^x Z^z is i^e X^(Σx) Z^(Σz) by qubit, with
+        # e = Σ x z + 2 Σ_{i<k} z_i x_k - (Σx)(Σz) for the sums modulo 2.
+        exponent = _popcount(x & z)
+        before = z.copy()
+        for shift in _SHIFTS:
+            before ^= before << shift
+        parity = before >> np.uint64(63)
+        before ^= z
+        carry = np.bitwise_xor.accumulate(parity, axis=1)
+        before[:, 1:] ^= carry[:, :-1] * _ALL
+        exponent += 2 * _popcount(before & x)
+        exponent -= int(np.count_nonzero(_parity(np.bitwise_xor.reduce(x, axis=1))
+                                          & _parity(np.bitwise_xor.reduce(z, axis=1))))
+        exponent += 2 * _popcount(self._r[words] & rows)
+        return exponent % 4 == 2
+
+
+def _product_signs(rows_x: np.ndarray, rows_z: np.ndarray, row_x: np.ndarray, row_z: np.ndarray) -> np.ndarray:
+    """Whether the product of a row with every row is negated, as a bit mask of the rows.
+
+    The rows are given by their columns on the support of the row, and the row by all ones or zeros.
+    """
+    # The exponent of i by qubit is x z + x' z' + 2 z x' - (x ^ x')(z ^ z'), which is even for commuting rows.
+    low1, high1 = _count_mod4(rows_x & rows_z)
+    low3, high3 = _count_mod4((rows_x ^ row_x[:, None]) & (rows_z ^ row_z[:, None]))
+    high = high1 ^ high3 ^ low3 ^ (low1 & low3) ^ np.bitwise_xor.reduce(rows_x & row_z[:, None], axis=0)
+    constant = np.count_nonzero(row_x & row_z) % 4
+    if constant & 1:
+        high ^= low1 ^ low3
+    if constant & 2:
+        high = ~high
+    return high
+
+
+def _count_mod4(planes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """The number of planes with each bit set, modulo 4, as its low and high bit."""
+    low = planes
+    high = np.zeros_like(planes)
+    while len(low) > 1:
+        half = len(low) // 2
+        carry = low[:half] & low[half:2 * half]
+        next_low = low[:half] ^ low[half:2 * half]
+        next_high = high[:half] ^ high[half:2 * half] ^ carry
+        if len(low) % 2:
+            next_low = np.concatenate([next_low, low[-1:]])
+            next_high = np.concatenate([next_high, high[-1:]])
+        low, high = next_low, next_high
+    if not len(low):
+        return np.zeros(planes.shape[1:], dtype=np.uint64), np.zeros(planes.shape[1:], dtype=np.uint64)
+    return low[0], high[0]
+
+
+def _parity(words: np.ndarray) -> np.ndarray:
+    """Whether every word has an odd number of bits set."""
+    words = words.copy()
+    for shift in reversed(_SHIFTS):
+        words ^= words >> shift
+    return (words & _ONE).astype(bool)
+
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount(words: np.ndarray) -> int:
+        return int(np.bitwise_count(words).sum())
+else:
+    def _popcount(words: np.ndarray) -> int:
+        return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+def _lowest_bit(word: int) -> int:
+    return (word & -word).bit_length() - 1
+
+
+def _quarter_turns(angle: float) -> Optional[int]:
+    """The number of quarter turns of an angle modulo 4, or None if it is not a multiple of π/2."""
+    turns = angle / (math.pi / 2)
+    if abs(turns - round(turns)) > 1e-9:
+        return None
+    return round(turns) % 4
+
+
+def _rotation_turns(gate: QRot, inverted: bool) -> Optional[int]:
+    """The quarter turns of the phase of a rotation, up to a global phase."""
+    if gate.op == QRot_Op.ExpZt:
+        # exp(-iZt) is diag(1, exp(2it)) up to a global phase.
+        angle = 2 * gate.timestep
+    elif gate.timestep == 0:
+        return None
+    else:
+        angle = 2 * math.pi / gate.timestep
+    return _quarter_turns(-angle if gate.inverted != inverted else angle)
+
+
+# The single-qubit Clifford gates, by operation and whether they are inverted, as the tableau updates in order.
+_SEQUENCES = {}  # type: Dict[Tuple[QGate_Op, bool], List[Callable]]
+for _inverted in (False, True):
+    _SEQUENCES.update({
+        (QGate_Op.Not, _inverted): [Stabilizer._pauli_x],
+        (QGate_Op.MultiNot, _inverted): [Stabilizer._pauli_x],
+        (QGate_Op.IX, _inverted): [Stabilizer._pauli_x],
+        (QGate_Op.H, _inverted): [Stabilizer._h],
+        (QGate_Op.Y, _inverted): [Stabilizer._pauli_y],
+        (QGate_Op.Z, _inverted): [Stabilizer._pauli_z],
+        (QGate_Op.Omega, _inverted): [],
+        })
+_SEQUENCES.update({
+    (QGate_Op.S, False): [Stabilizer._s],
+    (QGate_Op.S, True): [Stabilizer._s_dagger],
+    # E = H S^3 up to a phase.
+    (QGate_Op.E, False): [Stabilizer._s_dagger, Stabilizer._h],
+    (QGate_Op.E, True): [Stabilizer._h, Stabilizer._s],
+    # V = H S H.
+    (QGate_Op.V, False): [Stabilizer._h, Stabilizer._s, Stabilizer._h],
+    (QGate_Op.V, True): [Stabilizer._h, Stabilizer._s_dagger, Stabilizer._h],
+    })
+
+
+def is_clifford(circuit: Circuit, subroutines: Iterable[Subroutine] = ()) -> bool:
+    """Whether Stabilizer can simulate a circuit, including the subroutines that it calls.
+
+    Controls on classical wires are ignored, and a controlled subroutine call adds a quantum control
+    to the gates of the subroutine.
+
+    :param circuit: The circuit to check.
+    :param subroutines: The subroutines called by the circuit, such as Start.subroutines.
+    """
+    subroutines = list(subroutines)
+    circuits = {subroutine.name: subroutine.circuit for subroutine in subroutines}
+    output_types = {subroutine.name: subroutine.circuit.outputs for subroutine in subroutines}
+    known = {}  # type: Dict[Tuple[str, bool], bool]
+
+    def check(checked: Circuit, controlled: bool) -> bool:
+        qubits = {assignment.wire.i for assignment in checked.inputs
+                  if assignment.type == TypeAssignment_Type.Qbit}
+        for gate in checked.gates:
+            control = getattr(gate, 'control', None)
+            quantum = sum(1 for wire in control.controlled if abs(wire.i) in qubits) if control else 0
+            if controlled and not (control is not None and control.no_control):
+                quantum += 1
+            if isinstance(gate, QGate):
+                if quantum == 0:
+                    clifford = (gate.op, gate.inverted) in _SEQUENCES or gate.op == QGate_Op.Swap
+                else:
+                    clifford = quantum == 1 and gate.op in _CONTROLLED_OPS
+            elif isinstance(gate, QRot):
+                clifford = quantum == 0 and _rotation_turns(gate, False) is not None
+            elif isinstance(gate, GPhase):
+                clifford = quantum == 0 or quantum == 1 and _quarter_turns(math.pi * gate.timestep) is not None
+            elif isinstance(gate, SubroutineCall):
+                key = (gate.name, quantum == 1)
+                if quantum > 1 or gate.name not in circuits or known.get(key) is False:
+                    return False
+                if key not in known:
+                    # A recursive call is not Clifford, since it can not be simulated.
+                    known[key] = False
+                    known[key] = check(circuits[gate.name], quantum == 1)
+                clifford = known[key]
+            else:
+                clifford = True
+            if not clifford:
+                return False
+            update_qubits(gate, qubits, output_types)
+        return True
+
+    return check(circuit, False)
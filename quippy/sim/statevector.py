@@ -0,0 +1,286 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A statevector simulator for parsed circuits, backed by NumPy.
+
+The state of n qubits is a tensor of shape (2,) * n with one axis per qubit.
+A gate is applied in place to the slices of the tensor along the axes of its targets,
+restricted to the slice where the controls hold, so no matrix of the full state is ever built.
+NumPy is an optional dependency of quippy, install it with: pip install quippy[numpy]
+"""
+
+import cmath
+import math
+from typing import *
+
+import numpy as np
+
+from quippy.sim.fusion import Fusion, Unitary, fuse
+from quippy.sim.matrices import SQRT_HALF, qgate_matrix, qrot_matrix
+from quippy.sim.base import Simulator
+from quippy.transformer import Gate, QGate_Op, QGate, QRot, GPhase, TypeAssignment_Type, Circuit, Subroutine
+
+
+class StateVector(Simulator):
+    """Simulate circuits on a statevector.
+
+    Qubits are allocated by QInit and QPrep and deallocated by QTerm, QMeas, QDiscard and QUnprep.
+    Measurements and discarded qubits are sampled from their probabilities, so the state is a single
+    outcome of the circuit.
+    Two-qubit gates act on |ab> with a the first and b the second wire of the gate.
+
+    :param subroutines: The subroutines called by the circuits, such as Start.subroutines.
+    :param seed: The seed of the random numbers for measurements.
+    :param tolerance: The largest probability of a wire being in the other state
+        that QTerm and CGate assertions allow.
+    :param fuse: Fuse runs of gates on one or two qubits into a single unitary before compiling,
+        see quippy.sim.fusion. The results by subroutine name, and None for the main circuit, are in fusions.
+    """
+
+    def __init__(self, subroutines: Iterable[Subroutine] = (), seed=None, tolerance=1e-9, fuse=False):
+        super().__init__(subroutines, seed)
+        self._fuse = fuse
+        self.fusions = {}  # type: Dict[Optional[str], Fusion]
+        self.tolerance = tolerance
+        self._state = np.ones((), dtype=complex)
+        # The wire id of every axis of the state.
+        self._qubits = []  # type: List[int]
+
+    def run(self, circuit: Circuit, state: Optional[np.ndarray] = None,
+            bits: Optional[Mapping[int, bool]] = None) -> np.ndarray:
+        """Simulate a circuit.
+
+        :param circuit: The circuit to simulate.
+        :param state: The state of the Qbit inputs, as a vector of length 2^k in the order of
+            circuit.inputs, with the first input as the most significant bit. By default all are |0>.
+        :param bits: The values of the Cbit inputs by wire, False by default.
+        :return: The final state of the Qbit outputs in the order of circuit.outputs.
+            The values of the Cbit outputs are stored in bits.
+        """
+        self._state = np.ones((), dtype=complex)
+        self._qubits = []
+        frame = self._start(circuit, bits)
+        qubit_inputs = [assignment.wire.i for assignment in circuit.inputs
+                        if assignment.type == TypeAssignment_Type.Qbit]
+        if state is None:
+            for wire in qubit_inputs:
+                self._init([self._id(frame, wire)], [], False)
+        else:
+            state = np.array(state, dtype=complex)
+            if state.size != 2 ** len(qubit_inputs):
+                raise ValueError("Expected a state of {} qubits".format(len(qubit_inputs)))
+            self._state = state.reshape((2,) * len(qubit_inputs))
+            self._qubits = [self._id(frame, wire) for wire in qubit_inputs]
+
+        qubit_outputs = [self._axis(wire_id) for wire_id in self._run(circuit, frame)]
+        if len(qubit_outputs) != len(self._qubits):
+            raise RuntimeError("Qubits remain that are not outputs of the circuit")
+        return np.transpose(self._state, qubit_outputs).reshape(-1)
+
+    def _axis(self, wire_id: int) -> int:
+        try:
+            return self._qubits.index(wire_id)
+        except ValueError:
+            raise RuntimeError("Wire is not a qubit") from None
+
+    def _is_qubit(self, wire_id: int) -> bool:
+        return wire_id in self._qubits
+
+    def _gates(self, name: Optional[str], circuit: Circuit) -> List[Gate]:
+        """The gates to compile of a subroutine, or of the main circuit if name is None, fused if enabled.
+
+        A subroutine is fused once for both of its directions.
+        """
+        if not self._fuse:
+            return circuit.gates
+        fusion = self.fusions.get(name)
+        if fusion is None or fusion.circuit.inputs is not circuit.inputs:
+            fusion = self.fusions[name] = fuse(circuit, subroutines=self._subroutine_list)
+        return fusion.circuit.gates
+
+    def _compile_quantum(self, gate: Gate, inverted: bool) -> Tuple[Callable, List[int], Any]:
+        if isinstance(gate, QGate):
+            inverted = gate.inverted != inverted
+            targets = [wire.i for wire in gate.wires]
+            if gate.op == QGate_Op.Swap:
+                return StateVector._swap, targets, None
+            if gate.op == QGate_Op.W:
+                return StateVector._w, targets, None
+            return StateVector._matrix, targets, qgate_matrix(gate.op, inverted)
+        if isinstance(gate, QRot):
+            return StateVector._matrix, [gate.wire.i], qrot_matrix(gate, inverted)
+        if isinstance(gate, Unitary):
+            matrix = gate.matrix.conj().T if inverted else gate.matrix
+            targets = [wire.i for wire in gate.wires]
+            if len(targets) == 1:
+                return StateVector._matrix, targets, tuple(matrix.reshape(-1))
+            rows = [(basis, [(column, value) for column, value in enumerate(row) if value != 0])
+                    for basis, row in enumerate(matrix.tolist())]
+            rows = [(basis, row) for basis, row in rows if row != [(basis, 1)]]
+            return StateVector._unitary, targets, rows
+        if isinstance(gate, GPhase):
+            phase = cmath.exp(1j * math.pi * gate.timestep)
+            return StateVector._phase, [], phase.conjugate() if inverted else phase
+        raise RuntimeError("Unknown gate: {}".format(gate))
+
+    def _controlled(self, controls: List[Tuple[int, bool]]) -> Optional[Tuple[np.ndarray, List[int]]]:
+        """The view of the state where the controls hold, and the axis of every qubit in the view.
+
+        None if a classical control does not hold.
+        """
+        index = [slice(None)] * len(self._qubits)  # type: List[Any]
+        for wire_id, positive in controls:
+            if wire_id in self._bits:
+                if self._bits[wire_id] != positive:
+                    return None
+            else:
+                index[self._axis(wire_id)] = int(positive)
+        axes = []  # type: List[int]
+        axis = 0
+        for value in index:
+            axes.append(axis)
+            if isinstance(value, slice):
+                axis += 1
+        # The Ellipsis makes sure that the result is a view, even without axes left.
+        return self._state[tuple(index) + (Ellipsis,)], axes
+
+    def _matrix(self, targets: List[int], controls: List[Tuple[int, bool]], matrix) -> None:
+        controlled = self._controlled(controls)
+        if controlled is None:
+            return
+        view, axes = controlled
+        u00, u01, u10, u11 = matrix
+        for target in targets:
+            axis = axes[self._axis(target)]
+            a0 = view[(slice(None),) * axis + (0, Ellipsis)]
+            a1 = view[(slice(None),) * axis + (1, Ellipsis)]
+            if u01 == 0 and u10 == 0:
+                if u00 != 1:
+                    a0 *= u00
+                if u11 != 1:
+                    a1 *= u11
+            elif u00 == 0 and u11 == 0:
+                old = a0.copy()
+                a0[...] = a1
+                if u01 != 1:
+                    a0 *= u01
+                a1[...] = old
+                if u10 != 1:
+                    a1 *= u10
+            else:
+                old = a0.copy()
+                a0 *= u00
+                a0 += u01 * a1
+                a1 *= u11
+                a1 += u10 * old
+
+    def _unitary(self, targets: List[int], controls: List[Tuple[int, bool]], rows: List[Tuple[int, list]]) -> None:
+        """Apply the rows of a 2^k by 2^k matrix to k targets, with the first target as the most significant bit.
+
+        Every row is given as its index and the nonzero (column, value) pairs; rows of the identity are left out.
+        """
+        controlled = self._controlled(controls)
+        if controlled is None:
+            return
+        view, axes = controlled
+        target_axes = [axes[self._axis(target)] for target in targets]
+        k = len(targets)
+        slices = []  # type: List[np.ndarray]
+        for basis in range(2 ** k):
+            index = [slice(None)] * view.ndim  # type: List[Any]
+            for position, axis in enumerate(target_axes):
+                index[axis] = (basis >> (k - 1 - position)) & 1
+            slices.append(view[tuple(index) + (Ellipsis,)])
+        old = {column: slices[column].copy() for _, row in rows for column, _ in row}
+        for basis, row in rows:
+            target = slices[basis]
+            (column, value), rest = row[0], row[1:]
+            np.multiply(old[column], value, out=target)
+            for column, value in rest:
+                target += value * old[column]
+
+    def _pairs(self, targets: List[int],
+               controls: List[Tuple[int, bool]]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """The views of the |01> and |10> states of two target qubits, where the controls hold."""
+        if len(targets) != 2:
+            raise RuntimeError("Expected two wires")
+        controlled = self._controlled(controls)
+        if controlled is None:
+            return None
+        view, axes = controlled
+        index01 = [slice(None)] * view.ndim  # type: List[Any]
+        index10 = [slice(None)] * view.ndim  # type: List[Any]
+        a, b = axes[self._axis(targets[0])], axes[self._axis(targets[1])]
+        index01[a], index01[b] = 0, 1
+        index10[a], index10[b] = 1, 0
+        return view[tuple(index01) + (Ellipsis,)], view[tuple(index10) + (Ellipsis,)]
+
+    def _swap(self, targets: List[int], controls: List[Tuple[int, bool]], _) -> None:
+        pairs = self._pairs(targets, controls)
+        if pairs is not None:
+            v01, v10 = pairs
+            old = v01.copy()
+            v01[...] = v10
+            v10[...] = old
+
+    def _w(self, targets: List[int], controls: List[Tuple[int, bool]], _) -> None:
+        """|01> -> (|01> + |10>)/√2 and |10> -> (|01> - |10>)/√2."""
+        pairs = self._pairs(targets, controls)
+        if pairs is not None:
+            v01, v10 = pairs
+            old = v01.copy()
+            v01 += v10
+            v01 *= SQRT_HALF
+            v10 -= old
+            v10 *= -SQRT_HALF
+
+    def _phase(self, targets: List[int], controls: List[Tuple[int, bool]], phase: complex) -> None:
+        controlled = self._controlled(controls)
+        if controlled is not None:
+            controlled[0][...] *= phase
+
+    def _init(self, targets: List[int], controls: List[Tuple[int, bool]], value: bool) -> None:
+        wire_id = targets[0]
+        if wire_id in self._qubits or wire_id in self._bits:
+            raise RuntimeError("Wire is initialized twice")
+        state = np.zeros(self._state.shape + (2,), dtype=complex)
+        state[..., int(value)] = self._state
+        self._state = state
+        self._qubits.append(wire_id)
+
+    def _remove(self, wire_id: int, value: int) -> None:
+        """Remove a qubit, keeping the part of the state where it has value."""
+        axis = self._axis(wire_id)
+        self._state = np.take(self._state, value, axis=axis)
+        del self._qubits[axis]
+
+    def _probability(self, wire_id: int) -> float:
+        """The probability that a qubit is |1>."""
+        one = np.take(self._state, 1, axis=self._axis(wire_id))
+        total = np.vdot(self._state, self._state).real
+        return np.vdot(one, one).real / total if total else 0
+
+    def _term(self, targets: List[int], controls: List[Tuple[int, bool]], value: bool) -> None:
+        probability = self._probability(targets[0])
+        if (probability if not value else 1 - probability) > self.tolerance:
+            raise RuntimeError("QTerm{:d} of a qubit that is not in state |{:d}>".format(value, value))
+        self._remove(targets[0], int(value))
+
+    def _sample(self, wire_id: int) -> bool:
+        """Measure a qubit and remove it from the state."""
+        probability = self._probability(wire_id)
+        outcome = self._random.random() < probability
+        self._remove(wire_id, int(outcome))
+        self._state /= math.sqrt(probability if outcome else 1 - probability)
+        return outcome
@@ -0,0 +1,213 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Stream the gates of a Quipper ASCII file one line at a time.
+
+Every line of a Quipper file holds a single gate or header, so the file can be parsed line by line
+without keeping the text or the list of gates in memory.
+"""
+
+import hashlib
+import mmap
+import os
+import tempfile
+from typing import *
+
+from lark.exceptions import UnexpectedInput
+
+from quippy import binary
+from quippy.parser import quipper_parser
+from quippy.transformer import Gate, TypeAssignment, Subroutine_Control, Circuit, Subroutine, Start, \
+    CompactQuipperTransformer
+
+Inputs = NamedTuple('Inputs', [
+    ('inputs', List[TypeAssignment])
+    ])
+
+Outputs = NamedTuple('Outputs', [
+    ('outputs', List[TypeAssignment])
+    ])
+
+SubroutineHeader = NamedTuple('SubroutineHeader', [
+    ('name', str),
+    ('shape', str),
+    ('controllable', Subroutine_Control)
+    ])
+
+Event = Union[Inputs, Outputs, SubroutineHeader, Gate]
+
+"""The prefixes of all lines that are not gates."""
+HEADERS = ('Inputs:', 'Outputs:', 'Subroutine:', 'Shape:', 'Controllable:')
+"""The prefixes of HEADERS, for lines given as bytes."""
+BINARY_HEADERS = tuple(header.encode() for header in HEADERS)
+
+
+def iter_gates(fileobj: Iterable[str], parser='lalr', first_line=1, compact=False) -> Iterator[Event]:
+    """Parse a Quipper file into a stream of events, reading one line at a time.
+
+    Every circuit is reported as an Inputs event, followed by its gates and an Outputs event.
+    The subroutines following the main circuit are each preceded by a SubroutineHeader.
+    Memory use does not depend on the number of gates, as long as the consumer does not keep them.
+
+    :param fileobj: An open text or binary file, or any other iterable of lines.
+        With the fast parser only the string literals of binary gate lines are decoded.
+    :param parser: The parser engine for the lines, either 'lalr' or 'fast'.
+    :param first_line: The line number of the first line, for error messages.
+    :param compact: Whether to share wires and controls like the CompactQuipperTransformer.
+    :return: An iterator over the events in the file in order.
+    """
+    binary_gate_parser = None
+    if parser == 'fast':
+        from quippy.fast import FastGateParser, FastArityParser
+        gate_parser = FastGateParser(compact=compact)
+        binary_gate_parser = FastGateParser(binary=True, compact=compact)
+        arity_parser = FastArityParser(compact=compact)
+    else:
+        # The parsers with the default transformer are shared, those for a given transformer are not.
+        options = {'transformer': CompactQuipperTransformer()} if compact else {}
+        gate_parser = quipper_parser(start='gate', parser=parser, **options)
+        arity_parser = quipper_parser(start='arity', parser=parser, **options)
+    header = {}  # type: Dict[str, str]
+
+    for line_number, line in enumerate(fileobj, start=first_line):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            if isinstance(line, bytes):
+                if binary_gate_parser is not None and not line.startswith(BINARY_HEADERS):
+                    yield binary_gate_parser.parse(line)
+                    continue
+                line = line.decode()
+
+            if line.startswith('Inputs:'):
+                yield Inputs(arity_parser.parse(line[len('Inputs:'):] + '\n'))
+            elif line.startswith('Outputs:'):
+                yield Outputs(arity_parser.parse(line[len('Outputs:'):] + '\n'))
+            elif line.startswith('Subroutine:'):
+                header = {'name': string_literal(line[len('Subroutine:'):])}
+            elif line.startswith('Shape:'):
+                header['shape'] = string_literal(line[len('Shape:'):])
+            elif line.startswith('Controllable:'):
+                yield SubroutineHeader(name=header['name'], shape=header['shape'],
+                                       controllable=Subroutine_Control[
+                                           line[len('Controllable:'):].strip()])
+            else:
+                yield gate_parser.parse(line)
+        except (UnexpectedInput, KeyError, ValueError) as e:
+            raise RuntimeError("Failed to parse line {}: {!s}".format(
+                line_number, line.decode() if isinstance(line, bytes) else line)) from e
+
+
+def parse_file(path: Union[str, 'os.PathLike'], parser='fast',
+               cache: Optional[Union[str, 'os.PathLike']] = None) -> Start:
+    """Parse a Quipper file by memory-mapping it, without reading the whole text into memory.
+
+    The file is scanned line by line as bytes and, with the fast parser,
+    only the string literals such as gate and subroutine names are decoded.
+
+    :param path: The path of the Quipper file.
+    :param parser: The parser engine for the lines, either 'fast' or 'lalr'.
+    :param cache: A directory of parsed files in the format of quippy.binary,
+        named by the SHA-256 hash of their text. If the file was parsed before, it is loaded from the cache
+        instead of parsed, otherwise the parsed file is added to the cache. The directory is created if needed,
+        and a directory that can not be written to is ignored.
+    :return: The parsed Start object.
+    """
+    with open(str(path), 'rb') as quipper_file:
+        if os.fstat(quipper_file.fileno()).st_size == 0:
+            raise RuntimeError("Empty file: {}".format(path))
+        with mmap.mmap(quipper_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            cache_path = None
+            if cache is not None:
+                cache_path = os.path.join(str(cache), hashlib.sha256(mapped).hexdigest() + '.qpyb')
+                try:
+                    with open(cache_path, 'rb') as cached:
+                        return binary.load(cached)
+                except (OSError, ValueError):
+                    # A missing or corrupt entry is parsed again and replaced.
+                    pass
+            start = build_start(iter_gates(iter(mapped.readline, b''), parser=parser))
+    if start.circuit is None:
+        raise RuntimeError("Missing the main circuit: {}".format(path))
+    if cache_path is not None:
+        try:
+            _write_cache(cache_path, binary.dumps(start))
+        except OSError:
+            # Caching is only an optimization, the file is parsed either way.
+            pass
+    return start
+
+
+def _write_cache(path: str, data: bytes) -> None:
+    """Atomically write a cache entry, so concurrent readers never see a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def build_start(events: Iterable[Event]) -> Start:
+    """Collect a stream of events into a Start object.
+
+    The circuit of the result is None if the events only contain subroutines.
+    """
+    circuit = None  # type: Optional[Circuit]
+    subroutines = []  # type: List[Subroutine]
+    header = None  # type: Optional[SubroutineHeader]
+    inputs = None  # type: Optional[List[TypeAssignment]]
+    gates = []  # type: List[Gate]
+
+    for event in events:
+        if isinstance(event, SubroutineHeader):
+            header = event
+        elif isinstance(event, Inputs):
+            inputs = event.inputs
+            gates = []
+        elif isinstance(event, Outputs):
+            if inputs is None:
+                raise RuntimeError("Outputs without Inputs")
+            parsed = Circuit(inputs=inputs, gates=gates, outputs=event.outputs)
+            if header is not None:
+                subroutines.append(Subroutine(name=header.name, shape=header.shape,
+                                              controllable=header.controllable, circuit=parsed))
+            elif circuit is None and not subroutines:
+                circuit = parsed
+            else:
+                raise RuntimeError("A circuit follows the main circuit without a subroutine header")
+            header = None
+            inputs = None
+        elif inputs is None:
+            raise RuntimeError("Gate outside of a circuit: {}".format(event))
+        else:
+            gates.append(event)
+
+    if inputs is not None:
+        raise RuntimeError("Missing Outputs of the last circuit")
+    return Start(circuit=circuit, subroutines=subroutines)
+
+
+def string_literal(text: str) -> str:
+    """Strip the quotes from a string literal, like QuipperTransformer.string."""
+    text = text.strip()
+    if len(text) < 2 or text[0] != '"' or text[-1] != '"':
+        raise ValueError("Expected a string literal: {}".format(text))
+    return text[1:-1]
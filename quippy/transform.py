@@ -0,0 +1,213 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Transformations of parsed circuits."""
+
+from typing import *
+
+from quippy.transformer import Wire, Control, TypeAssignment, Gate, QRot, GPhase, CGate, QMeas, QDiscard, \
+    CDiscard, DTerm, SubroutineCall, Comment, Circuit, Start, INVERSES
+
+
+def inline(start: Start, max_gates: Optional[int] = None) -> Iterator[Gate]:
+    """Expand all subroutine calls of the main circuit, giving a flat stream of gates.
+
+    The gates are generated one at a time, so large expansions do not need to fit in memory.
+    The inputs of a call are mapped to the input wires of the subroutine, and the output wires
+    of the subroutine become the outputs of the call. Wires that are only used within a subroutine
+    get an index above all wires of the main circuit, or the index of a wire that is no longer used,
+    such as a local wire of an earlier call or an input of a call that is not one of its outputs.
+    Wire 0 is never reused, since a negative control on it can not be written.
+    A negative control that maps to wire 0 of the main circuit raises a RuntimeError.
+    Inverted calls give the inverse of every gate in reverse order,
+    the controls of a call are added to every gate that is not marked 'with nocontrol',
+    and calls with repetitions are unrolled.
+
+    :param start: The parsed Quipper file.
+    :param max_gates: The maximum number of gates of the result.
+        The size is computed before any gate is generated, and a RuntimeError is raised if it is larger.
+    :return: An iterator over the gates of the flat main circuit.
+    """
+    return _Inliner(start, max_gates).gates()
+
+
+def inline_circuit(start: Start, max_gates: Optional[int] = None) -> Circuit:
+    """Expand all subroutine calls of the main circuit into a flat circuit, see inline."""
+    inliner = _Inliner(start, max_gates)
+    gates = list(inliner.gates())
+    outputs = [TypeAssignment(wire=Wire(inliner.main_wire(assignment.wire.i)), type=assignment.type)
+               for assignment in start.circuit.outputs]
+    return Circuit(inputs=start.circuit.inputs, gates=gates, outputs=outputs)
+
+
+class _Inliner:
+    def __init__(self, start: Start, max_gates: Optional[int]):
+        if start.circuit is None:
+            raise RuntimeError("Missing the main circuit")
+        self._start = start
+        self._subroutines = {subroutine.name: subroutine.circuit for subroutine in start.subroutines}
+        self._sizes = {}  # type: Dict[str, int]
+        size = self._size(start.circuit.gates, set())
+        if max_gates is not None and size > max_gates:
+            raise RuntimeError("Inlining gives {} gates, more than max_gates={}".format(size, max_gates))
+
+        # The wire of the result that holds every wire of the main circuit.
+        main_wires = {assignment.wire.i for assignment in start.circuit.inputs + start.circuit.outputs}
+        for gate in start.circuit.gates:
+            main_wires.update(_local_wires(gate))
+        self._main = {wire: wire for wire in main_wires}  # type: Dict[int, int]
+        self._next_wire = max(main_wires, default=-1) + 1
+        self._free = []  # type: List[int]
+
+    def main_wire(self, wire: int) -> int:
+        """The wire of the result that holds a wire of the main circuit."""
+        return self._main[wire]
+
+    def gates(self) -> Iterator[Gate]:
+        return self._expand(self._start.circuit.gates, self._main, [], False)
+
+    def _size(self, gates: List[Gate], active: Set[str]) -> int:
+        """The number of gates when inlined, which also checks that all subroutines exist."""
+        size = 0
+        for gate in gates:
+            if not isinstance(gate, SubroutineCall):
+                size += 1
+                continue
+            if gate.name not in self._sizes:
+                if gate.name not in self._subroutines:
+                    raise RuntimeError("Unknown subroutine: {}".format(gate.name))
+                if gate.name in active:
+                    raise RuntimeError("Recursive subroutine: {}".format(gate.name))
+                active.add(gate.name)
+                self._sizes[gate.name] = self._size(self._subroutines[gate.name].gates, active)
+                active.remove(gate.name)
+            size += gate.repetitions * self._sizes[gate.name]
+        return size
+
+    def _wire(self, wires: Dict[int, int], wire: int) -> int:
+        """The wire of the result of a wire in a frame, allocating a free wire if it is new."""
+        if wire not in wires:
+            if self._free:
+                wires[wire] = self._free.pop()
+            else:
+                wires[wire] = self._next_wire
+                self._next_wire += 1
+        return wires[wire]
+
+    def _control(self, wires: Dict[int, int], control: List[Wire]) -> List[Wire]:
+        """Map controls, keeping negative controls negative."""
+        mapped = []
+        for wire in control:
+            if wire.i >= 0:
+                mapped.append(Wire(self._wire(wires, wire.i)))
+                continue
+            result = self._wire(wires, -wire.i)
+            if result == 0:
+                # Wire(-0) is Wire(0), which would flip the control to positive.
+                raise RuntimeError("Can not negatively control wire 0 of the result: {}".format(wire))
+            mapped.append(Wire(-result))
+        return mapped
+
+    def _expand(self, gates: List[Gate], wires: Dict[int, int], controls: List[Wire],
+                inverted: bool) -> Iterator[Gate]:
+        """Generate the gates of a frame, of which wires maps the wires to wires of the result."""
+        for gate in (reversed(gates) if inverted else gates):
+            if isinstance(gate, SubroutineCall):
+                yield from self._call(gate, wires, controls, inverted)
+            else:
+                yield self._map(invert_gate(gate) if inverted else gate, wires, controls)
+
+    def _call(self, call: SubroutineCall, wires: Dict[int, int], controls: List[Wire],
+              inverted: bool) -> Iterator[Gate]:
+        circuit = self._subroutines[call.name]
+        call_inputs, call_outputs = call.inputs, call.outputs
+        if inverted:
+            call_inputs, call_outputs = call_outputs, call_inputs
+        inverted = inverted != call.inverted
+        inputs, outputs = circuit.inputs, circuit.outputs
+        if inverted:
+            inputs, outputs = outputs, inputs
+        call_controls = self._control(wires, call.control.controlled)
+        if not call.control.no_control:
+            call_controls = controls + call_controls
+
+        for repetition in range(call.repetitions):
+            # The outputs of a repetition are the inputs of the next.
+            repetition_inputs = call_inputs if repetition == 0 else call_outputs
+            frame = {assignment.wire.i: self._wire(wires, wire.i)
+                     for assignment, wire in zip(inputs, repetition_inputs)}
+            yield from self._expand(circuit.gates, frame, call_controls, inverted)
+
+            output_wires = [self._wire(frame, assignment.wire.i) for assignment in outputs]
+            for wire in repetition_inputs:
+                wires.pop(wire.i, None)
+            for wire, output_wire in zip(call_outputs, output_wires):
+                wires[wire.i] = output_wire
+            self._free.extend(set(frame.values()).difference(output_wires, [0]))
+
+    def _map(self, gate: Gate, wires: Dict[int, int], controls: List[Wire]) -> Gate:
+        """Map the wires of a gate to the result and add the controls of the frame."""
+        fields = {}  # type: Dict[str, Any]
+        for field in ('wire', 'wires', 'anchors'):
+            value = getattr(gate, field, None)
+            if isinstance(value, Wire):
+                fields[field] = Wire(self._wire(wires, value.i))
+            elif value is not None:
+                fields[field] = [Wire(self._wire(wires, wire.i)) for wire in value]
+        if isinstance(gate, Comment) and gate.wire_comments is not None:
+            fields['wire_comments'] = [(Wire(self._wire(wires, wire.i)), text)
+                                       for wire, text in gate.wire_comments]
+        control = getattr(gate, 'control', None)
+        if control is not None:
+            controlled = self._control(wires, control.controlled)
+            if not control.no_control:
+                controlled = controlled + controls
+            fields['control'] = Control(controlled=controlled, no_control=control.no_control)
+        elif controls and isinstance(gate, (QRot, CGate)):
+            raise RuntimeError("Can not control gate: {}".format(gate))
+        return gate._replace(**fields)
+
+
+def invert_gate(gate: Gate) -> Gate:
+    """The gate that undoes a gate, as it appears in an inverted subroutine.
+
+    Raises a RuntimeError for measurements and discards, which can not be inverted.
+    """
+    if hasattr(gate, 'inverted'):
+        return gate._replace(inverted=not gate.inverted)
+    if isinstance(gate, GPhase):
+        return gate._replace(timestep=-gate.timestep)
+    if type(gate) in INVERSES:
+        return INVERSES[type(gate)](*gate)
+    if isinstance(gate, (QMeas, QDiscard, CDiscard, DTerm)):
+        raise RuntimeError("Can not invert gate: {}".format(gate))
+    # The remaining gates, CNot and CSwap, are their own inverse.
+    return gate
+
+
+def _local_wires(gate: Gate) -> Iterator[int]:
+    """The wires of a gate in the circuit that contains it."""
+    for field in ('wire', 'wires', 'inputs', 'outputs', 'anchors'):
+        value = getattr(gate, field, None)
+        if isinstance(value, Wire):
+            yield value.i
+        elif value is not None:
+            for wire in value:
+                yield wire.i
+    for wire, _ in getattr(gate, 'wire_comments', None) or ():
+        yield wire.i
+    control = getattr(gate, 'control', None)
+    if control is not None:
+        for wire in control.controlled:
+            yield abs(wire.i)
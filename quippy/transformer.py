@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import enum
+import sys
 from enum import Enum
 from typing import *
 
@@ -27,7 +28,7 @@ class QuipperTransformer(Transformer):
         return float(t[0])
 
     def string(self, t):
-        return str(t[0][1:-1])
+        return t[0][1:-1]
 
     def wire(self, t):
         return Wire(t[0])
@@ -47,52 +48,15 @@ class QuipperTransformer(Transformer):
         return list(t)
 
     def qgate(self, t):
-        ops = QGate_Op
-        n = t[0]
-        op = None  # type: QGate_Op
-        # "X" is used in simcount.
-        if n == "not" or n == "x" or n == "X":
-            op = ops.Not
-        elif n == "H":
-            op = ops.H
-        elif n == "multinot":
-            op = ops.MultiNot
-        elif n == "Y":
-            op = ops.Y
-        elif n == "Z":
-            op = ops.Z
-        elif n == "S":
-            op = ops.S
-        elif n == "E":
-            op = ops.E
-        elif n == "T":
-            op = ops.T
-        elif n == "V":
-            op = ops.V
-        elif n == "swap":
-            op = ops.Swap
-        elif n == "omega":
-            op = ops.Omega
-        elif n == "iX":
-            op = ops.IX
-        elif n == "W":
-            op = ops.W
-        else:
-            raise RuntimeError("Unknown QGate operation: {}".format(n))
-
+        op = QGATE_NAMES.get(t[0])
+        if op is None:
+            raise RuntimeError("Unknown QGate operation: {}".format(t[0]))
         return QGate(op=op, inverted=len(t[1].children) > 0, wires=t[2], control=t[3])
 
     def qrot(self, t):
-        ops = QRot_Op
-        n = t[0]
-        op = None  # type: QRot.Op
-        if n == "exp(-i%Z)":
-            op = ops.ExpZt
-        elif n == "R(2pi/%)":
-            op = ops.R
-        else:
-            raise RuntimeError("Unkown QRot operation: {}".format(n))
-
+        op = QROT_NAMES.get(t[0])
+        if op is None:
+            raise RuntimeError("Unkown QRot operation: {}".format(t[0]))
         return QRot(
             op=op,
             timestep=t[1],
@@ -100,6 +64,24 @@ class QuipperTransformer(Transformer):
             wire=t[3]
             )
 
+    def gphase(self, t):
+        return GPhase(timestep=t[0], control=t[1], anchors=t[2])
+
+    def cnot(self, t):
+        return CNot(wire=t[0], control=t[1])
+
+    def cgate(self, t):
+        return CGate(name=sys.intern(t[0]), inverted=len(t[1].children) > 0, wires=t[2])
+
+    def cswap(self, t):
+        return CSwap(wires=[t[0], t[1]], control=t[2])
+
+    def qprep(self, t):
+        return QPrep(wire=t[0])
+
+    def qunprep(self, t):
+        return QUnprep(wire=t[0])
+
     def qinit(self, t):
         return QInit(value=True if t[0] == 'QInit1' else False, wire=t[1])
 
@@ -121,6 +103,9 @@ class QuipperTransformer(Transformer):
     def cdiscard(self, t):
         return CDiscard(wire=t[0])
 
+    def dterm(self, t):
+        return DTerm(value=True if t[0] == 'DTerm1' else False, wire=t[1])
+
     def subroutine_call(self, t):
         repetitions = 1
         if isinstance(t[0], int):
@@ -129,8 +114,8 @@ class QuipperTransformer(Transformer):
 
         return SubroutineCall(
             repetitions=repetitions,
-            name=t[0],
-            shape=t[1],
+            name=sys.intern(t[0]),
+            shape=sys.intern(t[1]),
             inverted=len(t[2].children) > 0,
             inputs=t[3],
             outputs=t[4],
@@ -186,6 +171,41 @@ Control = NamedTuple('Control', [
     ('no_control', bool)
     ])
 
+_WIRES = {}  # type: Dict[int, Wire]
+
+
+def interned_wire(i: int) -> Wire:
+    """Return the shared Wire object for index i."""
+    wire = _WIRES.get(i)
+    if wire is None:
+        wire = _WIRES.setdefault(i, Wire(i))
+    return wire
+
+
+"""Shared uncontrolled Controls of the compact object model. Their lists must not be mutated."""
+EMPTY_CONTROL = Control(controlled=[], no_control=False)
+EMPTY_NO_CONTROL = Control(controlled=[], no_control=True)
+
+
+class CompactQuipperTransformer(QuipperTransformer):
+    """A QuipperTransformer that shares objects between gates to reduce memory use.
+
+    Wires are interned, so every index has a single Wire object,
+    and the Control of uncontrolled gates is one of the shared EMPTY_CONTROL and EMPTY_NO_CONTROL.
+    The parsed objects are equal to those of the QuipperTransformer,
+    but the controlled lists of uncontrolled gates must not be mutated.
+    """
+
+    def wire(self, t):
+        return interned_wire(int(t[0]))
+
+    def control_app(self, t):
+        if not t:
+            return EMPTY_CONTROL
+        if len(t) == 1 and t[0] == "with nocontrol":
+            return EMPTY_NO_CONTROL
+        return super().control_app(t)
+
 
 @enum.unique
 class TypeAssignment_Type(Enum):
@@ -200,7 +220,8 @@ TypeAssignment = NamedTuple('TypeAssignment', [
 
 
 class Gate:
-    pass
+    # Gates have no per-instance __dict__, only the fields of their NamedTuple.
+    __slots__ = ()
 
 
 @enum.unique
@@ -224,13 +245,44 @@ class QGate_Op(Enum):
     IX = 13  # iX
 
 
+"""The QGate_Op of every gate name, extended by register_qgate."""
+QGATE_NAMES = {
+    'not': QGate_Op.Not,
+    'H': QGate_Op.H,
+    'multinot': QGate_Op.MultiNot,
+    'Y': QGate_Op.Y,
+    'Z': QGate_Op.Z,
+    'S': QGate_Op.S,
+    'E': QGate_Op.E,
+    'T': QGate_Op.T,
+    'V': QGate_Op.V,
+    'swap': QGate_Op.Swap,
+    'omega': QGate_Op.Omega,
+    'iX': QGate_Op.IX,
+    'W': QGate_Op.W,
+    }  # type: Dict[str, QGate_Op]
+
+
+def register_qgate(name: str, op: QGate_Op) -> None:
+    """Parse QGate lines with the given name as op, for example to support an alias of a gate.
+
+    The registration applies to all parsers, including the fast parser.
+    """
+    QGATE_NAMES[sys.intern(name)] = op
+
+
+register_qgate('x', QGate_Op.Not)
+# "X" is used in simcount.
+register_qgate('X', QGate_Op.Not)
+
+
 class QGate(Gate, NamedTuple('QGate', [
     ('op', QGate_Op),
     ('inverted', bool),
     ('wires', List[Wire]),
     ('control', Control)
     ])):
-    pass
+    __slots__ = ()
 
 
 @enum.unique
@@ -243,59 +295,136 @@ class QRot_Op(Enum):
     R = 2  # Apply a rotation by angle 2π/i/\/2[sup /n/] about the /z/-axis.
 
 
+"""The QRot_Op of every rotation name, extended by register_qrot."""
+QROT_NAMES = {
+    'exp(-i%Z)': QRot_Op.ExpZt,
+    'R(2pi/%)': QRot_Op.R,
+    }  # type: Dict[str, QRot_Op]
+
+
+def register_qrot(name: str, op: QRot_Op) -> None:
+    """Parse QRot lines with the given name as op.
+
+    The registration applies to all parsers, including the fast parser.
+    """
+    QROT_NAMES[sys.intern(name)] = op
+
+
 class QRot(Gate, NamedTuple('QRot', [
     ('op', QRot_Op),
     ('inverted', bool),
     ('timestep', float),
     ('wire', Wire)
     ])):
-    pass
+    __slots__ = ()
+
+
+class GPhase(Gate, NamedTuple("GPhase", [
+    ("timestep", float),
+    ("control", Control),
+    ("anchors", List[Wire])
+    ])):
+    """A global phase of exp(iπt), anchored at some wires."""
+    __slots__ = ()
+
+
+class CNot(Gate, NamedTuple("CNot", [
+    ("wire", Wire),
+    ("control", Control)
+    ])):
+    """Classical not gate."""
+    __slots__ = ()
+
+
+class CGate(Gate, NamedTuple("CGate", [
+    ("name", str),
+    ("inverted", bool),
+    ("wires", List[Wire])
+    ])):
+    """A named classical gate, the first wire is the output and the others are its inputs."""
+    __slots__ = ()
+
+
+class CSwap(Gate, NamedTuple("CSwap", [
+    ("wires", List[Wire]),
+    ("control", Control)
+    ])):
+    """Classical swap gate."""
+    __slots__ = ()
+
+
+class QPrep(Gate, NamedTuple("QPrep", [
+    ("wire", Wire)
+    ])):
+    """Prepare a quantum wire from a classical wire."""
+    __slots__ = ()
+
+
+class QUnprep(Gate, NamedTuple("QUnprep", [
+    ("wire", Wire)
+    ])):
+    """Turn a quantum wire into a classical wire, without measuring it."""
+    __slots__ = ()
 
 
 class QInit(Gate, NamedTuple("QInit", [
     ("value", bool),
     ("wire", Wire)
     ])):
-    pass
+    __slots__ = ()
 
 
 class CInit(Gate, NamedTuple("CInit", [
     ("value", bool),
     ("wire", Wire)
     ])):
-    pass
+    __slots__ = ()
 
 
 class QTerm(Gate, NamedTuple("QTerm", [
     ("value", bool),
     ("wire", Wire)
     ])):
-    pass
+    __slots__ = ()
 
 
 class CTerm(Gate, NamedTuple("CTerm", [
     ("value", bool),
     ("wire", Wire)
     ])):
-    pass
+    __slots__ = ()
+
+
+"""The gate type that a gate becomes when its circuit is inverted, for the gates that change type."""
+INVERSES = {
+    QInit: QTerm, QTerm: QInit, CInit: CTerm, CTerm: CInit, QPrep: QUnprep, QUnprep: QPrep,
+    }  # type: Dict[type, type]
 
 
 class QMeas(Gate, NamedTuple("QMeas", [
     ("wire", Wire)
     ])):
-    pass
+    __slots__ = ()
 
 
 class QDiscard(Gate, NamedTuple("QDiscard", [
     ("wire", Wire)
     ])):
-    pass
+    __slots__ = ()
 
 
 class CDiscard(Gate, NamedTuple("CDiscard", [
     ("wire", Wire)
     ])):
-    pass
+    __slots__ = ()
+
+
+class DTerm(Gate, NamedTuple("DTerm", [
+    ("value", bool),
+    ("wire", Wire)
+    ])):
+    """Discard a classical wire that is asserted to hold the given value."""
+    __slots__ = ()
 
 
 class SubroutineCall(Gate, NamedTuple("SubroutineCall", [
@@ -307,7 +436,7 @@ class SubroutineCall(Gate, NamedTuple("SubroutineCall", [
     ("outputs", List[Wire]),
     ("control", Control)
     ])):
-    pass
+    __slots__ = ()
 
 
 class Comment(Gate, NamedTuple("Comment", [
@@ -315,7 +444,7 @@ class Comment(Gate, NamedTuple("Comment", [
     ("inverted", bool),
     ("wire_comments", List[Tuple[Wire, str]])
     ])):
-    pass
+    __slots__ = ()
 
 
 Circuit = NamedTuple("Circuit", [
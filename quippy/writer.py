@@ -0,0 +1,196 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Write parsed circuits back to the Quipper ASCII format accepted by quipper.g.
+
+Lines are collected and written to the file in chunks, so that writing large circuits
+does not call write for every gate.
+"""
+
+import io
+from typing import *
+
+from quippy.stream import Event, Inputs, Outputs, SubroutineHeader
+from quippy.transformer import Wire, Control, TypeAssignment, Gate, QGate_Op, QGate, QRot_Op, QRot, \
+    GPhase, CNot, CGate, CSwap, QPrep, QUnprep, QInit, CInit, QTerm, CTerm, QMeas, QDiscard, CDiscard, \
+    DTerm, SubroutineCall, Comment, Circuit, Start, QGATE_NAMES, QROT_NAMES
+
+"""The number of lines that are joined into a single write."""
+CHUNK_LINES = 4096
+
+
+def format_gate(gate: Gate) -> str:
+    """Format a gate as a line of Quipper ASCII, without the newline."""
+    try:
+        formatter = _FORMATTERS[type(gate)]
+    except KeyError:
+        raise ValueError("Can not write gate: {}".format(gate)) from None
+    return formatter(gate)
+
+
+def write_events(events: Iterable[Event], fileobj: IO[str]) -> None:
+    """Write a stream of events, such as given by quippy.stream.iter_gates, to a text file."""
+    lines = []  # type: List[str]
+    append = lines.append
+    formatters = _FORMATTERS
+    for event in events:
+        formatter = formatters.get(type(event))
+        if formatter is not None:
+            append(formatter(event))
+        elif isinstance(event, Inputs):
+            append('Inputs: ' + _arity(event.inputs))
+        elif isinstance(event, Outputs):
+            append('Outputs: ' + _arity(event.outputs))
+        elif isinstance(event, SubroutineHeader):
+            append('\nSubroutine: "{}"\nShape: "{}"\nControllable: {}'.format(
+                event.name, event.shape, event.controllable.name))
+        else:
+            append(format_gate(event))
+        if len(lines) >= CHUNK_LINES:
+            lines.append('')
+            fileobj.write('\n'.join(lines))
+            lines.clear()
+    if lines:
+        lines.append('')
+        fileobj.write('\n'.join(lines))
+
+
+def write_circuit(circuit: Circuit, fileobj: IO[str]) -> None:
+    """Write a circuit to a text file."""
+    write_events(_circuit_events(circuit), fileobj)
+
+
+def write_start(start: Start, fileobj: IO[str]) -> None:
+    """Write a parsed Quipper file, the main circuit followed by its subroutines, to a text file."""
+    write_events(start_events(start), fileobj)
+
+
+def dumps(start: Start) -> str:
+    """Format a parsed Quipper file as Quipper ASCII."""
+    text = io.StringIO()
+    write_start(start, text)
+    return text.getvalue()
+
+
+def start_events(start: Start) -> Iterator[Event]:
+    """The events of a parsed Quipper file, in the order that iter_gates gives them."""
+    yield from _circuit_events(start.circuit)
+    for subroutine in start.subroutines:
+        yield SubroutineHeader(name=subroutine.name, shape=subroutine.shape,
+                               controllable=subroutine.controllable)
+        yield from _circuit_events(subroutine.circuit)
+
+
+def _circuit_events(circuit: Circuit) -> Iterator[Event]:
+    yield Inputs(circuit.inputs)
+    yield from circuit.gates
+    yield Outputs(circuit.outputs)
+
+
+def _arity(assignments: List[TypeAssignment]) -> str:
+    return ', '.join('{}:{}'.format(assignment.wire.i, assignment.type.name) for assignment in assignments)
+
+
+# The start of the line of every operation, built on first use from the first registered name.
+_QGATE_PREFIXES = {}  # type: Dict[QGate_Op, str]
+_QROT_PREFIXES = {}  # type: Dict[QRot_Op, str]
+
+
+def _prefix(prefixes: Dict, registry: Dict, op, template: str) -> str:
+    prefix = prefixes.get(op)
+    if prefix is None:
+        name = next(name for name, registered in registry.items() if registered == op)
+        prefix = prefixes[op] = template.format(name)
+    return prefix
+
+
+def _wires(wires: List[Wire]) -> str:
+    return ','.join([str(wire.i) for wire in wires])
+
+
+def _control(control: Control) -> str:
+    if not control.controlled and not control.no_control:
+        return ''
+    text = ''
+    if control.controlled:
+        text = ' with controls=[' + ','.join(['{:+d}'.format(wire.i) for wire in control.controlled]) + ']'
+    if control.no_control:
+        text += ' with nocontrol'
+    return text
+
+
+def _inversion(inverted: bool) -> str:
+    return '*' if inverted else ''
+
+
+def _qgate(gate: QGate) -> str:
+    return (_prefix(_QGATE_PREFIXES, QGATE_NAMES, gate.op, 'QGate["{}"]') + ('*(' if gate.inverted else '(')
+            + _wires(gate.wires) + ')' + _control(gate.control))
+
+
+def _qrot(gate: QRot) -> str:
+    return '{}{!r}]{}({})'.format(_prefix(_QROT_PREFIXES, QROT_NAMES, gate.op, 'QRot["{}",'),
+                                  float(gate.timestep), _inversion(gate.inverted), gate.wire.i)
+
+
+def _gphase(gate: GPhase) -> str:
+    return 'Gphase() with t={!r}{} with anchors=[{}]'.format(float(gate.timestep), _control(gate.control),
+                                                           _wires(gate.anchors))
+
+
+def _cgate(gate: CGate) -> str:
+    return 'CGate["{}"]{}({})'.format(gate.name, _inversion(gate.inverted), _wires(gate.wires))
+
+
+def _subroutine_call(gate: SubroutineCall) -> str:
+    return 'Subroutine{}["{}", shape "{}"]{} ({}) -> ({}){}'.format(
+        '(x{})'.format(gate.repetitions) if gate.repetitions != 1 else '', gate.name, gate.shape,
+        _inversion(gate.inverted), _wires(gate.inputs), _wires(gate.outputs), _control(gate.control))
+
+
+def _comment(gate: Comment) -> str:
+    return 'Comment["{}"]{}({})'.format(gate.comment, _inversion(gate.inverted), ', '.join(
+        '{}:"{}"'.format(wire.i, label) for wire, label in gate.wire_comments or ()))
+
+
+def _single_wire(name: str) -> Callable[[Gate], str]:
+    prefix = name + '('
+    return lambda gate: prefix + str(gate.wire.i) + ')'
+
+
+def _init_term(name: str) -> Callable[[Gate], str]:
+    prefixes = (name + '0(', name + '1(')
+    return lambda gate: prefixes[gate.value] + str(gate.wire.i) + ')'
+
+
+_FORMATTERS = {
+    QGate: _qgate,
+    QRot: _qrot,
+    GPhase: _gphase,
+    CNot: lambda gate: 'CNot({})'.format(gate.wire.i) + _control(gate.control),
+    CGate: _cgate,
+    CSwap: lambda gate: 'CSwap({})'.format(_wires(gate.wires)) + _control(gate.control),
+    QPrep: _single_wire('QPrep'),
+    QUnprep: _single_wire('QUnprep'),
+    QInit: _init_term('QInit'),
+    CInit: _init_term('CInit'),
+    QTerm: _init_term('QTerm'),
+    CTerm: _init_term('CTerm'),
+    QMeas: _single_wire('QMeas'),
+    QDiscard: _single_wire('QDiscard'),
+    CDiscard: _single_wire('CDiscard'),
+    DTerm: _init_term('DTerm'),
+    SubroutineCall: _subroutine_call,
+    Comment: _comment,
+    }  # type: Dict[type, Callable[[Gate], str]]
@@ -97,8 +97,6 @@ setup(
 
         # Specify the Python versions you support here. In particular, ensure
         # that you indicate whether you support Python 2, Python 3 or both.
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         ],
@@ -110,7 +108,7 @@ setup(
     keywords='quipper parser quantum computing',  # Optional
 
     # The supported python versions
-    python_requires='>=3.5,<4',
+    python_requires='>=3.7,<4',
 
     # You can just specify package directories manually here if your project is
     # simple. Or you can use find_packages().
@@ -121,7 +119,7 @@ setup(
     #
     #   py_modules=["my_module"],
     #
-    packages=['quippy'],  # Required
+    packages=['quippy', 'quippy.sim'],  # Required
 
     # This field lists other packages that your project depends on to run.
     # Any package you put here will be installed by pip when your project is
@@ -141,10 +139,9 @@ setup(
     #
     # Similar to `install_requires` above, these must be valid existing
     # projects.
-    # extras_require={  # Optional
-    #     'dev': ['check-manifest'],
-    #     'test': ['coverage'],
-    # },
+    extras_require={  # Optional
+        'numpy': ['numpy'],
+        },
 
     # If there are data files included in your packages that need to be
     # installed, specify them here.
@@ -169,11 +166,11 @@ setup(
     #
     # For example, the following would provide a command called `sample` which
     # executes the function `main` from this package when invoked:
-    # entry_points={  # Optional
-    #     'console_scripts': [
-    #         'sample=sample:main',
-    #     ],
-    # },
+    entry_points={  # Optional
+        'console_scripts': [
+            'quippy=quippy.__main__:main',
+            ],
+        },
 
     # List additional URLs that are relevant to your project as a dict.
     #
@@ -0,0 +1,238 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from unittest import TestCase
+
+from quippy.analysis import count_resources, depth, T_WEIGHTS
+from quippy.parser import quipper_parser
+from quippy.transformer import *
+
+TEXT = '''Inputs: 0:Qbit, 1:Qbit
+QGate["T"](0)
+QGate["not"](1) with controls=[+0]
+Subroutine(x3)["A", shape "([Q],())"] (1) -> (1) with controls=[-0]
+Subroutine["A", shape "([Q],())"]* (0) -> (0)
+Comment["note"](0:"a")
+Outputs: 0:Qbit, 1:Qbit
+
+Subroutine: "A"
+Shape: "([Q],())"
+Controllable: yes
+Inputs: 0:Qbit
+QInit0(1)
+QGate["T"]*(0) with controls=[+1]
+QGate["H"](1) with nocontrol
+QTerm0(1)
+Subroutine(x2)["B", shape "([Q],())"] (0) -> (0)
+Outputs: 0:Qbit
+
+Subroutine: "B"
+Shape: "([Q],())"
+Controllable: yes
+Inputs: 0:Qbit
+QInit0(1)
+QInit0(2)
+QGate["not"](0)
+QDiscard(1)
+QDiscard(2)
+Outputs: 0:Qbit
+'''
+
+
+def nested_text(depth: int, repetitions: int) -> str:
+    """A circuit of depth nested subroutines that each call the next one repetitions times."""
+    lines = ['Inputs: 0:Qbit',
+             'Subroutine(x{})["S0", shape "([Q],())"] (0) -> (0)'.format(repetitions),
+             'Outputs: 0:Qbit']
+    for level in range(depth):
+        lines += ['', 'Subroutine: "S{}"'.format(level), 'Shape: "([Q],())"', 'Controllable: yes',
+                  'Inputs: 0:Qbit']
+        if level + 1 < depth:
+            lines.append('Subroutine(x{})["S{}", shape "([Q],())"] (0) -> (0)'.format(
+                repetitions, level + 1))
+        else:
+            lines.append('QGate["T"](0)')
+        lines.append('Outputs: 0:Qbit')
+    return '\n'.join(lines) + '\n'
+
+
+class TestCountResources(TestCase):
+    def test_counts(self):
+        resources = count_resources(quipper_parser().parse(TEXT))
+        self.assertEqual(5, resources.gates[QGate_Op.T])
+        self.assertEqual(1 + 8, resources.gates[QGate_Op.Not])
+        self.assertEqual(4, resources.gates[QGate_Op.H])
+        self.assertEqual(0, resources.gates[Comment])
+        self.assertEqual({'A': 4, 'B': 8}, dict(resources.calls))
+
+    def test_inverted(self):
+        """An inverted call turns initializations into terminations."""
+        resources = count_resources(quipper_parser().parse(TEXT))
+        # A and the two calls of B within it initialize five wires and terminate one.
+        self.assertEqual(3 * 5 + 1, resources.gates[QInit])
+        self.assertEqual(3 * 1 + 5, resources.gates[QTerm])
+
+    def test_controlled(self):
+        resources = count_resources(quipper_parser().parse(TEXT))
+        self.assertEqual(1 + 3 * 2, resources.controlled[QGate_Op.Not, 1])
+        self.assertEqual(3, resources.controlled[QGate_Op.T, 2])
+        self.assertEqual(1, resources.controlled[QGate_Op.T, 1])
+        self.assertEqual(0, resources.controlled[QGate_Op.H, 1])
+
+    def test_width(self):
+        resources = count_resources(quipper_parser().parse(TEXT))
+        # A uses one ancilla and B two more besides its input.
+        self.assertEqual(2 + 1 + 2, resources.width)
+
+    def test_nested(self):
+        """The counts of a circuit with 10^12 gates when inlined are computed without inlining."""
+        begin = time.perf_counter()
+        resources = count_resources(quipper_parser(parser='fast').parse(nested_text(4, 1000)))
+        self.assertLess(time.perf_counter() - begin, 1)
+        self.assertEqual(10 ** 12, resources.gates[QGate_Op.T])
+        self.assertEqual(10 ** 12, resources.calls['S3'])
+
+    def test_unknown_subroutine(self):
+        text = nested_text(2, 2).replace('"S1"', '"S2"', 1)
+        with self.assertRaises(RuntimeError):
+            count_resources(quipper_parser().parse(text))
+
+    def test_recursive_subroutine(self):
+        text = nested_text(2, 2).replace('QGate["T"](0)', 'Subroutine["S0", shape "([Q],())"] (0) -> (0)')
+        with self.assertRaises(RuntimeError):
+            count_resources(quipper_parser().parse(text))
+
+
+class TestDepth(TestCase):
+    def depth(self, text, weights=None):
+        start = quipper_parser().parse(text)
+        return depth(start.circuit, weights=weights, subroutines=start.subroutines)
+
+    def test_circuit(self):
+        text = '''Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+        QGate["H"](0)
+        QGate["T"](1)
+        QGate["not"](1) with controls=[+0]
+        Comment["note"](0:"a", 1:"b", 2:"c")
+        QGate["T"](2)
+        QGate["T"](2)
+        QGate["T"](0) with controls=[-2]
+        Outputs: 0:Qbit, 1:Qbit, 2:Qbit
+        '''
+        self.assertEqual(3, self.depth(text))
+        self.assertEqual(3, self.depth(text, weights=T_WEIGHTS))
+        self.assertEqual(0, self.depth('Inputs: 0:Qbit\nOutputs: 0:Qbit\n'))
+
+    def test_subroutine(self):
+        """A subroutine call is as deep as its inlined gates, with a fresh wire for every ancilla."""
+        subroutine = '''
+        Subroutine: "A"
+        Shape: "([Q,Q],())"
+        Controllable: yes
+        Inputs: 0:Qbit, 1:Qbit
+        QGate["T"](0)
+        QGate["T"](0)
+        QInit0(2)
+        QGate["H"](2)
+        QGate["not"](1) with controls=[+2]
+        QTerm0(2)
+        Outputs: 0:Qbit, 1:Qbit
+        '''
+        called = '''Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+        QGate["H"](1)
+        Subroutine(x2)["A", shape "([Q,Q],())"] (1,2) -> (1,2)
+        QGate["not"](0) with controls=[+2]
+        Outputs: 0:Qbit, 1:Qbit, 2:Qbit
+        ''' + subroutine
+        inlined = '''Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+        QGate["H"](1)
+        QGate["T"](1)
+        QGate["T"](1)
+        QInit0(3)
+        QGate["H"](3)
+        QGate["not"](2) with controls=[+3]
+        QTerm0(3)
+        QGate["T"](1)
+        QGate["T"](1)
+        QInit0(4)
+        QGate["H"](4)
+        QGate["not"](2) with controls=[+4]
+        QTerm0(4)
+        QGate["not"](0) with controls=[+2]
+        Outputs: 0:Qbit, 1:Qbit, 2:Qbit
+        '''
+        for weights in [None, T_WEIGHTS, {QGate_Op.H: 2, QGate_Op.Not: 1}]:
+            with self.subTest(weights=weights):
+                self.assertEqual(self.depth(inlined, weights), self.depth(called, weights))
+
+    def test_inverted_controlled(self):
+        subroutine = '''
+        Subroutine: "A"
+        Shape: "([Q,Q],())"
+        Controllable: yes
+        Inputs: 0:Qbit, 1:Qbit
+        QGate["T"](0)
+        QGate["H"](1) with nocontrol
+        QGate["T"](1)
+        Outputs: 1:Qbit, 0:Qbit
+        '''
+        called = '''Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+        QGate["H"](1)
+        Subroutine["A", shape "([Q,Q],())"]* (1,0) -> (1,0) with controls=[+2]
+        Outputs: 0:Qbit, 1:Qbit, 2:Qbit
+        ''' + subroutine
+        inlined = '''Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+        QGate["H"](1)
+        QGate["T"]*(1) with controls=[+2]
+        QGate["H"](1)
+        QGate["T"]*(0) with controls=[+2]
+        Outputs: 0:Qbit, 1:Qbit, 2:Qbit
+        '''
+        self.assertEqual(3, self.depth(inlined))
+        self.assertEqual(self.depth(inlined), self.depth(called))
+        self.assertEqual(2, self.depth(called, T_WEIGHTS))
+
+    def test_repetitions(self):
+        """Repeated calls, composed by squaring, are as deep as the same calls one after the other."""
+        subroutine = '''
+        Subroutine: "B"
+        Shape: "([Q,Q,Q],())"
+        Controllable: yes
+        Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+        QGate["T"](0)
+        QGate["H"](1) with controls=[+0]
+        QInit0(3)
+        QGate["T"](3) with nocontrol
+        QGate["not"](2) with controls=[+3]
+        QTerm0(3)
+        QGate["T"](2)
+        Outputs: 2:Qbit, 0:Qbit, 1:Qbit
+        '''
+        call = 'Subroutine{}["B", shape "([Q,Q,Q],())"] (1,2,3) -> (1,2,3) with controls=[-0]'
+        for repetitions in [1, 2, 7, 12]:
+            repeated = 'Inputs: 0:Qbit, 1:Qbit, 2:Qbit, 3:Qbit\n{}\nOutputs: 0:Qbit, 1:Qbit, 2:Qbit, 3:Qbit\n'
+            sequence = repeated.format('\n'.join([call.format('')] * repetitions)) + subroutine
+            repeated = repeated.format(call.format('(x{})'.format(repetitions))) + subroutine
+            for weights in [None, T_WEIGHTS]:
+                with self.subTest(repetitions=repetitions, weights=weights):
+                    self.assertEqual(self.depth(sequence, weights), self.depth(repeated, weights))
+
+    def test_nested(self):
+        start = quipper_parser(parser='fast').parse(nested_text(3, 100))
+        self.assertEqual(10 ** 6, depth(start.circuit, subroutines=start.subroutines))
+
+    def test_unknown_subroutine(self):
+        with self.assertRaises(RuntimeError):
+            depth(quipper_parser().parse(nested_text(1, 1)).circuit)
@@ -0,0 +1,127 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import io
+import os
+import tempfile
+from unittest import TestCase
+
+from quippy.__main__ import main
+from quippy import batch
+from quippy.batch import parse_many, parse_chunked, summarize
+from quippy.parser import quipper_parser
+
+TEXT = '''Inputs: 0:Qbit, 1:Qbit
+QGate["H"](0)
+QGate["not"](1) with controls=[+0]
+Outputs: 0:Qbit, 1:Qbit
+'''
+
+
+class TestBatch(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(5):
+            path = os.path.join(self.directory.name, 'circuit{}'.format(i))
+            with open(path, 'w') as f:
+                f.write(TEXT)
+            self.paths.append(path)
+        self.broken = os.path.join(self.directory.name, 'broken')
+        with open(self.broken, 'w') as f:
+            f.write('Inputs: 0:Qbit\nQGate["H"(0)\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_results(self, results):
+        results = {result.path: result for result in results}
+        self.assertEqual(set(self.paths + [self.broken]), set(results))
+        expected = quipper_parser().parse(TEXT)
+        for path in self.paths:
+            self.assertIsNone(results[path].error)
+            self.assertEqual(expected, results[path].result)
+        self.assertIsNone(results[self.broken].result)
+        self.assertIn('Unexpected', results[self.broken].error)
+
+    def test_serial(self):
+        self.check_results(parse_many(self.paths + [self.broken], workers=1))
+
+    def test_parallel(self):
+        self.check_results(parse_many(self.paths + [self.broken], workers=2))
+
+    def test_serial_state(self):
+        """Parsing in the current process does not set the parser of the worker processes."""
+        list(parse_many(self.paths, workers=1, parser='fast', func=summarize))
+        self.assertIsNone(batch._worker_parser)
+        self.assertIsNone(batch._worker_func)
+
+    def test_workers(self):
+        for workers in [0, -1]:
+            with self.subTest(workers=workers):
+                with self.assertRaises(ValueError):
+                    parse_many(self.paths, workers=workers)
+                with self.assertRaises(ValueError):
+                    parse_chunked(TEXT, workers=workers)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(['parse', '-j', '0', self.directory.name])
+
+    def test_directory(self):
+        results = list(parse_many([self.directory.name], workers=2, parser='fast', func=summarize))
+        self.assertEqual(6, len(results))
+        for result in results:
+            if result.path != self.broken:
+                self.assertEqual({'gates': 2, 'subroutines': 0}, result.result)
+
+    def test_cli(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            exit_code = main(['parse', '-j', '2', self.directory.name])
+        self.assertEqual(1, exit_code)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(6, len(lines))
+        self.assertIn('{}\t2\t0'.format(self.paths[0]), lines)
+
+
+class TestChunked(TestCase):
+    text = '''Inputs: 0:Qbit, 1:Qbit
+{gates}Outputs: 0:Qbit, 1:Qbit
+
+Subroutine: "SP"
+Shape: "([Q],())"
+Controllable: yes
+Inputs: 0:Qbit
+{gates}Outputs: 0:Qbit
+'''.format(gates='QGate["H"](0)\nQGate["not"](1) with controls=[+0]\nQRot["exp(-i%Z)", 0.5](1)\n' * 10)
+
+    def test_serial(self):
+        self.assertEqual(quipper_parser().parse(self.text),
+                         parse_chunked(self.text, workers=1, chunk_lines=7))
+
+    def test_parallel(self):
+        self.assertEqual(quipper_parser().parse(self.text),
+                         parse_chunked(self.text, workers=2, chunk_lines=7, parser='fast'))
+
+    def test_error_line(self):
+        text = self.text.replace('QGate["H"](0)', 'QGate["H"(0)', 1)
+        with self.assertRaisesRegex(RuntimeError, "line 2"):
+            parse_chunked(text, workers=2, chunk_lines=7)
+
+    def test_error_line_after_blank_lines(self):
+        text = 'Inputs: 0:Qbit\n\nQGate["H"](0)\n\n\nQGate["H"(0)\nOutputs: 0:Qbit\n'
+        for workers in [1, 2]:
+            with self.subTest(workers=workers):
+                with self.assertRaisesRegex(RuntimeError, "line 6:"):
+                    parse_chunked(text, workers=workers)
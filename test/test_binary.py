@@ -0,0 +1,78 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import io
+import random
+from unittest import TestCase
+
+from quippy import binary
+from quippy.parser import quipper_parser
+from quippy.transformer import *
+from test.test_writer import TEXT, random_gate
+
+
+class TestBinary(TestCase):
+    def test_round_trip(self):
+        start = quipper_parser().parse(TEXT)
+        self.assertEqual(start, binary.loads(binary.dumps(start)))
+        data = io.BytesIO()
+        binary.dump(start, data)
+        data.seek(0)
+        self.assertEqual(start, binary.load(data))
+
+    def test_random_gates(self):
+        rng = random.Random(0)
+        inputs = [TypeAssignment(Wire(0), TypeAssignment_Type.Qbit)]
+        for _ in range(20):
+            circuit = Circuit(inputs=inputs, gates=[random_gate(rng) for _ in range(100)], outputs=inputs)
+            subroutine = Subroutine(name='sub', shape='([Q])', controllable=Subroutine_Control.classically,
+                                    circuit=circuit)
+            start = Start(circuit=circuit, subroutines=[subroutine])
+            self.assertEqual(start, binary.loads(binary.dumps(start)))
+
+    def test_large_wires(self):
+        """Wires of any size, and negative controls, are stored as varints."""
+        gate = QGate(op=QGate_Op.Not, inverted=False, wires=[Wire(2 ** 40)],
+                     control=Control(controlled=[Wire(-300), Wire(127), Wire(128)], no_control=False))
+        inputs = [TypeAssignment(Wire(0), TypeAssignment_Type.Qbit)]
+        start = Start(circuit=Circuit(inputs=inputs, gates=[gate], outputs=inputs), subroutines=[])
+        self.assertEqual(start, binary.loads(binary.dumps(start)))
+
+    def test_compact(self):
+        start = quipper_parser().parse(TEXT)
+        self.assertLess(len(binary.dumps(start)), len(TEXT) / 2)
+
+    def test_gc_state(self):
+        """Loading restores the previous state of the garbage collector, also after an error."""
+        data = binary.dumps(quipper_parser().parse(TEXT))
+        self.assertTrue(gc.isenabled())
+        binary.loads(data)
+        self.assertTrue(gc.isenabled())
+        with self.assertRaises(ValueError):
+            binary.loads(data[:-3])
+        self.assertTrue(gc.isenabled())
+        gc.disable()
+        try:
+            binary.loads(data)
+            self.assertFalse(gc.isenabled())
+        finally:
+            gc.enable()
+
+    def test_invalid(self):
+        data = binary.dumps(quipper_parser().parse(TEXT))
+        for invalid in [b'', b'Inputs: 0:Qbit', data[:-3], data + b'\0']:
+            with self.subTest(data=invalid[:20]):
+                with self.assertRaises(ValueError):
+                    binary.loads(invalid)
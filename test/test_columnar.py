@@ -0,0 +1,98 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import unittest
+from unittest import TestCase
+
+from quippy.parser import quipper_parser
+from quippy.transformer import *
+
+try:
+    import numpy
+    from quippy.columnar import ColumnarCircuit, GateKind, parse_columnar
+except ImportError:
+    numpy = None
+
+TEXT = '''Inputs: 0:Qbit, 1:Qbit, 2:Cbit
+QGate["H"]*(0) with controls=[+1,-2] with nocontrol
+QGate["not"](1) with controls=[+0]
+QGate["swap"](0,1)
+QGate["T"](0)
+QRot["exp(-i%Z)", 0.25](1)
+QInit1(3) with nocontrol
+QTerm0(3)
+QMeas(0)
+CDiscard(2)
+Subroutine(x2)["SP", shape "([Q],())"] (1) -> (1) with controls=[-0]
+Comment["note"](0:"a", 1:"b")
+Comment["empty"]()
+CNot(1) with controls=[+0]
+Gphase() with t=0.5 with controls=[-1] with anchors=[0,1]
+CGate["and"]*(2,0,1) with nocontrol
+CSwap(0,1) with controls=[+2]
+QPrep(2)
+QUnprep(2)
+DTerm1(0)
+Outputs: 0:Cbit, 1:Qbit, 2:Cbit
+
+Subroutine: "SP"
+Shape: "([Q],())"
+Controllable: yes
+Inputs: 0:Qbit
+QGate["H"](0)
+Outputs: 0:Qbit
+'''
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestColumnar(TestCase):
+    def setUp(self):
+        self.start = quipper_parser().parse(TEXT)
+
+    def test_round_trip(self):
+        columnar = ColumnarCircuit.from_circuit(self.start.circuit)
+        self.assertEqual(len(self.start.circuit.gates), len(columnar))
+        self.assertEqual(self.start.circuit, columnar.to_circuit())
+
+    def test_columns(self):
+        columnar = ColumnarCircuit.from_circuit(self.start.circuit)
+        self.assertEqual(GateKind.QGate, columnar.kind[0])
+        self.assertEqual(QGate_Op.H.value, columnar.op[0])
+        self.assertTrue(columnar.inverted[0])
+        self.assertEqual([1, 2], list(columnar.controls[:2]))
+        self.assertEqual([True, False], list(columnar.control_signs[:2]))
+        self.assertEqual([0, 1, 2, 4], list(columnar.wire_offsets[:4]))
+        self.assertEqual(0.25, columnar.timestep[4])
+        self.assertEqual([2, 1, 0, 0], list(columnar.control_counts()[:4]))
+
+    def test_gate_counts(self):
+        counts = ColumnarCircuit.from_circuit(self.start.circuit).gate_counts()
+        self.assertEqual(1, counts[QGate_Op.H])
+        self.assertEqual(1, counts[QGate_Op.Not])
+        self.assertEqual(1, counts[QRot_Op.ExpZt])
+        self.assertEqual(1, counts[GateKind.SubroutineCall])
+        self.assertEqual(2, counts[GateKind.Comment])
+        self.assertEqual(1, counts[GateKind.CNot])
+        self.assertEqual(1, counts[GateKind.DTerm])
+        self.assertEqual(0, counts[GateKind.Other])
+        self.assertEqual(len(self.start.circuit.gates), sum(counts.values()))
+
+    def test_parse_columnar(self):
+        for parser in ['lalr', 'fast']:
+            with self.subTest(parser=parser):
+                columnar = parse_columnar(io.StringIO(TEXT), parser=parser)
+                self.assertEqual(ColumnarCircuit.from_circuit(self.start.circuit), columnar.circuit)
+                self.assertEqual(self.start.subroutines[0].circuit,
+                                 columnar.subroutines[0].circuit.to_circuit())
@@ -0,0 +1,122 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+from collections import Counter
+from unittest import TestCase
+
+from quippy.analysis import gate_key, control_count, count_resources
+from quippy.count import count_gates, GateCounts, CountStart
+from quippy.parser import quipper_parser
+from quippy.transformer import *
+from test.test_fast import TEXT
+
+
+def expected_counts(circuit: Circuit) -> GateCounts:
+    """Count the gates of a parsed circuit."""
+    counts = GateCounts(gates=Counter(), controlled=Counter(), calls=Counter())
+    for gate in circuit.gates:
+        if isinstance(gate, SubroutineCall):
+            counts.calls[gate.name] += gate.repetitions
+        elif not isinstance(gate, Comment):
+            counts.gates[gate_key(gate)] += 1
+            if control_count(gate):
+                counts.controlled[gate_key(gate), control_count(gate)] += 1
+    return counts
+
+
+def inlined_counts(counted: CountStart, counts: GateCounts) -> GateCounts:
+    """Add the counts of the called subroutines, which must be called without controls or inversion."""
+    result = GateCounts(gates=Counter(counts.gates), controlled=Counter(counts.controlled),
+                        calls=Counter(counts.calls))
+    for name, repetitions in counts.calls.items():
+        for total, called in zip(result, inlined_counts(counted, counted.subroutines[name])):
+            for key, count in called.items():
+                total[key] += count * repetitions
+    return result
+
+
+CALLS_TEXT = '''Inputs: 0:Qbit, 1:Qbit
+Comment["ENTER: main"](0:"a", 1:"b")
+QGate["H"](0) with controls=[+1]
+Subroutine(x3)["A", shape "([Q,Q])"] (0,1) -> (0,1)
+QGate["T"](1)
+Comment["EXIT: main"](0:"a", 1:"b")
+Outputs: 0:Qbit, 1:Qbit
+
+Subroutine: "A"
+Shape: "([Q,Q])"
+Controllable: no
+Inputs: 0:Qbit, 1:Qbit
+Comment["ENTER: A"](0:"x")
+QGate["T"](0)
+Subroutine(x2)["B", shape "([Q])"] (1) -> (1)
+QGate["not"](0) with controls=[+1]
+Outputs: 0:Qbit, 1:Qbit
+
+Subroutine: "B"
+Shape: "([Q])"
+Controllable: no
+Inputs: 0:Qbit
+QInit0(1)
+QGate["not"](1) with controls=[+0]
+Comment["B"](1:"ancilla")
+QTerm0(1)
+Outputs: 0:Qbit
+'''
+
+
+class TestCount(TestCase):
+    def setUp(self):
+        start = quipper_parser().parse(TEXT)
+        self.expected = CountStart(
+            circuit=expected_counts(start.circuit),
+            subroutines={subroutine.name: expected_counts(subroutine.circuit)
+                         for subroutine in start.subroutines})
+
+    def test_count_gates(self):
+        self.assertEqual(self.expected, count_gates(io.StringIO(TEXT)))
+
+    def test_binary(self):
+        self.assertEqual(self.expected, count_gates(io.BytesIO(TEXT.encode())))
+
+    def test_mode(self):
+        counted = quipper_parser(mode='count').parse(TEXT)
+        self.assertEqual(self.expected, counted)
+        self.assertEqual(1, counted.circuit.controlled[QGate_Op.H, 3])
+        self.assertEqual(155, counted.circuit.calls['SP'])
+        self.assertEqual(0, counted.circuit.gates[Comment])
+        self.assertEqual(0, counted.circuit.gates[SubroutineCall])
+
+    def test_resources(self):
+        """The counts of count_gates, inlined, are those of count_resources."""
+        resources = count_resources(quipper_parser().parse(CALLS_TEXT))
+        counted = count_gates(io.StringIO(CALLS_TEXT))
+        self.assertEqual(resources[:3], inlined_counts(counted, counted.circuit))
+        self.assertEqual(4, resources.gates[QGate_Op.T])
+        self.assertEqual(6, resources.calls['B'])
+
+    def test_options(self):
+        with self.assertRaises(ValueError):
+            quipper_parser(start='circuit', mode='count')
+        with self.assertRaises(ValueError):
+            quipper_parser(mode='count', transformer=None)
+        with self.assertRaises(ValueError):
+            quipper_parser(mode='tree')
+
+    def test_error(self):
+        with self.assertRaises(RuntimeError):
+            count_gates(['Inputs: 0:Qbit', 'QGate["foo"](0)', 'Outputs: 0:Qbit'])
+        with self.assertRaisesRegex(RuntimeError, 'line 2'):
+            count_gates(['Inputs: 0:Qbit', 'QGate["H"](0', 'Outputs: 0:Qbit'])
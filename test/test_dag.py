@@ -0,0 +1,66 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase
+
+from quippy.dag import CircuitDAG
+from quippy.parser import quipper_parser
+
+TEXT = '''Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+QGate["H"](0)
+QGate["H"](1)
+QGate["not"](1) with controls=[+0]
+Comment["note"](0:"a")
+QGate["T"](2)
+QGate["swap"](0,2) with controls=[-1]
+QMeas(1)
+Outputs: 0:Qbit, 1:Cbit, 2:Qbit
+'''
+
+
+class TestCircuitDAG(TestCase):
+    def setUp(self):
+        self.dag = CircuitDAG(quipper_parser().parse(TEXT).circuit)
+
+    def test_wires(self):
+        self.assertEqual([1, 0], list(self.dag.wires_of(2)))
+        self.assertEqual([], list(self.dag.wires_of(3)))
+        self.assertEqual([0, 2, 1], list(self.dag.wires_of(5)))
+
+    def test_edges(self):
+        self.assertEqual([1, 0], self.dag.predecessors(2))
+        self.assertEqual([5], self.dag.successors(2))
+        self.assertEqual([2, 4], self.dag.predecessors(5))
+        self.assertEqual([6], self.dag.successors(5))
+        self.assertEqual([], self.dag.predecessors(0))
+        self.assertEqual([], self.dag.successors(6))
+
+    def test_on_wire(self):
+        self.assertEqual(1, self.dag.previous_on(2, 1))
+        self.assertEqual(0, self.dag.previous_on(2, 0))
+        self.assertEqual(5, self.dag.next_on(2, 1))
+        self.assertEqual(-1, self.dag.next_on(5, 0))
+        with self.assertRaises(KeyError):
+            self.dag.previous_on(0, 1)
+
+    def test_wire_gates(self):
+        self.assertEqual([0, 2, 5], list(self.dag.wire_gates(0)))
+        self.assertEqual([1, 2, 5, 6], list(self.dag.wire_gates(1)))
+        self.assertEqual([], list(self.dag.wire_gates(7)))
+
+    def test_layers(self):
+        self.assertEqual([[0, 1, 3, 4], [2], [5], [6]], self.dag.layers())
+        self.assertEqual(4, self.dag.depth())
+        self.assertEqual(0, CircuitDAG(quipper_parser().parse(
+            'Inputs: 0:Qbit\nOutputs: 0:Qbit\n').circuit).depth())
@@ -0,0 +1,242 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import math
+import os
+import random
+import re
+import tempfile
+import unittest
+from unittest import TestCase
+
+from quippy.export import qasm
+from quippy.parser import quipper_parser
+from quippy.stream import iter_gates
+
+try:
+    import numpy as np
+    from quippy.sim import StateVector
+except ImportError:
+    np = None
+
+from test.test_fusion import random_circuit
+from test.test_sim import SUBROUTINES_TEXT, random_state
+
+CLASSICAL_TEXT = '''Inputs: 0:Cbit, 1:Qbit
+QGate["not"](1) with controls=[+0]
+QMeas(1)
+CNot(0) with controls=[-1]
+CGate["and"](3,1,0)
+QInit1(4)
+QGate["Z"](4) with controls=[+3]
+CGate["and"]*(3,1,0)
+QPrep(0)
+QTerm1(4)
+Outputs: 0:Qbit, 1:Cbit
+'''
+
+# The subroutines only have unitary gates on their inputs, so they are defined as gates.
+UNITARY_TEXT = '''Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+Subroutine(x2)["swap", shape "([Q,Q])"] (0,1) -> (3,4) with controls=[-2]
+Subroutine["rotate", shape "([Q,Q])"]* (4,2) -> (4,2) with controls=[+3]
+QGate["H"](3)
+Outputs: 3:Qbit, 4:Qbit, 2:Qbit
+
+Subroutine: "swap"
+Shape: "([Q,Q])"
+Controllable: yes
+Inputs: 0:Qbit, 1:Qbit
+QGate["V"](0) with controls=[+1]
+Subroutine["rotate", shape "([Q,Q])"] (1,0) -> (1,0)
+Outputs: 1:Qbit, 0:Qbit
+
+Subroutine: "rotate"
+Shape: "([Q,Q])"
+Controllable: yes
+Inputs: 0:Qbit, 1:Qbit
+QGate["E"](0) with controls=[-1]
+QRot["exp(-i%Z)",0.3](1)
+Gphase() with t=0.25 with anchors=[0]
+Outputs: 0:Qbit, 1:Qbit
+'''
+
+
+def to_qasm(source, **options) -> str:
+    out = io.StringIO()
+    qasm(source, out, **options)
+    return out.getvalue()
+
+
+def run_qasm(text: str, state):
+    """Apply the gates of OpenQASM written by qasm to a state, which supports the unitary gates only.
+
+    The qubits that are not in the state start in |0> and must end in |0>, which skips their resets.
+    """
+    s, sdg, t = np.diag([1, 1j]), np.diag([1, -1j]), np.diag([1, np.exp(1j * math.pi / 4)])
+    matrices = {'x': np.array([[0, 1], [1, 0]]), 'y': np.array([[0, -1j], [1j, 0]]), 'z': np.diag([1, -1]),
+                'h': np.array([[1, 1], [1, -1]]) / math.sqrt(2), 's': s, 'sdg': sdg, 't': t, 'tdg': t.conj(),
+                'sx': np.array([[1 + 1j, 1 - 1j], [1 - 1j, 1 + 1j]]) / 2, 'swap': np.eye(4)[[0, 2, 1, 3]]}
+    shorthands = {'cx': 'ctrl @ x', 'ccx': 'ctrl(2) @ x', 'cy': 'ctrl @ y', 'cz': 'ctrl @ z', 'ch': 'ctrl @ h',
+                  'cswap': 'ctrl @ swap'}
+    definitions = {name: (parameters.split(', '), body.strip().splitlines()) for name, parameters, body in
+                   re.findall(r'^gate (\w+) ([\w, ]+) \{\n(.*?)^\}', text, re.MULTILINE | re.DOTALL)}
+    qubits = int(re.search(r'^qubit\[(\d+)\] q;', text, re.MULTILINE).group(1))
+    size = len(state)
+    state = np.kron(state, np.eye(1, 2 ** qubits // size)).reshape((2,) * qubits)
+
+    def apply(statement, operands, controls, inverse):
+        modifiers, name, arguments = re.match(r'((?:\w+(?:\(\d+\))? @ )*)(\w+(?:\(.*\))?) ?(.*);',
+                                              statement.strip()).groups()
+        arguments = [operands.get(argument, argument) for argument in arguments.split(', ') if argument]
+        if name in shorthands:
+            modifiers, name = modifiers + shorthands[name].rpartition(' ')[0] + ' ', shorthands[name].split()[-1]
+        for modifier, count in re.findall(r'(\w+)(?:\((\d+)\))? @ ', modifiers):
+            if modifier == 'inv':
+                inverse = not inverse
+            else:
+                count = int(count or 1)
+                controls = controls + [(argument, modifier == 'ctrl') for argument in arguments[:count]]
+                arguments = arguments[count:]
+        gate, _, angle = name.partition('(')
+        if gate in definitions:
+            parameters, body = definitions[gate]
+            frame = dict(zip(parameters, arguments))
+            for line in (reversed(body) if inverse else body):
+                apply(line, frame, controls, inverse)
+            return
+        if angle:
+            angle = eval(angle.rstrip(')'), {'pi': math.pi}) * (-1 if inverse else 1)
+            matrix = {'gphase': np.diag([np.exp(1j * angle)] * 2), 'p': np.diag([1, np.exp(1j * angle)]),
+                      'rz': np.diag([np.exp(-0.5j * angle), np.exp(0.5j * angle)])}[gate]
+        else:
+            matrix = matrices[gate].conj().T if inverse else matrices[gate]
+        targets = [int(argument[2:-1]) for argument in arguments]
+        if gate == 'gphase':
+            targets, matrix = [], matrix[0, 0] * np.eye(1)
+        index = [slice(None)] * qubits
+        for argument, positive in controls:
+            index[int(argument[2:-1])] = int(positive)
+        index = tuple(index)
+        axes = [target - sum(1 for argument, _ in controls if int(argument[2:-1]) < target) for target in targets]
+        view = np.moveaxis(state[index], axes, list(range(len(axes))))
+        shape = view.shape
+        view[...] = (matrix @ view.reshape(2 ** len(axes), -1)).reshape(shape)
+
+    for line in text.split('\n'):
+        if line.startswith(('x', 'y', 'z', 'h', 's', 't', 'p', 'r', 'g', 'i', 'c', 'n', 'W', 'E', 'o')) and \
+                not line.startswith(('gate', 'include', 'reset')):
+            apply(line, {}, [], False)
+    state = state.reshape(size, -1)
+    np.testing.assert_allclose(state[:, 1:], 0, atol=1e-12)
+    return state[:, 0]
+
+
+class TestExport(TestCase):
+    def test_gates(self):
+        text = to_qasm('Inputs: 0:Qbit, 1:Qbit, 2:Qbit\nQGate["not"](0) with controls=[+1,+2]\n'
+                       'QGate["Z"](1) with controls=[-2]\nQGate["S"]*(2) with controls=[+0,-1]\n'
+                       'QGate["multinot"](0,1)\nQGate["W"](1,0)\nQRot["exp(-i%Z)",0.25](2)\n'
+                       'QRot["R(2pi/%)",4.0]*(0)\nGphase() with t=0.5 with controls=[+2] with anchors=[0]\n'
+                       'Comment["done"](0:"a")\nOutputs: 0:Qbit, 1:Qbit, 2:Qbit\n')
+        self.assertEqual(text.split('\n'), [
+            'OPENQASM 3.0;', 'include "stdgates.inc";',
+            'gate W a, b {', '    cx a, b;', '    ch b, a;', '    cx a, b;', '}',
+            'qubit[3] q;',
+            'ccx q[1], q[2], q[0];',
+            'negctrl @ z q[2], q[1];',
+            'ctrl @ negctrl @ sdg q[0], q[1], q[2];',
+            'x q[0];', 'x q[1];',
+            'W q[1], q[0];',
+            'rz(0.5) q[2];',
+            'p({!r}) q[0];'.format(-math.pi / 2),
+            'ctrl @ gphase({!r}) q[2];'.format(math.pi / 2),
+            '// done',
+            ''])
+
+    def test_classical(self):
+        self.assertEqual(to_qasm(CLASSICAL_TEXT).split('\n')[2:], [
+            'qubit[2] q;', 'bit[3] c;',
+            'if (c[0]) x q[0];',
+            'c[1] = measure q[0];',
+            'if (!c[1]) c[0] = !c[0];',
+            'c[2] = c[1] && c[0];',
+            'reset q[0];', 'x q[0];',
+            'if (c[2]) z q[0];',
+            'reset q[1];', 'if (c[0]) x q[1];',
+            ''])
+
+    def test_empty_cgate(self):
+        """A classical gate without inputs assigns its value to the bit."""
+        text = to_qasm('Inputs: 0:Cbit\nCGate["and"](1)\nCGate["or"](2)\nCGate["xor"](3)\n'
+                       'Outputs: 0:Cbit, 1:Cbit, 2:Cbit, 3:Cbit\n')
+        self.assertEqual(['c[1] = true;', 'c[2] = false;', 'c[3] = false;', ''], text.split('\n')[3:])
+
+    def test_sources(self):
+        text = SUBROUTINES_TEXT
+        expected = to_qasm(text)
+        self.assertEqual(expected, to_qasm(quipper_parser().parse(text)))
+        self.assertEqual(expected, to_qasm(iter_gates(io.StringIO(text))))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'circuit.quipper')
+            with open(path, 'w') as f:
+                f.write(text)
+            self.assertEqual(expected, to_qasm(path, parser='lalr'))
+
+    def test_subroutines(self):
+        text = to_qasm(SUBROUTINES_TEXT)
+        # prepare initializes an ancilla, so it is inlined, and rotate has a gate with nocontrol,
+        # so its controlled calls are inlined.
+        self.assertEqual(['sub_0_rotate'], re.findall(r'^gate (sub_\w+)', text, re.MULTILINE))
+        self.assertEqual(1, text.count('\nsub_0_rotate q[0];\n'))
+        self.assertNotIn('gate sub_', to_qasm(SUBROUTINES_TEXT, inline=True))
+
+    def test_errors(self):
+        with self.assertRaises(RuntimeError):
+            to_qasm('Inputs: 0:Qbit\nSubroutine["missing", shape "([Q])"] (0) -> (0)\nOutputs: 0:Qbit\n')
+        with self.assertRaises(RuntimeError):
+            to_qasm('Inputs: 0:Qbit\nCNot(0)\nOutputs: 0:Qbit\n')
+        with self.assertRaises(RuntimeError):
+            to_qasm('Inputs: 0:Qbit\nQGate["H"](0)\n')
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestExportSemantics(TestCase):
+    def assertSameState(self, text, qubits, **options):
+        start = quipper_parser().parse(text)
+        state = random_state(np.random.RandomState(0), qubits)
+        expected = StateVector(start.subroutines).run(start.circuit, state)
+        np.testing.assert_allclose(expected, run_qasm(to_qasm(text, **options), state), atol=1e-12)
+
+    def test_random(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            # The lines of the comments are skipped.
+            self.assertSameState(random_circuit(rng, 30), 4)
+
+    def test_gates(self):
+        lines = ['QGate["{}"]{}(0) with controls=[+1,-2]'.format(name, inverted)
+                 for name in ['H', 'Y', 'S', 'T', 'E', 'omega', 'V', 'iX'] for inverted in ['', '*']]
+        self.assertSameState('Inputs: 0:Qbit, 1:Qbit, 2:Qbit\n{}\nQGate["W"](2,0) with controls=[-1]\n'
+                             'Outputs: 0:Qbit, 1:Qbit, 2:Qbit\n'.format('\n'.join(lines)), 3)
+
+    def test_subroutines(self):
+        self.assertSameState(SUBROUTINES_TEXT, 3)
+        self.assertSameState(SUBROUTINES_TEXT, 3, inline=True)
+        self.assertSameState(UNITARY_TEXT, 3)
+        self.assertSameState(UNITARY_TEXT, 3, inline=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import glob
+from pathlib import Path
+import unittest
+from unittest import TestCase
+
+from quippy.parser import quipper_parser
+from quippy.transformer import Gate
+
+GATE_LINES = [
+    'QGate["H"](0)',
+    'QGate["not"](0) with controls=[+2,-3] with nocontrol',
+    'QGate["H"]*(0) with controls=[+3,-5, -6] with nocontrol',
+    'QGate[ "multinot" ] * ( 0 , 1 )with controls=[ +2 ]',
+    'QGate["swap"](0,1) with controls=[+2]',
+    'QGate["X"](4) with nocontrol',
+    'QGate["iX"](4)',
+    'QRot["exp(-i%Z)", 1e-05](1)',
+    'QRot["R(2pi/%)",-0.5]*(3)',
+    'QRot["exp(-i%Z)",.5](3)',
+    'QInit1(0) with nocontrol',
+    'CInit0(5)',
+    'QTerm0(3) with nocontrol',
+    'CTerm1(3)',
+    'QMeas(0)',
+    'QDiscard(5)',
+    'CDiscard(2)',
+    'Subroutine["SP", shape "([Q,Q,Q],())"] (3,4,5) -> (0,1,2) with controls=[+5] with nocontrol',
+    'Subroutine(x154)["SP", shape "([Q,Q,Q],())"]* (3,4,5) -> (0,1,2)',
+    'Subroutine["a \\"b\\"", shape "()"] (3) -> (0)',
+    'Comment["ENTER: qft_big_endian"](0:"qs[0]", 1:"qs[1]")',
+    'Comment["ENTER: qft_big_endian"]()',
+    'Comment["a, \\"b\\""]*( 0 : "x:1" ,1:"y")',
+    # Lines that are passed on to Lark.
+    'Gphase() with t=0.5 with anchors=[0]',
+    'Gphase() with t=-1.5 with controls=[+1] with nocontrol with anchors=[0,2]',
+    'CNot(1) with controls=[+0]',
+    'CGate["and"]*(2,0,1) with nocontrol',
+    'CSwap(0,1) with controls=[-2]',
+    'QPrep(1) with nocontrol',
+    'QUnprep(1)',
+    'DTerm0(3)',
+    ]
+
+TEXT = '''Inputs: 0:Qbit, 1:Cbit,
+{}
+Outputs: 0:Qbit, 1:Cbit
+
+Subroutine: "SP"
+Shape: "([Q,Q,Q],())"
+Controllable: yes
+Inputs: 0:Qbit
+QGate["H"](0)
+Outputs: 0:Qbit
+'''.format('\n'.join(GATE_LINES))
+
+
+class TestFast(TestCase):
+    def test_gates(self):
+        lark_parser = quipper_parser(start='gate')
+        fast_parser = quipper_parser(start='gate', parser='fast')
+        for line in GATE_LINES:
+            with self.subTest(line=line):
+                self.assertEqual(lark_parser.parse(line), fast_parser.parse(line))
+
+    def test_start(self):
+        parsed = quipper_parser(parser='fast').parse(TEXT)
+        self.assertEqual(quipper_parser().parse(TEXT), parsed)
+
+    def test_circuit(self):
+        text = TEXT.split('\n\n')[0] + '\n'
+        self.assertEqual(quipper_parser(start='circuit').parse(text),
+                         quipper_parser(start='circuit', parser='fast').parse(text))
+
+    def test_unknown_gate(self):
+        for parser in ['lalr', 'fast']:
+            with self.assertRaises(RuntimeError):
+                quipper_parser(start='gate', parser=parser).parse('QGate["foo"](0)')
+
+    def test_fallback(self):
+        """Lines that are not recognized are parsed by Lark into gates."""
+        parsed = quipper_parser(start='gate', parser='fast').parse('CNot(1) with controls=[+0]')
+        self.assertIsInstance(parsed, Gate)
+
+    def test_options(self):
+        with self.assertRaises(ValueError):
+            quipper_parser(parser='fast', transformer=None)
+        with self.assertRaises(ValueError):
+            quipper_parser(start='arity', parser='fast')
+
+    @unittest.skipUnless((Path(__file__).parents[1] / "resources" / "optimizer").exists(),
+                         "optimizer resource does not exist")
+    def test_optimizer(self):
+        """The fast parser gives the same result as Lark on all files in the optimizer resource."""
+        optimizer_files_path = Path(__file__).parents[1] / "resources" / "optimizer" / "**"
+        optimizer_files = glob.glob(str(optimizer_files_path), recursive=True)
+        quipper_paths = filter(lambda path: not path.is_dir()
+                                            and path.suffix == '',
+                               map(lambda s: Path(s), optimizer_files))
+        lark_parser = quipper_parser()
+        fast_parser = quipper_parser(parser='fast')
+        for path in quipper_paths:
+            with self.subTest(path=str(path)):
+                with open(str(path)) as quipper_file:
+                    text = quipper_file.read()
+                self.assertEqual(lark_parser.parse(text), fast_parser.parse(text))
@@ -0,0 +1,126 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+from unittest import TestCase
+
+from quippy.parser import quipper_parser
+from quippy.transformer import Comment
+
+try:
+    import numpy as np
+    from quippy.sim import StateVector
+    from quippy.sim.fusion import Unitary, fuse
+except ImportError:
+    np = None
+
+from test.test_sim import SUBROUTINES_TEXT, random_state
+
+GATES = ['QGate["H"]({a})', 'QGate["T"]*({a})', 'QGate["not"]({a}) with controls=[+{b}]',
+         'QGate["Z"]({a}) with controls=[-{b}]', 'QGate["swap"]({a},{b})', 'QGate["W"]({b},{a})',
+         'QRot["exp(-i%Z)",0.7]({a})', 'QRot["R(2pi/%)",3.0]*({b})', 'QGate["multinot"]({a},{b})',
+         'QGate["not"]({a}) with controls=[+{b},+{c}]', 'QGate["V"]({a}) with nocontrol',
+         'Gphase() with t=0.1 with anchors=[{a}]', 'Comment["fuse"]({a}:"a")']
+
+
+def random_circuit(rng: random.Random, gates: int, qubits=4) -> str:
+    lines = []
+    for _ in range(gates):
+        a, b, c = rng.sample(range(qubits), 3)
+        lines.append(rng.choice(GATES).format(a=a, b=b, c=c))
+    wires = ', '.join('{}:Qbit'.format(wire) for wire in range(qubits))
+    return 'Inputs: {}\n{}\nOutputs: {}\n'.format(wires, '\n'.join(lines), wires)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestFusion(TestCase):
+    def parse(self, text):
+        return quipper_parser(start='circuit').parse(text)
+
+    def assertSameState(self, circuit, subroutines=(), qubits=4):
+        state = random_state(np.random.RandomState(0), qubits)
+        expected = StateVector(subroutines).run(circuit, state)
+        np.testing.assert_allclose(expected, StateVector(subroutines, fuse=True).run(circuit, state), atol=1e-12)
+
+    def test_runs(self):
+        circuit = self.parse('Inputs: 0:Qbit, 1:Qbit, 2:Qbit\nQGate["H"](0)\nQGate["T"](0)\n'
+                             'QGate["not"](1) with controls=[+0]\nQGate["S"](1)\nQGate["H"](2)\n'
+                             'QGate["not"](2) with controls=[+1]\nOutputs: 0:Qbit, 1:Qbit, 2:Qbit\n')
+        fusion = fuse(circuit)
+        self.assertEqual((6, 3), (fusion.gates, fusion.fused_gates))
+        unitary, h, cnot = fusion.circuit.gates
+        self.assertIsInstance(unitary, Unitary)
+        self.assertEqual(([1, 0], 4), ([wire.i for wire in unitary.wires], unitary.gates))
+        # The last gate does not fit in a block on two wires with the other gates.
+        self.assertEqual(circuit.gates[-2:], [h, cnot])
+        self.assertSameState(circuit, qubits=3)
+
+    def test_random(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            circuit = self.parse(random_circuit(rng, 30))
+            fusion = fuse(circuit)
+            self.assertEqual(sum(gate.gates if isinstance(gate, Unitary) else 1
+                                 for gate in fusion.circuit.gates if not isinstance(gate, Comment)), fusion.gates)
+            self.assertLessEqual(fusion.fused_gates, fusion.gates)
+            self.assertSameState(circuit)
+
+    def test_single_gates_kept(self):
+        """A gate that is not fused with other gates stays as it is."""
+        circuit = self.parse('Inputs: 0:Qbit, 1:Qbit, 2:Qbit\nQGate["H"](0)\n'
+                             'QGate["not"](2) with controls=[+0,+1]\nQGate["H"](0)\nOutputs: 0:Qbit, 1:Qbit, 2:Qbit\n')
+        fusion = fuse(circuit)
+        self.assertEqual(circuit.gates, fusion.circuit.gates)
+        self.assertEqual((3, 3), (fusion.gates, fusion.fused_gates))
+
+    def test_classical_controls(self):
+        circuit = self.parse('Inputs: 0:Qbit, 1:Cbit\nQGate["H"](0)\nQGate["not"](0) with controls=[+1]\n'
+                             'QGate["H"](0)\nOutputs: 0:Qbit, 1:Cbit\n')
+        self.assertEqual(circuit.gates, fuse(circuit).circuit.gates)
+        circuit = self.parse('Inputs: 0:Qbit, 1:Qbit\nQMeas(1)\nQGate["H"](0)\nQGate["not"](0) with controls=[+1]\n'
+                             'QGate["H"](0)\nOutputs: 0:Qbit, 1:Cbit\n')
+        self.assertEqual(circuit.gates, fuse(circuit).circuit.gates)
+
+    def test_no_control(self):
+        """Gates marked with nocontrol are only fused with each other."""
+        circuit = self.parse('Inputs: 0:Qbit\nQGate["H"](0)\nQGate["T"](0) with nocontrol\n'
+                             'QGate["S"](0) with nocontrol\nQGate["H"](0)\nOutputs: 0:Qbit\n')
+        gates = fuse(circuit).circuit.gates
+        self.assertEqual(3, len(gates))
+        self.assertIsInstance(gates[1], Unitary)
+        self.assertTrue(gates[1].control.no_control)
+
+    def test_max_wires(self):
+        circuit = self.parse(random_circuit(random.Random(2), 100))
+        self.assertEqual(fuse(circuit, max_wires=0).circuit.gates, circuit.gates)
+        self.assertLessEqual(fuse(circuit, max_wires=3).fused_gates, fuse(circuit).fused_gates)
+        self.assertLessEqual(fuse(circuit).fused_gates, fuse(circuit, max_wires=1).fused_gates)
+
+    def test_subroutines(self):
+        start = quipper_parser().parse(SUBROUTINES_TEXT)
+        simulator = StateVector(start.subroutines, fuse=True)
+        state = random_state(np.random.RandomState(3), 3)
+        expected = StateVector(start.subroutines).run(start.circuit, state)
+        np.testing.assert_allclose(expected, simulator.run(start.circuit, state), atol=1e-12)
+        np.testing.assert_allclose(expected, simulator.run(start.circuit, state), atol=1e-12)
+        self.assertEqual({None, 'prepare', 'rotate'}, set(simulator.fusions))
+        # The omega with nocontrol keeps E and T in rotate apart.
+        self.assertEqual((3, 3), (simulator.fusions['rotate'].gates, simulator.fusions['rotate'].fused_gates))
+        # The outputs of calls are qubits, so the gates after the calls are fused.
+        self.assertIsInstance(simulator.fusions[None].circuit.gates[-1], Unitary)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase
+
+SCRIPT = '''
+import json, sys
+import quippy
+print(json.dumps(sorted(sys.modules)))
+'''
+
+
+class TestImport(TestCase):
+    def run_import(self):
+        output = subprocess.check_output([sys.executable, '-c', SCRIPT],
+                                         cwd=str(Path(__file__).parents[1]))
+        return json.loads(output.decode())
+
+    def test_lazy_modules(self):
+        """Importing quippy does not import Lark or the gate types, which keeps the import fast."""
+        modules = self.run_import()
+        for module in ['lark', 'pkg_resources', 'quippy.transformer', 'quippy._tables']:
+            self.assertNotIn(module, modules)
+
+    def test_lazy_attributes(self):
+        import quippy
+        from quippy.transformer import Wire
+        self.assertIs(Wire, quippy.Wire)
+        self.assertIn('Start', dir(quippy))
+        with self.assertRaises(AttributeError):
+            quippy.DoesNotExist
@@ -0,0 +1,74 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase
+
+from quippy.optimize import optimize
+from quippy.parser import quipper_parser
+from quippy.transformer import *
+
+
+def circuit(*lines: str) -> Circuit:
+    return quipper_parser(start='circuit').parse(
+        'Inputs: 0:Qbit, 1:Qbit, 2:Qbit\n{}Outputs: 0:Qbit, 1:Qbit, 2:Qbit\n'.format(
+            ''.join(line + '\n' for line in lines)))
+
+
+class TestOptimize(TestCase):
+    def assertOptimized(self, expected, lines):
+        self.assertEqual(circuit(*expected), optimize(circuit(*lines)))
+
+    def test_self_inverse(self):
+        self.assertOptimized(['QGate["T"](1)'], ['QGate["H"](0)', 'QGate["T"](1)', 'QGate["H"](0)'])
+        self.assertOptimized([], ['QGate["swap"](0,1)', 'QGate["swap"](1,0)'])
+
+    def test_inverted(self):
+        self.assertOptimized([], ['QGate["T"](0)', 'QGate["T"]*(0)'])
+        self.assertOptimized(['QGate["T"](0)', 'QGate["T"](0)'], ['QGate["T"](0)', 'QGate["T"](0)'])
+
+    def test_controlled(self):
+        self.assertOptimized([], ['QGate["not"](1) with controls=[+0]',
+                                  'QGate["not"](1) with controls=[+0]'])
+        lines = ['QGate["not"](1) with controls=[+2]', 'QGate["not"](1) with controls=[-2]']
+        self.assertOptimized(lines, lines)
+
+    def test_blocked(self):
+        """Gates are only cancelled if no gate acts on their wires in between."""
+        lines = ['QGate["not"](1) with controls=[+0]', 'QGate["H"](0)',
+                 'QGate["not"](1) with controls=[+0]']
+        self.assertOptimized(lines, lines)
+        lines = ['QGate["H"](0)', 'QMeas(0)', 'QGate["H"](0)']
+        self.assertOptimized(lines, lines)
+
+    def test_cascade(self):
+        self.assertOptimized(['QGate["Z"](1)'], [
+            'QGate["H"](0)', 'QGate["S"](0)', 'QGate["Z"](1)', 'QGate["not"](0)', 'QGate["not"](0)',
+            'QGate["S"]*(0)', 'QGate["H"](0)'])
+
+    def test_rotations(self):
+        self.assertOptimized(['QRot["exp(-i%Z)",0.75](0)'],
+                             ['QRot["exp(-i%Z)",0.5](0)', 'QRot["exp(-i%Z)",0.25](0)'])
+        self.assertOptimized(['QRot["exp(-i%Z)",-0.25](0)'],
+                             ['QRot["exp(-i%Z)",0.5]*(0)', 'QRot["exp(-i%Z)",0.25](0)'])
+        self.assertOptimized([], ['QRot["exp(-i%Z)",0.5](0)', 'QRot["exp(-i%Z)",0.5]*(0)'])
+        self.assertOptimized(['QRot["R(2pi/%)",2.0](0)'],
+                             ['QRot["R(2pi/%)",4.0](0)', 'QRot["R(2pi/%)",4.0](0)'])
+        self.assertOptimized([], ['QRot["R(2pi/%)",8.0](0)', 'QRot["R(2pi/%)",8.0]*(0)'])
+        lines = ['QRot["R(2pi/%)",8.0](0)', 'QRot["exp(-i%Z)",0.5](0)']
+        self.assertOptimized(lines, lines)
+
+    def test_merged_cancel(self):
+        """A merged rotation cancels against the rotation before it."""
+        self.assertOptimized([], ['QRot["R(2pi/%)",2.0]*(0)', 'QRot["R(2pi/%)",4.0](0)',
+                                  'QRot["R(2pi/%)",4.0](0)'])
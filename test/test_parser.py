@@ -13,14 +13,21 @@
 # limitations under the License.
 
 import glob
+import re
 import logging
+import os
 from pathlib import Path
+import tempfile
 import unittest
-from unittest import TestCase
+from unittest import TestCase, mock
 
-from lark import Tree, UnexpectedToken
+from lark import Lark, Tree, UnexpectedToken
 
-from quippy.parser import quipper_parser
+from quippy import _tables
+from quippy.build_tables import grammar_hash
+from quippy.parser import quipper_parser, clear_cache, GRAMMAR, LALR_OPTIONS
+from quippy.transformer import Circuit, QuipperTransformer
+from test.test_fast import GATE_LINES, TEXT
 
 logger = logging.getLogger(__name__)
 
@@ -341,3 +348,147 @@ class TestParser(TestCase):
                     parser.parse(quipper_file.read())
                 except UnexpectedToken as e:
                     raise RuntimeError("Failed to parse {}. Error: {}".format(path, e.message))
+
+
+class TestParserCache(TestCase):
+    text = '''Inputs: 0:Qbit
+        QGate["H"](0) with controls=[+1]
+        Outputs: 0:Qbit
+        '''
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        clear_cache()
+
+    def tearDown(self):
+        clear_cache()
+        self.cache_dir.cleanup()
+
+    def test_memory_cache(self):
+        parser = quipper_parser(cache_dir=self.cache_dir.name)
+        self.assertIs(parser, quipper_parser(cache_dir=self.cache_dir.name))
+        self.assertIsNot(parser, quipper_parser(start='circuit', cache_dir=self.cache_dir.name))
+        self.assertIsNot(parser, quipper_parser(transformer=None, cache_dir=self.cache_dir.name))
+
+    def test_memory_cache_transformer(self):
+        """A cached parser is returned without constructing a default transformer."""
+        parser = quipper_parser(cache_dir=self.cache_dir.name)
+        with mock.patch('quippy.transformer.QuipperTransformer') as transformer:
+            self.assertIs(parser, quipper_parser(cache_dir=self.cache_dir.name))
+            quipper_parser(parser='fast')
+        transformer.assert_not_called()
+
+    def test_transformer_instance(self):
+        """A parser for a given transformer uses that instance and is not shared with other instances."""
+        class Counting(QuipperTransformer):
+            def __init__(self):
+                super().__init__()
+                self.circuits = 0
+
+            def circuit(self, t):
+                self.circuits += 1
+                return super().circuit(t)
+
+        first, second = Counting(), Counting()
+        for start in ['start', 'circuit']:
+            with self.subTest(start=start):
+                quipper_parser(start=start, transformer=first, cache_dir=self.cache_dir.name).parse(self.text)
+                quipper_parser(start=start, transformer=second, cache_dir=self.cache_dir.name).parse(self.text)
+                self.assertEqual(first.circuits, second.circuits)
+                self.assertLess(0, second.circuits)
+
+    def test_no_cache(self):
+        parser = quipper_parser(cache_dir=self.cache_dir.name)
+        self.assertIsNot(parser, quipper_parser(cache=False))
+
+    def test_disk_cache(self):
+        expected = quipper_parser(start='circuit', cache_dir=self.cache_dir.name).parse(self.text)
+        self.assertEqual(1, len(os.listdir(self.cache_dir.name)))
+        clear_cache()
+        parser = quipper_parser(start='circuit', cache_dir=self.cache_dir.name)
+        self.assertEqual('<deserialized>', parser.source)
+        parsed = parser.parse(self.text)
+        self.assertIsInstance(parsed, Circuit)
+        self.assertEqual(expected, parsed)
+
+    def test_corrupt_disk_cache(self):
+        quipper_parser(start='circuit', cache_dir=self.cache_dir.name)
+        for name in os.listdir(self.cache_dir.name):
+            with open(os.path.join(self.cache_dir.name, name), 'wb') as cache_file:
+                cache_file.write(b'garbage')
+        clear_cache()
+        parsed = quipper_parser(start='circuit', cache_dir=self.cache_dir.name).parse(self.text)
+        self.assertIsInstance(parsed, Circuit)
+
+    def test_tables_up_to_date(self):
+        """The shipped tables must be regenerated with quippy.build_tables when quipper.g changes."""
+        self.assertEqual(grammar_hash(GRAMMAR), _tables.GRAMMAR_HASH)
+
+    def test_lexers(self):
+        """The standard lexer of the LALR parsers parses every grammar rule like the contextual lexer."""
+        circuit_text, subroutine_text = TEXT.split('\n\n', 1)
+        samples = {
+            'start': [TEXT],
+            'circuit': [circuit_text + '\n'],
+            'subroutine': ['\n' + subroutine_text],
+            'arity': ['0:Qbit, 1:Cbit,\n', '3:Qbit\n'],
+            'type_assignment': ['0:Qbit', '1:Cbit'],
+            'control_app': ['', ' with controls=[+0,-1]', 'with nocontrol', 'with controls=[2] with nocontrol'],
+            'controlled': ['with controls=[+0,-1]'],
+            'gate': GATE_LINES,
+            'inversion': ['', '*'],
+            'wire_string_list': ['0:"a", 1:"b\\"c"'],
+            'wire': ['+3', '-0'],
+            'wire_list': ['1, -2,+3'],
+            'string': ['"Subroutine: \\"x\\""'],
+            'float': ['0.5', '-1e-05', '+2.'],
+            'int': ['-12'],
+            }
+        gate_rules = {'QGate': 'qgate', 'QRot': 'qrot', 'Gphase': 'gphase', 'CNot': 'cnot', 'CGate': 'cgate',
+                      'CSwap': 'cswap', 'QPrep': 'qprep', 'QUnprep': 'qunprep', 'QInit': 'qinit', 'CInit': 'cinit',
+                      'QTerm': 'qterm', 'CTerm': 'cterm', 'QMeas': 'qmeas', 'QDiscard': 'qdiscard',
+                      'CDiscard': 'cdiscard', 'DTerm': 'dterm', 'Subroutine': 'subroutine_call',
+                      'Comment': 'comment'}
+        for line in GATE_LINES:
+            samples.setdefault(gate_rules[re.match(r'[A-Za-z]+', line).group(0)], []).append(line)
+
+        rules = re.findall(r'^[?!]*([a-z_]+)\s*:', GRAMMAR, re.MULTILINE)
+        self.assertEqual(set(rules), set(samples))
+        for rule in rules:
+            standard = Lark(GRAMMAR, start=rule, parser='lalr', lexer='standard')
+            contextual = Lark(GRAMMAR, start=rule, parser='lalr', lexer='contextual')
+            for text in samples[rule]:
+                with self.subTest(rule=rule, text=text):
+                    self.assertEqual(contextual.parse(text), standard.parse(text))
+
+    def test_tables_options(self):
+        """The shipped tables, the cached and the uncached parsers use the same Lark options."""
+        for option, value in LALR_OPTIONS.items():
+            self.assertEqual(value, _tables.DATA['options'][option])
+            for start in ['start', 'circuit']:
+                for cache in [True, False]:
+                    with self.subTest(option=option, start=start, cache=cache):
+                        parser = quipper_parser(start=start, cache=cache, cache_dir=self.cache_dir.name)
+                        self.assertEqual(value, getattr(parser.options, option))
+
+    def test_tables(self):
+        text = '''Inputs: 0:Qbit, 1:Cbit
+        QGate["H"]*(0) with controls=[+3,-5, -6] with nocontrol
+        QRot["exp(-i%Z)", 1e-05](1)
+        Subroutine(x3)["SP", shape "([Q],())"] (3) -> (0) with controls=[+5] with nocontrol
+        Comment["ENTER: qft"](0:"qs[0]", 1:"qs[1]")
+        QInit0(3) with nocontrol
+        CTerm1(3)
+        Gphase() with t=0.5 with anchors=[0]
+        CNot(1) with controls=[+0]
+        Outputs: 0:Qbit, 1:Cbit
+
+        Subroutine: "SP"
+        Shape: "([Q],())"
+        Controllable: classically
+        Inputs: 0:Qbit
+        Outputs: 0:Qbit
+        '''
+        parser = quipper_parser(cache_dir=self.cache_dir.name)
+        self.assertEqual([], os.listdir(self.cache_dir.name))
+        self.assertEqual(quipper_parser(cache=False).parse(text), parser.parse(text))
@@ -0,0 +1,218 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import cmath
+import itertools
+import math
+import unittest
+from unittest import TestCase
+
+from quippy.parser import quipper_parser
+from quippy.transform import inline_circuit
+
+try:
+    import numpy as np
+    from quippy.sim import StateVector
+except ImportError:
+    np = None
+
+QUBITS = 'Inputs: 0:Qbit, 1:Qbit, 2:Qbit\n{}Outputs: 0:Qbit, 1:Qbit, 2:Qbit\n'
+
+SUBROUTINES_TEXT = '''Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+QGate["H"](0)
+Subroutine["prepare", shape "([Q,Q])"] (0,1) -> (0,1)
+Subroutine(x3)["rotate", shape "([Q])"]* (2) -> (2) with controls=[+0]
+Subroutine["prepare", shape "([Q,Q])"]* (0,1) -> (0,1) with controls=[-2]
+QRot["exp(-i%Z)",0.3](1)
+QGate["T"](1) with controls=[+2]
+Outputs: 0:Qbit, 1:Qbit, 2:Qbit
+
+Subroutine: "prepare"
+Shape: "([Q,Q])"
+Controllable: yes
+Inputs: 0:Qbit, 1:Qbit
+QInit0(5)
+QGate["H"](1)
+QGate["not"](5) with controls=[+1]
+QGate["V"](0) with controls=[+5]
+Subroutine["rotate", shape "([Q])"] (0) -> (0)
+QGate["not"](5) with controls=[+1]
+QTerm0(5)
+Gphase() with t=0.25 with anchors=[0]
+Outputs: 0:Qbit, 1:Qbit
+
+Subroutine: "rotate"
+Shape: "([Q])"
+Controllable: yes
+Inputs: 0:Qbit
+QGate["E"](0)
+QGate["omega"](0) with nocontrol
+QGate["T"](0)
+Outputs: 0:Qbit
+'''
+
+
+def gate_matrix(matrix, qubit: int, qubits=3):
+    """The matrix of a single-qubit gate on a qubit, with qubit 0 the most significant bit."""
+    return np.kron(np.kron(np.eye(2 ** qubit), matrix), np.eye(2 ** (qubits - qubit - 1)))
+
+
+def random_state(rng, qubits=3):
+    state = rng.normal(size=2 ** qubits) + 1j * rng.normal(size=2 ** qubits)
+    return state / np.linalg.norm(state)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestStateVector(TestCase):
+    def setUp(self):
+        self.rng = np.random.RandomState(0)
+
+    def run_lines(self, state, *lines, **kwargs):
+        circuit = quipper_parser(start='circuit').parse(QUBITS.format(''.join(line + '\n' for line in lines)))
+        return StateVector(**kwargs).run(circuit, state)
+
+    def assertGate(self, matrix, *lines):
+        state = random_state(self.rng)
+        np.testing.assert_allclose(matrix @ state, self.run_lines(state, *lines), atol=1e-12)
+
+    def test_single_qubit(self):
+        omega = cmath.exp(1j * math.pi / 4)
+        x = np.array([[0, 1], [1, 0]])
+        h = np.array([[1, 1], [1, -1]]) / math.sqrt(2)
+        s = np.diag([1, 1j])
+        matrices = {
+            'not': x,
+            'H': h,
+            'Y': np.array([[0, -1j], [1j, 0]]),
+            'Z': np.diag([1, -1]),
+            'S': s,
+            'T': np.diag([1, omega]),
+            'E': h @ s @ s @ s * omega ** 3,
+            'omega': omega * np.eye(2),
+            'V': np.array([[1 + 1j, 1 - 1j], [1 - 1j, 1 + 1j]]) / 2,
+            'iX': 1j * x,
+            }
+        for name, matrix in matrices.items():
+            with self.subTest(name=name):
+                self.assertGate(gate_matrix(matrix, 1), 'QGate["{}"](1)'.format(name))
+                self.assertGate(gate_matrix(matrix.conj().T, 2), 'QGate["{}"]*(2)'.format(name))
+        np.testing.assert_allclose(x, matrices['V'] @ matrices['V'])
+
+    def test_multinot(self):
+        x = np.array([[0, 1], [1, 0]])
+        self.assertGate(gate_matrix(x, 0) @ gate_matrix(x, 2), 'QGate["multinot"](0,2)')
+
+    def test_controls(self):
+        x = np.array([[0, 1], [1, 0]])
+        p0, p1 = np.diag([1, 0]), np.diag([0, 1])
+        # not on 2, controlled by +0 and -1
+        matrix = np.eye(8) + np.kron(np.kron(p1, p0), x - np.eye(2))
+        self.assertGate(matrix, 'QGate["not"](2) with controls=[+0,-1]')
+        h = np.array([[1, 1], [1, -1]]) / math.sqrt(2)
+        self.assertGate(np.eye(8) + np.kron(np.kron(p1, h - np.eye(2)), np.eye(2)),
+                        'QGate["H"](1) with controls=[+0] with nocontrol')
+
+    def test_two_qubit(self):
+        swap = np.eye(4)[[0, 2, 1, 3]]
+        self.assertGate(np.kron(np.eye(2), swap), 'QGate["swap"](1,2)')
+        r = math.sqrt(0.5)
+        w = np.array([[1, 0, 0, 0], [0, r, r, 0], [0, r, -r, 0], [0, 0, 0, 1]])
+        self.assertGate(np.kron(w, np.eye(2)), 'QGate["W"](0,1)')
+        self.assertGate(np.eye(8), 'QGate["W"](0,1)', 'QGate["W"]*(0,1)')
+        # W diagonalizes the swap.
+        self.assertGate(np.kron(np.diag([1, 1, -1, 1]), np.eye(2)),
+                        'QGate["W"](0,1)', 'QGate["swap"](0,1)', 'QGate["W"](0,1)')
+        self.assertGate(np.eye(8) + np.kron(np.diag([0, 1]), swap - np.eye(4)),
+                        'QGate["swap"](1,2) with controls=[+0]')
+
+    def test_rotations(self):
+        self.assertGate(gate_matrix(np.diag([cmath.exp(-0.3j), cmath.exp(0.3j)]), 0),
+                        'QRot["exp(-i%Z)",0.3](0)')
+        self.assertGate(gate_matrix(np.diag([1, 1j]), 1), 'QRot["R(2pi/%)",4.0](1)')
+        self.assertGate(gate_matrix(np.diag([1, -1j]), 1), 'QRot["R(2pi/%)",4.0]*(1)')
+
+    def test_phase(self):
+        phase = cmath.exp(0.5j * math.pi)
+        self.assertGate(phase * np.eye(8), 'Gphase() with t=0.5 with anchors=[0]')
+        self.assertGate(gate_matrix(np.diag([1, phase]), 2),
+                        'Gphase() with t=0.5 with controls=[+2] with anchors=[0]')
+
+    def test_init_term(self):
+        state = random_state(self.rng)
+        np.testing.assert_allclose(state, self.run_lines(
+            state, 'QInit1(3)', 'QGate["not"](3) with controls=[+0]', 'QGate["not"](3) with controls=[+0]',
+            'QGate["H"](3)', 'QGate["H"](3)', 'QTerm1(3)'), atol=1e-12)
+        with self.assertRaises(RuntimeError):
+            self.run_lines(state, 'QInit0(3)', 'QGate["H"](3)', 'QTerm0(3)')
+        with self.assertRaises(RuntimeError):
+            self.run_lines(state, 'QInit0(3)')
+        with self.assertRaises(RuntimeError):
+            self.run_lines(state, 'QGate["H"](4)')
+
+    def test_measure(self):
+        circuit = quipper_parser(start='circuit').parse(
+            'Inputs: 0:Qbit, 1:Qbit\nQGate["not"](1)\nQMeas(1)\nQGate["not"](0) with controls=[+1]\n'
+            'Outputs: 0:Qbit, 1:Cbit\n')
+        simulator = StateVector()
+        np.testing.assert_allclose([0, 1], simulator.run(circuit))
+        self.assertEqual({1: True}, simulator.bits)
+
+        circuit = quipper_parser(start='circuit').parse(
+            'Inputs: 0:Qbit, 1:Qbit\nQGate["H"](0)\nQGate["not"](1) with controls=[+0]\nQMeas(0)\n'
+            'Outputs: 0:Cbit, 1:Qbit\n')
+        simulator = StateVector(seed=1)
+        outcomes = set()
+        for _ in range(20):
+            state = simulator.run(circuit)
+            outcomes.add(simulator.bits[0])
+            np.testing.assert_allclose([0, 1] if simulator.bits[0] else [1, 0], state)
+        self.assertEqual({False, True}, outcomes)
+
+    def test_classical(self):
+        circuit = quipper_parser(start='circuit').parse(
+            'Inputs: 0:Cbit, 1:Cbit, 2:Qbit\nCGate["xor"](3,0,1)\nCGate["and"](4,0,1)\n'
+            'QGate["not"](2) with controls=[+3]\nCGate["and"]*(4,0,1)\nCInit1(5)\nCSwap(0,5)\n'
+            'CSwap(5,0)\nCTerm1(5)\nQPrep(0)\nOutputs: 0:Qbit, 1:Cbit, 2:Qbit, 3:Cbit\n')
+        simulator = StateVector()
+        for a, b in [(False, False), (False, True), (True, False), (True, True)]:
+            with self.subTest(a=a, b=b):
+                state = simulator.run(circuit, bits={0: a, 1: b})
+                expected = np.zeros(4)
+                expected[2 * a + (a != b)] = 1
+                np.testing.assert_allclose(expected, state)
+                self.assertEqual({1: b, 3: a != b}, simulator.bits)
+
+    def test_cgate_if(self):
+        circuit = quipper_parser(start='circuit').parse(
+            'Inputs: 0:Cbit, 1:Cbit, 2:Cbit\nCGate["if"](3,0,1,2)\nOutputs: 0:Cbit, 1:Cbit, 2:Cbit, 3:Cbit\n')
+        simulator = StateVector()
+        for a, b, c in itertools.product([False, True], repeat=3):
+            with self.subTest(a=a, b=b, c=c):
+                simulator.run(circuit, bits={0: a, 1: b, 2: c})
+                self.assertEqual(b if a else c, simulator.bits[3])
+
+    def test_subroutines(self):
+        """Calling subroutines gives the same state as inlining them."""
+        start = quipper_parser().parse(SUBROUTINES_TEXT)
+        state = random_state(self.rng)
+        expected = StateVector().run(inline_circuit(start), state)
+        simulator = StateVector(start.subroutines)
+        np.testing.assert_allclose(expected, simulator.run(start.circuit, state), atol=1e-12)
+        self.assertEqual({('prepare', False), ('prepare', True), ('rotate', False), ('rotate', True)},
+                         set(simulator._compiled))
+
+    def test_unknown_subroutine(self):
+        start = quipper_parser().parse(SUBROUTINES_TEXT)
+        with self.assertRaises(RuntimeError):
+            StateVector().run(start.circuit)
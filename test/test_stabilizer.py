@@ -0,0 +1,235 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+from unittest import TestCase
+
+from quippy.parser import quipper_parser
+
+try:
+    import numpy as np
+    import quippy.sim
+    from quippy.sim import StateVector, Stabilizer, is_clifford
+except ImportError:
+    np = None
+
+QUBITS = 5
+
+CLIFFORD_GATES = [
+    'QGate["not"]({a})', 'QGate["H"]({a})', 'QGate["multinot"]({a},{b})', 'QGate["Y"]({a})', 'QGate["Z"]({a})',
+    'QGate["S"]({a})', 'QGate["S"]*({a})', 'QGate["E"]({a})', 'QGate["E"]*({a})', 'QGate["omega"]({a})',
+    'QGate["V"]({a})', 'QGate["V"]*({a})', 'QGate["swap"]({a},{b})', 'QGate["iX"]({a})',
+    'QGate["not"]({a}) with controls=[+{b}]', 'QGate["not"]({a}) with controls=[-{b}]',
+    'QGate["Z"]({a}) with controls=[+{b}]', 'QGate["Y"]({a}) with controls=[-{b}]',
+    'QGate["iX"]({a}) with controls=[+{b}]', 'QGate["iX"]*({a}) with controls=[-{b}]',
+    'QGate["multinot"]({a},{c}) with controls=[+{b}]',
+    'QRot["exp(-i%Z)",0.7853981633974483]({a})', 'QRot["R(2pi/%)",4.0]*({a})', 'QRot["R(2pi/%)",2.0]({a})',
+    'Gphase() with t=0.5 with controls=[+{a}] with anchors=[{b}]',
+    'Gphase() with t=1.5 with controls=[-{a}] with anchors=[{b}]', 'Gphase() with t=0.3 with anchors=[{a}]',
+    ]
+
+PAULIS = {
+    'I': np.eye(2) if np else None,
+    'X': np.array([[0, 1], [1, 0]]) if np else None,
+    'Y': np.array([[0, -1j], [1j, 0]]) if np else None,
+    'Z': np.diag([1, -1]) if np else None,
+    }
+
+
+def random_lines(rng: random.Random, gates: int, qubits=QUBITS):
+    lines = []
+    for _ in range(gates):
+        a, b, c = rng.sample(range(1, qubits + 1), 3)
+        lines.append(rng.choice(CLIFFORD_GATES).format(a=a, b=b, c=c))
+    return lines
+
+
+def circuit_text(lines, outputs, qubits=QUBITS):
+    inputs = ', '.join('{}:Qbit'.format(wire) for wire in range(1, qubits + 1))
+    return 'Inputs: {}\n{}Outputs: {}\n'.format(inputs, ''.join(line + '\n' for line in lines), outputs)
+
+
+def pauli_matrix(generator: str):
+    matrix = np.ones((1, 1))
+    for pauli in generator[1:]:
+        matrix = np.kron(matrix, PAULIS[pauli])
+    return -matrix if generator[0] == '-' else matrix
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestStabilizer(TestCase):
+    def parse(self, text):
+        return quipper_parser(start='circuit').parse(text)
+
+    def assertStabilized(self, generators, state):
+        self.assertEqual(int(round(np.log2(len(state)))), len(generators))
+        for generator in generators:
+            np.testing.assert_allclose(state, pauli_matrix(generator) @ state, atol=1e-9, err_msg=generator)
+
+    def all_qubits(self, qubits=QUBITS):
+        return ', '.join('{}:Qbit'.format(wire) for wire in range(1, qubits + 1))
+
+    def test_random(self):
+        """The state of the statevector simulator is stabilized by the generators."""
+        rng = random.Random(0)
+        for _ in range(100):
+            circuit = self.parse(circuit_text(random_lines(rng, 40), self.all_qubits()))
+            self.assertTrue(is_clifford(circuit))
+            simulator = Stabilizer()
+            simulator.run(circuit)
+            self.assertStabilized(simulator.stabilizers(), StateVector().run(circuit))
+
+    def test_measure(self):
+        """Measurements give outcomes with a nonzero probability and leave the projected state."""
+        rng = random.Random(1)
+        outcomes = set()
+        for seed in range(100):
+            lines = random_lines(rng, 30)
+            measured = rng.sample(range(1, QUBITS + 1), 2)
+            kept = [wire for wire in range(1, QUBITS + 1) if wire not in measured]
+            outputs = ', '.join(['{}:Qbit'.format(wire) for wire in kept] +
+                                ['{}:Cbit'.format(wire) for wire in measured])
+            circuit = self.parse(circuit_text(lines + ['QMeas({})'.format(wire) for wire in measured], outputs))
+            simulator = Stabilizer(seed=seed)
+            bits = simulator.run(circuit)
+            outcomes.add(tuple(bits[wire] for wire in measured))
+
+            # Project the state before the measurements on the outcomes.
+            state = StateVector().run(self.parse(circuit_text(lines, self.all_qubits()))).reshape((2,) * QUBITS)
+            state = np.moveaxis(state, [wire - 1 for wire in measured], [0, 1])[int(bits[measured[0]]),
+                                                                                  int(bits[measured[1]])]
+            probability = np.vdot(state, state).real
+            self.assertIn(round(probability, 6), {1, 0.5, 0.25})
+            self.assertStabilized(simulator.stabilizers(), state.reshape(-1) / np.sqrt(probability))
+        self.assertEqual(4, len(outcomes))
+
+    def test_init_term(self):
+        rng = random.Random(2)
+        for _ in range(30):
+            lines = random_lines(rng, 20)
+            # The ancillas are entangled and disentangled again, and terminated later.
+            ancillas = ['QInit0(9)', 'QGate["not"](9) with controls=[+1]', 'QGate["not"](9) with controls=[+2]',
+                        'QInit1(10)', 'QGate["H"](10)', 'QGate["Z"](10) with controls=[+1]',
+                        'QGate["Z"](10) with controls=[+1]', 'QGate["H"](10)',
+                        'QGate["not"](9) with controls=[+2]', 'QGate["not"](9) with controls=[+1]']
+            terms = ['QTerm1(10)', 'QTerm0(9)']
+            circuit = self.parse(circuit_text(lines[:10] + ancillas + lines[10:] + terms, self.all_qubits()))
+            simulator = Stabilizer()
+            simulator.run(circuit)
+            expected = StateVector().run(self.parse(circuit_text(lines, self.all_qubits())))
+            self.assertStabilized(simulator.stabilizers(), expected)
+
+        with self.assertRaises(RuntimeError):
+            Stabilizer().run(self.parse('Inputs: 0:Qbit, 1:Qbit\nQGate["H"](0)\nQTerm0(0)\nOutputs: 1:Qbit\n'))
+        with self.assertRaises(RuntimeError):
+            Stabilizer().run(self.parse('Inputs: 0:Qbit, 1:Qbit\nQGate["not"](0)\nQTerm0(0)\nOutputs: 1:Qbit\n'))
+        with self.assertRaises(RuntimeError):
+            Stabilizer().run(self.parse('Inputs: 0:Qbit\nQInit0(1)\nOutputs: 0:Qbit\n'))
+
+    def test_classical(self):
+        circuit = self.parse('Inputs: 0:Qbit, 1:Cbit, 2:Qbit\nQGate["not"](0) with controls=[+1]\n'
+                             'QGate["H"](2) with controls=[-1]\nQGate["not"](2) with controls=[+0,-1]\n'
+                             'CInit1(3)\nQGate["Z"](0) with controls=[+3]\nCTerm1(3)\nQMeas(0)\n'
+                             'QGate["not"](2) with controls=[+0]\nOutputs: 0:Cbit, 1:Cbit, 2:Qbit\n')
+        self.assertTrue(is_clifford(circuit))
+        simulator = Stabilizer(seed=0)
+        self.assertEqual({0: True, 1: True}, simulator.run(circuit, bits={1: True}))
+        self.assertEqual(['-Z'], simulator.stabilizers())
+        self.assertEqual({0: False, 1: False}, simulator.run(circuit))
+        self.assertEqual(['+X'], simulator.stabilizers())
+
+    def test_subroutines(self):
+        text = '''Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+QGate["H"](0)
+Subroutine["prepare", shape "([Q,Q])"] (0,1) -> (0,1)
+Subroutine(x3)["rotate", shape "([Q])"]* (2) -> (2) with controls=[+0]
+Subroutine["prepare", shape "([Q,Q])"]* (1,2) -> (1,2) with controls=[-0]
+QGate["not"](1) with controls=[+2]
+Outputs: 0:Qbit, 1:Qbit, 2:Qbit
+
+Subroutine: "prepare"
+Shape: "([Q,Q])"
+Controllable: yes
+Inputs: 0:Qbit, 1:Qbit
+QInit0(5)
+QGate["H"](1) with nocontrol
+QGate["not"](5) with controls=[+1] with nocontrol
+QGate["not"](0)
+QGate["Z"](0)
+Subroutine["rotate", shape "([Q])"] (0) -> (0)
+QGate["not"](5) with controls=[+1] with nocontrol
+QTerm0(5)
+QGate["S"](1) with nocontrol
+Outputs: 0:Qbit, 1:Qbit
+
+Subroutine: "rotate"
+Shape: "([Q])"
+Controllable: yes
+Inputs: 0:Qbit
+QGate["iX"](0)
+QGate["omega"](0) with nocontrol
+QGate["Y"](0)
+Outputs: 0:Qbit
+'''
+        start = quipper_parser().parse(text)
+        self.assertTrue(is_clifford(start.circuit, start.subroutines))
+        self.assertIsInstance(quippy.sim.simulator(start.circuit, start.subroutines), Stabilizer)
+        simulator = Stabilizer(start.subroutines)
+        simulator.run(start.circuit)
+        self.assertStabilized(simulator.stabilizers(), StateVector(start.subroutines).run(start.circuit))
+
+    def test_is_clifford(self):
+        def clifford(*lines):
+            return is_clifford(self.parse('Inputs: 0:Qbit, 1:Qbit, 2:Qbit, 3:Cbit\n{}\nOutputs: 0:Qbit, 1:Qbit, '
+                                          '2:Qbit, 3:Cbit\n'.format('\n'.join(lines))))
+
+        self.assertTrue(clifford('QGate["not"](0) with controls=[+1,+3]'))
+        self.assertFalse(clifford('QGate["T"](0)'))
+        self.assertFalse(clifford('QGate["W"](0,1)'))
+        self.assertFalse(clifford('QGate["H"](0) with controls=[+1]'))
+        self.assertFalse(clifford('QGate["not"](0) with controls=[+1,+2]'))
+        self.assertFalse(clifford('QRot["exp(-i%Z)",0.1](0)'))
+        self.assertFalse(clifford('Gphase() with t=0.25 with controls=[+0] with anchors=[1]'))
+        self.assertTrue(clifford('QMeas(1)', 'QGate["not"](0) with controls=[+1,+2]'))
+        self.assertFalse(clifford('QGate["not"](0) with controls=[+1,+2]', 'QMeas(1)'))
+
+        text = ('Inputs: 0:Qbit, 1:Qbit, 2:Qbit\n{}\nOutputs: 0:Qbit, 1:Qbit, 2:Qbit\n\n'
+                'Subroutine: "sub"\nShape: "x"\nControllable: yes\nInputs: 0:Qbit, 1:Qbit\n'
+                'QGate["not"](1) with controls=[+0]\nOutputs: 0:Qbit, 1:Qbit\n')
+        start = quipper_parser().parse(text.format('Subroutine["sub", shape "x"] (0,1) -> (0,1)'))
+        self.assertTrue(is_clifford(start.circuit, start.subroutines))
+        self.assertFalse(is_clifford(start.circuit))
+        start = quipper_parser().parse(text.format('Subroutine["sub", shape "x"] (0,1) -> (0,1) with controls=[+2]'))
+        self.assertFalse(is_clifford(start.circuit, start.subroutines))
+        self.assertIsInstance(quippy.sim.simulator(start.circuit, start.subroutines), StateVector)
+        with self.assertRaises(RuntimeError):
+            Stabilizer(start.subroutines).run(start.circuit)
+
+    def test_large(self):
+        """A GHZ state of many qubits, which grows the tableau, has equal measurement outcomes."""
+        qubits = 1000
+        lines = ['QGate["H"](0)']
+        for wire in range(1, qubits):
+            lines += ['QInit0({})'.format(wire), 'QGate["not"]({}) with controls=[+{}]'.format(wire, wire - 1)]
+        lines += ['QMeas({})'.format(wire) for wire in reversed(range(qubits))]
+        circuit = self.parse('Inputs: 0:Qbit\n{}\nOutputs: {}\n'.format(
+            '\n'.join(lines), ', '.join('{}:Cbit'.format(wire) for wire in range(qubits))))
+        simulator = Stabilizer(seed=0)
+        for _ in range(2):
+            self.assertEqual(1, len(set(simulator.run(circuit).values())))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import itertools
+import os
+import tempfile
+from unittest import TestCase
+
+from quippy import binary
+from quippy.parser import quipper_parser
+from quippy.stream import iter_gates, parse_file, Inputs, Outputs, SubroutineHeader
+from quippy.transformer import *
+
+TEXT = '''Inputs: 0:Qbit, 1:Cbit
+QGate["H"]*(0) with controls=[+3,-5, -6] with nocontrol
+QRot["exp(-i%Z)", 1e-05](1)
+Subroutine(x3)["SP", shape "([Q],())"] (3) -> (0) with controls=[+5] with nocontrol
+QInit0(3) with nocontrol
+Outputs: 0:Qbit, 1:Cbit
+
+Subroutine: "SP"
+Shape: "([Q],())"
+Controllable: classically
+Inputs: 0:Qbit
+QMeas(0)
+Outputs: 0:Qbit
+'''
+
+
+class TestStream(TestCase):
+    def test_events(self):
+        events = list(iter_gates(io.StringIO(TEXT)))
+        self.assertEqual([Inputs, QGate, QRot, SubroutineCall, QInit, Outputs,
+                          SubroutineHeader, Inputs, QMeas, Outputs],
+                         [type(event) for event in events])
+        self.assertEqual(SubroutineHeader(name="SP", shape="([Q],())",
+                                          controllable=Subroutine_Control.classically),
+                         events[6])
+
+    def test_same_as_parser(self):
+        start = quipper_parser().parse(TEXT)
+        events = list(iter_gates(io.StringIO(TEXT)))
+        self.assertEqual(Inputs(start.circuit.inputs), events[0])
+        self.assertEqual(start.circuit.gates, events[1:5])
+        self.assertEqual(Outputs(start.circuit.outputs), events[5])
+        self.assertEqual(start.subroutines[0].circuit.gates, events[8:9])
+
+    def test_lazy(self):
+        """Gates are produced before the rest of the input is read."""
+        lines = itertools.chain(TEXT.splitlines()[:2], iter(lambda: self.fail("Read too far"), None))
+        events = iter_gates(lines)
+        self.assertIsInstance(next(events), Inputs)
+        self.assertIsInstance(next(events), QGate)
+
+    def test_error_line(self):
+        with self.assertRaisesRegex(RuntimeError, "line 2"):
+            list(iter_gates(io.StringIO('Inputs: 0:Qbit\nQGate["H"(0)\n')))
+
+    def test_binary(self):
+        expected = list(iter_gates(io.StringIO(TEXT)))
+        for parser in ['lalr', 'fast']:
+            with self.subTest(parser=parser):
+                self.assertEqual(expected, list(iter_gates(io.BytesIO(TEXT.encode()), parser=parser)))
+
+    def test_binary_error_line(self):
+        with self.assertRaisesRegex(RuntimeError, "line 2"):
+            list(iter_gates(io.BytesIO(b'Inputs: 0:Qbit\nQGate["H"(0)\n'), parser='fast'))
+
+
+class TestParseFile(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'circuit')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+
+    def test_parse_file(self):
+        self.write(TEXT)
+        expected = quipper_parser().parse(TEXT)
+        for parser in ['lalr', 'fast']:
+            with self.subTest(parser=parser):
+                self.assertEqual(expected, parse_file(self.path, parser=parser))
+
+    def test_empty(self):
+        self.write('')
+        with self.assertRaises(RuntimeError):
+            parse_file(self.path)
+
+    def test_cache(self):
+        self.write(TEXT)
+        cache = os.path.join(self.directory.name, 'cache')
+        expected = quipper_parser().parse(TEXT)
+        self.assertEqual(expected, parse_file(self.path, cache=cache))
+        entries = os.listdir(cache)
+        self.assertEqual(1, len(entries))
+
+        # The entry is used instead of parsing the file.
+        with open(os.path.join(cache, entries[0]), 'wb') as f:
+            binary.dump(quipper_parser().parse(TEXT.replace('"H"', '"T"')), f)
+        self.assertNotEqual(expected, parse_file(self.path, cache=cache))
+
+        # A changed file gets a new entry.
+        self.write(TEXT + '\n')
+        self.assertEqual(expected, parse_file(self.path, cache=cache))
+        self.assertEqual(2, len(os.listdir(cache)))
+
+    def test_corrupt_cache(self):
+        self.write(TEXT)
+        cache = os.path.join(self.directory.name, 'cache')
+        parse_file(self.path, cache=cache)
+        entry = os.path.join(cache, os.listdir(cache)[0])
+        with open(entry, 'r+b') as f:
+            f.truncate(20)
+        self.assertEqual(quipper_parser().parse(TEXT), parse_file(self.path, cache=cache))
+        with open(entry, 'rb') as f:
+            self.assertEqual(quipper_parser().parse(TEXT), binary.load(f))
+
+    def test_unusable_cache(self):
+        """A cache directory that can not be created does not fail the parse."""
+        self.write(TEXT)
+        cache = os.path.join(self.path, 'cache')
+        self.assertEqual(quipper_parser().parse(TEXT), parse_file(self.path, cache=cache))
+        self.assertFalse(os.path.exists(cache))
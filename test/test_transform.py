@@ -0,0 +1,143 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+from collections import Counter
+from unittest import TestCase
+
+from quippy.analysis import count_resources, gate_key
+from quippy.parser import quipper_parser
+from quippy.transform import inline, inline_circuit
+from quippy.transformer import *
+from test.test_analysis import TEXT as RESOURCES_TEXT, nested_text
+
+SUBROUTINE = '''
+Subroutine: "A"
+Shape: "([Q,Q],())"
+Controllable: yes
+Inputs: 0:Qbit, 1:Qbit
+QInit0(2)
+QGate["not"](2) with controls=[+0]
+QGate["T"](1) with controls=[-2]
+QGate["H"](0) with nocontrol
+QTerm0(2)
+Outputs: 0:Qbit, 1:Qbit
+'''
+
+
+def gates(*lines: str) -> List[Gate]:
+    return [quipper_parser(start='gate').parse(line) for line in lines]
+
+
+class TestInline(TestCase):
+    def inline(self, main: str, **kwargs) -> Circuit:
+        return inline_circuit(quipper_parser().parse(main + SUBROUTINE), **kwargs)
+
+    def test_call(self):
+        inlined = self.inline('''Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+        Subroutine["A", shape "([Q,Q],())"] (2,0) -> (2,0)
+        QGate["H"](1)
+        Outputs: 0:Qbit, 1:Qbit, 2:Qbit
+        ''')
+        self.assertEqual(gates('QInit0(3)', 'QGate["not"](3) with controls=[+2]',
+                               'QGate["T"](0) with controls=[-3]', 'QGate["H"](2) with nocontrol',
+                               'QTerm0(3)', 'QGate["H"](1)'), inlined.gates)
+        self.assertEqual([Wire(0), Wire(1), Wire(2)], [output.wire for output in inlined.outputs])
+
+    def test_renamed_outputs(self):
+        """The outputs of a call can be other wires than its inputs."""
+        inlined = self.inline('''Inputs: 3:Qbit, 4:Qbit
+        Subroutine["A", shape "([Q,Q],())"] (3,4) -> (0,1)
+        QGate["H"](0)
+        QInit0(3)
+        Outputs: 0:Qbit, 1:Qbit, 3:Qbit
+        ''')
+        self.assertEqual(gates('QGate["H"](3)', 'QInit0(5)'), inlined.gates[-2:])
+        self.assertEqual([Wire(3), Wire(4), Wire(5)], [output.wire for output in inlined.outputs])
+
+    def test_inverted_controlled(self):
+        inlined = self.inline('''Inputs: 0:Qbit, 1:Qbit, 2:Qbit
+        Subroutine["A", shape "([Q,Q],())"]* (0,1) -> (0,1) with controls=[+2]
+        Outputs: 0:Qbit, 1:Qbit, 2:Qbit
+        ''')
+        self.assertEqual(gates('QInit0(3)', 'QGate["H"]*(0) with nocontrol',
+                               'QGate["T"]*(1) with controls=[-3,+2]',
+                               'QGate["not"]*(3) with controls=[+0,+2]', 'QTerm0(3)'), inlined.gates)
+
+    def test_repetitions(self):
+        """Repetitions are unrolled and reuse the ancilla of the previous repetition."""
+        inlined = self.inline('''Inputs: 0:Qbit, 1:Qbit
+        Subroutine(x3)["A", shape "([Q,Q],())"] (0,1) -> (0,1)
+        Outputs: 0:Qbit, 1:Qbit
+        ''')
+        self.assertEqual(15, len(inlined.gates))
+        self.assertEqual({Wire(2)}, {gate.wire for gate in inlined.gates if isinstance(gate, QInit)})
+
+    def test_counts(self):
+        """The inlined circuit has the gates counted by count_resources."""
+        # Discarded wires can not be inverted.
+        start = quipper_parser().parse(RESOURCES_TEXT.replace('QDiscard', 'QTerm0'))
+        resources = count_resources(start)
+        inlined = Counter(gate_key(gate) for gate in inline(start) if not isinstance(gate, Comment))
+        self.assertEqual(resources.gates, inlined)
+
+    def test_lazy(self):
+        """Gates are generated without expanding the whole circuit."""
+        start = quipper_parser(parser='fast').parse(nested_text(4, 1000))
+        first = list(itertools.islice(inline(start), 5))
+        self.assertEqual(5, len(first))
+        self.assertTrue(all(isinstance(gate, QGate) for gate in first))
+
+    def test_max_gates(self):
+        start = quipper_parser(parser='fast').parse(nested_text(4, 1000))
+        with self.assertRaises(RuntimeError):
+            inline(start, max_gates=10 ** 6)
+        self.assertEqual(100, len(list(inline(quipper_parser().parse(nested_text(2, 10)), max_gates=100))))
+
+    def test_negative_control_on_wire_zero(self):
+        """A negative control can not be mapped to wire 0, since Wire(-0) is Wire(0)."""
+        with self.assertRaises(RuntimeError):
+            inline_circuit(quipper_parser().parse('''Inputs: 0:Qbit, 1:Qbit
+            Subroutine["f", shape "([Q,Q])"] (0,1) -> (0,1)
+            Outputs: 0:Qbit, 1:Qbit
+
+            Subroutine: "f"
+            Shape: "([Q,Q])"
+            Controllable: yes
+            Inputs: 5:Qbit, 6:Qbit
+            QGate["not"](6) with controls=[-5]
+            Outputs: 5:Qbit, 6:Qbit
+            '''))
+        # Wire 0 of the main circuit is released by D, but it is not reused for the ancilla of A.
+        inlined = self.inline('''Inputs: 0:Qbit, 1:Qbit
+        Subroutine["D", shape "([Q])"] (0) -> (0)
+        Subroutine["A", shape "([Q,Q],())"] (0,1) -> (0,1)
+        Outputs: 0:Qbit, 1:Qbit
+
+        Subroutine: "D"
+        Shape: "([Q])"
+        Controllable: yes
+        Inputs: 0:Qbit
+        QTerm0(0)
+        QInit0(1)
+        Outputs: 1:Qbit
+        ''')
+        t_gate, = [gate for gate in inlined.gates if isinstance(gate, QGate) and gate.op == QGate_Op.T]
+        self.assertLess(t_gate.control.controlled[0].i, 0)
+
+    def test_not_invertible(self):
+        text = nested_text(1, 1).replace('QGate["T"](0)', 'QMeas(0)').replace(
+            '] (0) -> (0)', ']* (0) -> (0)', 1)
+        with self.assertRaises(RuntimeError):
+            list(inline(quipper_parser().parse(text)))
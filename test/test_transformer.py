@@ -19,6 +19,8 @@ import unittest
 from pathlib import Path
 from unittest import TestCase
 
+from lark import Tree
+
 from quippy.parser import quipper_parser
 from quippy.transformer import *
 
@@ -144,6 +146,109 @@ class TestTransformer(TestCase):
             control=Control(controlled=[], no_control=False)
             ), parsed)
 
+    def test_gphase_gate(self):
+        text = '''Gphase() with t=0.5 with controls=[+1] with nocontrol with anchors=[0,2]'''
+        parser = self.parser('gate')
+        parsed = parser.parse(text)
+        self.assertEqual(GPhase(
+            timestep=0.5,
+            control=Control(controlled=[Wire(1)], no_control=True),
+            anchors=[Wire(0), Wire(2)]
+            ), parsed)
+
+    def test_cnot_gate(self):
+        text = '''CNot(1) with controls=[-0]'''
+        parser = self.parser('gate')
+        parsed = parser.parse(text)
+        self.assertEqual(CNot(wire=Wire(1), control=Control(controlled=[Wire(-0)], no_control=False)),
+                         parsed)
+
+    def test_cgate_gate(self):
+        text = '''CGate["and"]*(2,0,1) with nocontrol'''
+        parser = self.parser('gate')
+        parsed = parser.parse(text)
+        self.assertEqual(CGate(name="and", inverted=True, wires=[Wire(2), Wire(0), Wire(1)]), parsed)
+
+    def test_cswap_gate(self):
+        text = '''CSwap(0,1) with controls=[+2]'''
+        parser = self.parser('gate')
+        parsed = parser.parse(text)
+        self.assertEqual(CSwap(wires=[Wire(0), Wire(1)],
+                               control=Control(controlled=[Wire(2)], no_control=False)), parsed)
+
+    def test_qprep_gate(self):
+        text = '''QPrep(1) with nocontrol'''
+        parser = self.parser('gate')
+        parsed = parser.parse(text)
+        self.assertEqual(QPrep(wire=Wire(1)), parsed)
+
+    def test_qunprep_gate(self):
+        text = '''QUnprep(1)'''
+        parser = self.parser('gate')
+        parsed = parser.parse(text)
+        self.assertEqual(QUnprep(wire=Wire(1)), parsed)
+
+    def test_dterm_gate(self):
+        text = '''DTerm1(3)'''
+        parser = self.parser('gate')
+        parsed = parser.parse(text)
+        self.assertEqual(DTerm(value=True, wire=Wire(3)), parsed)
+
+    def test_register_qgate(self):
+        text = '''QGate["Hadamard"](0)'''
+        for parser in ['lalr', 'fast']:
+            with self.subTest(parser=parser):
+                with self.assertRaises(RuntimeError):
+                    quipper_parser(start='gate', parser=parser).parse(text)
+        register_qgate('Hadamard', QGate_Op.H)
+        self.addCleanup(QGATE_NAMES.pop, 'Hadamard')
+        for parser in ['lalr', 'fast']:
+            with self.subTest(parser=parser):
+                parsed = quipper_parser(start='gate', parser=parser).parse(text)
+                self.assertEqual(QGate(op=QGate_Op.H, inverted=False, wires=[Wire(0)],
+                                       control=Control(controlled=[], no_control=False)), parsed)
+
+    def test_register_qrot(self):
+        register_qrot('Rz', QRot_Op.ExpZt)
+        self.addCleanup(QROT_NAMES.pop, 'Rz')
+        parsed = self.parser('gate').parse('''QRot["Rz", 0.5](1)''')
+        self.assertEqual(QRot(op=QRot_Op.ExpZt, timestep=0.5, inverted=False, wire=Wire(1)), parsed)
+
+    def test_interned_names(self):
+        text = '''Subroutine["SP", shape "()"] (0) -> (0)'''
+        for parser in ['lalr', 'fast']:
+            with self.subTest(parser=parser):
+                first = quipper_parser(start='gate', parser=parser).parse(text)
+                second = quipper_parser(start='gate', parser=parser).parse(text)
+                self.assertIs(first.name, second.name)
+
+    def test_all_gates_typed(self):
+        """Every gate in the grammar is transformed to a Gate, no lark Tree remains."""
+        text = '''Inputs: 0:Qbit, 1:Cbit, 2:Cbit
+        QGate["H"](0)
+        QRot["exp(-i%Z)", 0.5](0)
+        Gphase() with t=0.5 with anchors=[0]
+        CNot(1) with controls=[+2]
+        CGate["xor"](2,1)
+        CSwap(1,2)
+        QPrep(3)
+        QUnprep(3)
+        QInit0(4)
+        CInit1(5)
+        QTerm0(4)
+        CTerm1(5)
+        QMeas(0)
+        QDiscard(0)
+        CDiscard(1)
+        DTerm0(6)
+        Subroutine["SP", shape "()"] (0) -> (0)
+        Comment["note"](0:"a")
+        Outputs: 2:Cbit
+        '''
+        for gate in self.parser().parse(text).circuit.gates:
+            with self.subTest(gate=gate):
+                self.assertIsInstance(gate, Gate)
+
     def test_subroutine(self):
         text = '''
         Subroutine: "S1"
@@ -316,6 +421,24 @@ class TestTransformer(TestCase):
                     e = sys.exc_info()[0]
                     raise RuntimeError("Failed to parse {}. Error: {}".format(path, e.message))
 
+    @unittest.skipUnless((Path(__file__).parents[1] / "resources" / "optimizer").exists(),
+                         "optimizer resource does not exist")
+    def test_optimizer_typed(self):
+        """No lark Tree remains in the main circuit or the subroutines of the files in the optimizer resource."""
+        optimizer_files_path = Path(__file__).parents[1] / "resources" / "optimizer" / "**"
+        optimizer_files = glob.glob(str(optimizer_files_path), recursive=True)
+        quipper_paths = filter(lambda path: not path.is_dir()
+                                            and path.suffix == '',
+                               map(lambda s: Path(s), optimizer_files))
+        parser = self.parser()
+        for path in quipper_paths:
+            with self.subTest(path=str(path)):
+                with open(str(path)) as quipper_file:
+                    parsed = parser.parse(quipper_file.read())
+                circuits = [parsed.circuit] + [subroutine.circuit for subroutine in parsed.subroutines]
+                self.assertEqual([], [gate for circuit in circuits for gate in circuit.gates
+                                      if isinstance(gate, Tree)])
+
     @unittest.skip("Malformed files")
     def test_simcount(self):
         """Try to parse all files in the simcount resource folder."""
@@ -343,3 +466,36 @@ class TestTransformer(TestCase):
                     print("Failed to parse {}. Error: {}".format(path, e.message))
                     success = False
         self.fail()
+
+
+class TestCompactTransformer(TestCase):
+    text = '''Inputs: 0:Qbit, 1:Qbit
+        QGate["H"](0)
+        QGate["not"](1) with controls=[+0]
+        QGate["H"](0) with nocontrol
+        QMeas(1)
+        Outputs: 0:Qbit, 1:Cbit
+        '''
+
+    def test_equal(self):
+        expected = quipper_parser().parse(self.text)
+        for parser in ['lalr', 'fast']:
+            with self.subTest(parser=parser):
+                self.assertEqual(expected, quipper_parser(
+                    parser=parser, transformer=CompactQuipperTransformer()).parse(self.text))
+
+    def test_shared(self):
+        for parser in ['lalr', 'fast']:
+            with self.subTest(parser=parser):
+                gates = quipper_parser(parser=parser, transformer=CompactQuipperTransformer()
+                                       ).parse(self.text).circuit.gates
+                self.assertIs(gates[0].wires[0], gates[1].control.controlled[0])
+                self.assertIs(gates[1].wires[0], gates[3].wire)
+                self.assertIs(EMPTY_CONTROL, gates[0].control)
+                self.assertIs(EMPTY_NO_CONTROL, gates[2].control)
+
+    def test_slots(self):
+        gate = QMeas(wire=Wire(0))
+        self.assertFalse(hasattr(gate, '__dict__'))
+        with self.assertRaises(AttributeError):
+            gate.extra = 1
@@ -0,0 +1,154 @@
+# Copyright 2018 Eddie Schoute
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import random
+from unittest import TestCase
+
+from quippy import writer
+from quippy.parser import quipper_parser
+from quippy.stream import iter_gates
+from quippy.transformer import *
+from quippy.writer import dumps, format_gate, write_circuit, write_events
+
+TEXT = '''Inputs: 0:Qbit, 1:Qbit, 2:Cbit
+QGate["not"](0) with controls=[+1,-2] with nocontrol
+QGate["H"]*(1)
+QRot["exp(-i%Z)",0.125](0)
+Gphase() with t=-0.5 with controls=[+1] with anchors=[0,1]
+CNot(2) with controls=[+0]
+CGate["if"]*(2,0)
+CSwap(0,1) with controls=[-2]
+QPrep(1)
+QUnprep(1)
+QInit1(3)
+QTerm0(3)
+CInit0(4)
+CTerm1(4)
+QMeas(1)
+CDiscard(1)
+DTerm0(2)
+Subroutine(x3)["sub", shape "([Q,Q])"]* (0,1) -> (0,1) with controls=[+2]
+Comment["ENTER: sub"](0:"in", 1:"in[1]")
+Comment["EXIT"]()
+QDiscard(0)
+Outputs: 2:Cbit
+
+Subroutine: "sub"
+Shape: "([Q,Q])"
+Controllable: yes
+Inputs: 0:Qbit, 1:Qbit
+QGate["W"](0,1)
+Outputs: 0:Qbit, 1:Qbit
+'''
+
+
+def random_gate(rng: random.Random) -> Gate:
+    def wire():
+        return Wire(rng.randrange(100))
+
+    def wires(n=None):
+        return [wire() for _ in range(n or rng.randint(1, 3))]
+
+    def control():
+        controlled = [Wire(rng.choice([1, -1]) * rng.randint(1, 100)) for _ in range(rng.randint(0, 2))]
+        return Control(controlled=controlled, no_control=rng.random() < 0.3)
+
+    def timestep():
+        return rng.choice([0.0, 1.0, -2.5, rng.uniform(-10, 10), 1e-20, 3e30])
+
+    def string():
+        return rng.choice(['', 'name', 'a b', 'ENTER: f(x)', 'shape [Q,(Q,C)]'])
+
+    return rng.choice([
+        lambda: QGate(op=rng.choice(list(QGate_Op)), inverted=rng.random() < 0.5, wires=wires(),
+                      control=control()),
+        lambda: QRot(op=rng.choice(list(QRot_Op)), timestep=timestep(), inverted=rng.random() < 0.5,
+                     wire=wire()),
+        lambda: GPhase(timestep=timestep(), control=control(), anchors=wires()),
+        lambda: CNot(wire=wire(), control=control()),
+        lambda: CGate(name=string() or 'xor', inverted=rng.random() < 0.5, wires=wires()),
+        lambda: CSwap(wires=wires(2), control=control()),
+        lambda: QPrep(wire=wire()),
+        lambda: QUnprep(wire=wire()),
+        lambda: QInit(value=rng.random() < 0.5, wire=wire()),
+        lambda: CInit(value=rng.random() < 0.5, wire=wire()),
+        lambda: QTerm(value=rng.random() < 0.5, wire=wire()),
+        lambda: CTerm(value=rng.random() < 0.5, wire=wire()),
+        lambda: QMeas(wire=wire()),
+        lambda: QDiscard(wire=wire()),
+        lambda: CDiscard(wire=wire()),
+        lambda: DTerm(value=rng.random() < 0.5, wire=wire()),
+        lambda: SubroutineCall(repetitions=rng.choice([1, 1, 2, 10]), name=string(), shape=string(),
+                               inverted=rng.random() < 0.5, inputs=wires(), outputs=wires(),
+                               control=control()),
+        lambda: Comment(comment=string(), inverted=rng.random() < 0.5,
+                        wire_comments=rng.choice([None, [(wire(), string()) for _ in range(2)]])),
+        ])()
+
+
+class TestWriter(TestCase):
+    def test_round_trip(self):
+        for parser in ['lalr', 'fast']:
+            with self.subTest(parser=parser):
+                start = quipper_parser(parser=parser).parse(TEXT)
+                self.assertEqual(TEXT, dumps(start))
+                self.assertEqual(start, quipper_parser(parser=parser).parse(dumps(start)))
+
+    def test_random_gates(self):
+        """Parsing a written gate gives the same gate."""
+        rng = random.Random(0)
+        parsers = [quipper_parser(start='gate', parser=parser) for parser in ['lalr', 'fast']]
+        for _ in range(2000):
+            gate = random_gate(rng)
+            line = format_gate(gate)
+            for parser in parsers:
+                with self.subTest(line=line):
+                    self.assertEqual(gate, parser.parse(line))
+
+    def test_random_circuits(self):
+        rng = random.Random(1)
+        parser = quipper_parser()
+        for _ in range(20):
+            inputs = [TypeAssignment(Wire(i), rng.choice(list(TypeAssignment_Type))) for i in range(3)]
+            start = Start(circuit=Circuit(inputs=inputs, gates=[random_gate(rng) for _ in range(50)],
+                                          outputs=inputs), subroutines=[])
+            self.assertEqual(start, parser.parse(dumps(start)))
+
+    def test_stream(self):
+        """The events of iter_gates are written back to the same text."""
+        text = io.StringIO()
+        write_events(iter_gates(io.StringIO(TEXT)), text)
+        self.assertEqual(TEXT, text.getvalue())
+
+    def test_chunks(self):
+        """Lines are written in chunks of CHUNK_LINES."""
+        class Writes(io.StringIO):
+            count = 0
+
+            def write(self, s):
+                self.count += 1
+                return super().write(s)
+
+        circuit = quipper_parser(start='circuit').parse(TEXT.split('\n\n')[0] + '\n')
+        circuit = circuit._replace(gates=circuit.gates * 1000)
+        text = Writes()
+        write_circuit(circuit, text)
+        lines = len(circuit.gates) + 2
+        self.assertEqual(-(-lines // writer.CHUNK_LINES), text.count)
+        self.assertEqual(lines, text.getvalue().count('\n'))
+
+    def test_unknown_gate(self):
+        with self.assertRaises(ValueError):
+            format_gate(Wire(0))